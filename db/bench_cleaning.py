@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning import clean_column, clean_value, column
+
+# Замер векторной очистки (clean_column) против построчной clean_data на 1 млн строк.
+# Совпадение результатов проверяет test_data_cleaning.py. Запуск: python db/bench_cleaning.py
+
+ROW_COUNT = 1_000_000
+
+def make_frame(count, seed=42):
+    rng = np.random.default_rng(seed)
+    salaries = rng.choice([np.nan, 60000.0, 120000.0, 250000.0, 2e7, -5.0], size=count)
+    started = pd.Timestamp('2025-07-01T00:00:00+0300')
+    dates = (started + pd.to_timedelta(rng.integers(0, 30 * 86400, size=count), unit='s'))
+    dates = np.array(dates.strftime('%Y-%m-%dT%H:%M:%S%z'), dtype=object)
+    dates[rng.random(count) < 0.05] = np.nan
+    words = np.array(['Python разработчик', '  Backend  ', 'Data analyst', '', 'x' * 120])
+    return pd.DataFrame({
+        'title': words[rng.integers(0, len(words), size=count)],
+        'salary': salaries,
+        'count': rng.integers(0, 40, size=count),
+        'published_date': dates
+    })
+
+def measure():
+    print(f"\nГенерация {ROW_COUNT:,} строк...")
+    df = make_frame(ROW_COUNT)
+    specs = [('title', column('title', max_length=100)), ('salary', column('salary', 'bigint')),
+             ('count', column('count', 'integer', default=0)), ('published_date', column('published_date', 'timestamp'))]
+
+    print(f"{'Столбец':>16} | {'Построчно, с':>12} | {'Векторно, с':>11} | {'Ускорение':>9}")
+    print("-" * 58)
+    for name, spec in specs:
+        values = df[name].tolist()
+        started = time.perf_counter()
+        for value in values:
+            clean_value(value, spec)
+        scalar_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        clean_column(df[name], spec)
+        vector_time = time.perf_counter() - started
+
+        print(f"{name:>16} | {scalar_time:>12.2f} | {vector_time:>11.2f} | {scalar_time / vector_time:>8.0f}x")
+
+def main():
+    measure()
+
+if __name__ == "__main__":
+    main()
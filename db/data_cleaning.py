@@ -0,0 +1,196 @@
+import pandas as pd
+import numpy as np
+from collections import Counter, namedtuple
+
+# Пределы для целых столбцов: больше clamp - записывается clamp, меньше minimum - NULL
+INTEGER_MAX = 2147483647
+SALARY_MAX = 10000000
+
+# Дата публикации в API HH: 2025-07-04T12:10:30+0300
+ISO_TIMESTAMP_RE = r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:[+-]\d{2}:?\d{2}|Z)?'
+
+# Описание столбца таблицы: откуда брать значение и как его очищать.
+# kind - string, integer, bigint или timestamp; source - столбец файла (по умолчанию name);
+# default заменяет NULL и 0 (как "clean_data(...) or default"); required - NOT NULL в таблице
+Column = namedtuple('Column', ['name', 'kind', 'max_length', 'clamp', 'minimum',
+                               'default', 'source', 'required'])
+
+# Таблица: столбцы и ключ уникальности (повторы ключа отбрасываются, остаётся первая строка)
+TableSpec = namedtuple('TableSpec', ['table', 'columns', 'unique'])
+
+KIND_LIMITS = {
+    'integer': {'clamp': INTEGER_MAX},
+    'bigint': {'clamp': SALARY_MAX, 'minimum': 0}
+}
+
+def column(name, kind='string', max_length=None, default=None, source=None, required=False, **limits):
+    """Описание столбца; пределы clamp/minimum по умолчанию берутся из KIND_LIMITS"""
+    limits = {**KIND_LIMITS.get(kind, {}), **limits}
+    return Column(name, kind, max_length, limits.get('clamp'), limits.get('minimum'),
+                  default, source or name, required)
+
+def clean_data(value, data_type='string', max_length=None):
+    """Универсальная очистка данных (построчно; эталон для векторной очистки)"""
+    if pd.isna(value) or value == '' or value is None:
+        return None
+
+    if data_type == 'string':
+        result = str(value).strip()
+        if max_length:
+            result = result[:max_length]
+        return result if result else None
+
+    elif data_type == 'integer':
+        try:
+            num_value = float(value)
+            if pd.isna(num_value) or np.isinf(num_value):
+                return None
+            return int(num_value) if num_value <= 2147483647 else 2147483647
+        except (ValueError, TypeError, OverflowError):
+            return None
+
+    elif data_type == 'bigint':
+        try:
+            num_value = float(value)
+            if pd.isna(num_value) or np.isinf(num_value):
+                return None
+            # Ограничиваем разумными пределами для зарплат
+            if num_value > 10000000:
+                return 10000000
+            if num_value < 0:
+                return None
+            return int(num_value)
+        except (ValueError, TypeError, OverflowError):
+            return None
+
+    return value
+
+def clean_timestamp(value):
+    """Дата публикации вакансии в формате TIMESTAMP (построчно)"""
+    if pd.notna(value) and value != '':
+        try:
+            with np.errstate(invalid='ignore'):
+                return pd.to_datetime(value).strftime('%Y-%m-%d %H:%M:%S')
+        except:
+            return None
+    return None
+
+def clean_value(value, spec):
+    """Очистка одной ячейки по описанию Column построчно (эталон для clean_column)"""
+    if spec.kind == 'timestamp':
+        return clean_timestamp(value)
+    result = clean_data(value, spec.kind, spec.max_length)
+    if spec.default is not None:
+        result = result or spec.default
+    return result
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError, OverflowError):
+        return np.nan
+
+def _as_series(values):
+    """Столбец DataFrame, массив Arrow или список - как pandas Series"""
+    if hasattr(values, 'to_pandas'):
+        values = values.to_pandas()
+    if not isinstance(values, pd.Series):
+        values = pd.Series(values, dtype=object if len(values) == 0 else None)
+    return values.reset_index(drop=True)
+
+def _present(values):
+    """Маска непустых значений: не NaN/None и не пустая строка"""
+    present = values.notna()
+    if not pd.api.types.is_numeric_dtype(values):
+        present &= (values != '').fillna(False).astype(bool)
+    return present
+
+def _clean_strings(values, max_length):
+    # astype('string') - str() каждого значения, пропуски остаются NA
+    text = values.astype('string').str.strip()
+    if max_length:
+        text = text.str.slice(0, max_length)
+    return text.where(_present(values) & (text != '').fillna(False).astype(bool))
+
+def _clean_numbers(values, spec):
+    present = _present(values)
+    if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        numbers = values.astype('float64')
+    else:
+        numbers = pd.to_numeric(values, errors='coerce').astype('float64')
+        # Что не разобрал to_numeric (например, "1_000"), разбирается как float()
+        retry = present & numbers.isna()
+        if retry.any():
+            numbers[retry] = values[retry].map(_to_float).astype('float64')
+
+    numbers = numbers.where(present & np.isfinite(numbers))
+    if spec.clamp is not None:
+        numbers = numbers.where(~(numbers > spec.clamp), spec.clamp)
+    if spec.minimum is not None:
+        numbers = numbers.where(~(numbers < spec.minimum))
+
+    # Вне диапазона int64 значение в таблицу всё равно не попадёт
+    numbers = numbers.where(numbers.abs() < 2.0 ** 63)
+    return np.trunc(numbers).astype('Int64')
+
+def _clean_timestamps(values):
+    present = _present(values)
+    result = pd.Series(None, index=values.index, dtype=object)
+    if not present.any():
+        return result
+
+    # Формат API HH разбирается векторно: время берётся как записано, пояс отбрасывается
+    text = values[present].astype('string')
+    iso = text.str.fullmatch(ISO_TIMESTAMP_RE).fillna(False).astype(bool)
+    parsed = pd.to_datetime(text[iso].str.slice(0, 19), errors='coerce', format='%Y-%m-%dT%H:%M:%S')
+    parsed = parsed[parsed.notna()]
+    if len(parsed):
+        stamps = np.datetime_as_string(parsed.to_numpy(dtype='datetime64[s]'), unit='s')
+        result[parsed.index] = np.char.replace(stamps, 'T', ' ').astype(object)
+
+    # Остальное - как раньше, разбором каждого значения
+    retry = present & result.isna()
+    if retry.any():
+        result[retry] = values[retry].map(clean_timestamp)
+    return result
+
+def clean_column(values, spec):
+    """Очистка всего столбца (Series, массив Arrow) по описанию Column; результат - Series"""
+    values = _as_series(values)
+
+    if spec.kind == 'string':
+        result = _clean_strings(values, spec.max_length)
+    elif spec.kind in ('integer', 'bigint'):
+        result = _clean_numbers(values, spec)
+    elif spec.kind == 'timestamp':
+        result = _clean_timestamps(values)
+    else:
+        raise ValueError(f"Неизвестный тип столбца: {spec.kind}")
+
+    if spec.default is not None:
+        result = result.where(result.notna() & (result != 0), spec.default)
+    return result
+
+def clean_frame(df, table_spec):
+    """Очищенные строки таблицы и счётчик пропущенных строк (по причинам).
+
+    Пропускаются строки с NULL в обязательных столбцах и повторы ключа - то,
+    что раньше отсекали NOT NULL и ON CONFLICT DO NOTHING при вставке по строке.
+    """
+    cleaned = pd.DataFrame({
+        spec.name: clean_column(df[spec.source] if spec.source in df.columns else [None] * len(df), spec)
+        for spec in table_spec.columns
+    })
+
+    skipped = Counter()
+    required = [spec.name for spec in table_spec.columns if spec.required]
+    if required:
+        complete = cleaned[required].notna().all(axis=1)
+        skipped['пустые обязательные поля'] = int((~complete).sum())
+        cleaned = cleaned[complete]
+    if table_spec.unique:
+        duplicated = cleaned.duplicated(subset=list(table_spec.unique), keep='first')
+        skipped['повтор ключа'] = int(duplicated.sum())
+        cleaned = cleaned[~duplicated]
+
+    return cleaned.reset_index(drop=True), +skipped
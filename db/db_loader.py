@@ -1,10 +1,16 @@
 import psycopg2
 import pandas as pd
-import numpy as np
+import argparse
+import hashlib
+import io
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from data_cleaning import TableSpec, clean_frame, column
+
 # Конфигурация подключения
 DB_CONFIG = {
     'host': 'localhost',
@@ -14,6 +20,118 @@ DB_CONFIG = {
     'password': 'practice_password'
 }
 
+# Столбцы таблиц: источник в файле, тип, длина, значение по умолчанию.
+# required - NOT NULL в таблице, unique - ключ ON CONFLICT
+FGOS_SPEC = TableSpec('fgos_competencies', [
+    column('direction_code', max_length=20, required=True),
+    column('direction_name', max_length=500, required=True),
+    column('competency_code', max_length=20, required=True),
+    column('competency_name', required=True),
+    column('competency_description'),
+    column('competency_type', max_length=20),
+    column('category', max_length=100),
+    column('level_description')
+], unique=('direction_code', 'competency_code'))
+
+OTF_TD_SPEC = TableSpec('otf_td_standards', [
+    column('standard_code', max_length=20, source='Стандарт', required=True),
+    column('otf_code', max_length=10, source='OTF_код', required=True),
+    column('otf_name', max_length=500, source='OTF_наименование', required=True),
+    column('td_code', max_length=20, source='TD_код', required=True),
+    column('td_name', source='TD_наименование', required=True)
+], unique=('standard_code', 'td_code'))
+
+VACANCY_SPEC = TableSpec('vacancy_details', [
+    column('vacancy_id', max_length=50, required=True),
+    column('title', required=True),
+    column('company', max_length=500),
+    column('company_size', max_length=50),
+    column('hiring_volume', max_length=20),
+    column('employer_type', max_length=50),
+    column('employer_industries'),
+    column('area', max_length=100),
+    column('published_date', 'timestamp'),
+    column('experience_raw', max_length=100),
+    column('experience_level', max_length=50),
+    column('role', max_length=50),
+    column('domain', max_length=50),
+    column('salary_from', 'bigint'),
+    column('salary_to', 'bigint'),
+    column('avg_salary', 'bigint'),
+    column('tech_count', 'integer', default=0),
+    column('skills_count', 'integer', default=0),
+    column('fgos_competencies_count', 'integer', default=0),
+    column('prof_competencies_count', 'integer', default=0),
+    column('text_source', max_length=20)
+], unique=('vacancy_id',))
+
+# Одна строка на технологию вакансии: ключ слияния при дозагрузке
+TECH_SPEC = TableSpec('vacancy_technologies_detailed', [
+    column('vacancy_id', max_length=50),
+    column('technology', max_length=100, required=True),
+    column('frequency', 'integer', default=1),
+    column('category', max_length=100),
+    column('level', max_length=50),
+    column('domain', max_length=50),
+    column('fgos_competencies'),
+    column('prof_standards')
+], unique=('vacancy_id', 'technology'))
+
+SKILL_SPEC = TableSpec('key_skills', [
+    column('skill_id', 'integer', required=True),
+    column('skill_name', max_length=300, source='skill', required=True)
+], unique=('skill_id',))
+
+VACANCY_SKILL_SPEC = TableSpec('vacancy_key_skills', [
+    column('vacancy_id', max_length=50, required=True),
+    column('skill_id', 'integer', required=True)
+], unique=('vacancy_id', 'skill_id'))
+
+# Файлы снимка HH: вид -> префикс имени (вакансии и технологии обязательны)
+SNAPSHOT_PREFIXES = {
+    'vacancies': 'hh_vacancies_enhanced_',
+    'technologies': 'hh_technologies_detailed_',
+    'skills': 'hh_skills_',
+    'vacancy_skills': 'hh_vacancy_skills_'
+}
+
+# Строк в одной порции COPY: буфер в памяти не растёт с размером файла
+COPY_CHUNK_ROWS = 50_000
+
+# Подключений при параллельной загрузке (--parallel): таблицы, индексы, ANALYZE
+LOAD_WORKERS = 4
+
+# Индексы для OLAP; при параллельной загрузке строятся после данных
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_vac_role ON vacancy_details(role)",
+    "CREATE INDEX IF NOT EXISTS idx_vac_domain ON vacancy_details(domain)",
+    "CREATE INDEX IF NOT EXISTS idx_vac_exp_level ON vacancy_details(experience_level)",
+    "CREATE INDEX IF NOT EXISTS idx_vac_salary ON vacancy_details(avg_salary)",
+    "CREATE INDEX IF NOT EXISTS idx_tech_technology ON vacancy_technologies_detailed(technology)",
+    "CREATE INDEX IF NOT EXISTS idx_tech_category ON vacancy_technologies_detailed(category)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_tech_vacancy_technology ON vacancy_technologies_detailed(vacancy_id, technology)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_key_skills_name ON key_skills(lower(skill_name))",
+    "CREATE INDEX IF NOT EXISTS idx_vac_skill_skill ON vacancy_key_skills(skill_id)",
+    "CREATE INDEX IF NOT EXISTS idx_fgos_direction ON fgos_competencies(direction_code)",
+    "CREATE INDEX IF NOT EXISTS idx_fgos_competency ON fgos_competencies(competency_code)",
+    "CREATE INDEX IF NOT EXISTS idx_otf_standard ON otf_td_standards(standard_code)"
+]
+
+# Внешние ключи: (таблица, имя ограничения, определение). Имена - те, что PostgreSQL
+# давал ограничениям в CREATE TABLE прежних версий загрузчика
+FOREIGN_KEYS = [
+    ('vacancy_technologies_detailed', 'vacancy_technologies_detailed_vacancy_id_fkey',
+     "FOREIGN KEY (vacancy_id) REFERENCES vacancy_details(vacancy_id) ON DELETE CASCADE"),
+    ('vacancy_key_skills', 'vacancy_key_skills_vacancy_id_fkey',
+     "FOREIGN KEY (vacancy_id) REFERENCES vacancy_details(vacancy_id) ON DELETE CASCADE"),
+    ('vacancy_key_skills', 'vacancy_key_skills_skill_id_fkey',
+     "FOREIGN KEY (skill_id) REFERENCES key_skills(skill_id)")
+]
+
+# Таблицы с данными (для ANALYZE)
+DATA_TABLES = ['fgos_competencies', 'otf_td_standards', 'vacancy_details',
+               'vacancy_technologies_detailed', 'key_skills', 'vacancy_key_skills']
+
 def get_connection():
     """Создание подключения к БД"""
     try:
@@ -22,64 +140,152 @@ def get_connection():
         print(f"❌ Ошибка подключения к БД: {e}")
         sys.exit(1)
 
-def clean_data(value, data_type='string', max_length=None):
-    """Универсальная очистка данных"""
-    if pd.isna(value) or value == '' or value is None:
-        return None
+def copy_frame(cur, table, df, chunk_rows=COPY_CHUNK_ROWS):
+    """Загрузка очищенного DataFrame через COPY FROM STDIN порциями по chunk_rows; возвращает число строк.
+    
+    Пустое поле CSV - NULL; после очистки пустых строк не остаётся.
+    """
+    sql = f"COPY {table} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv)"
+    for start in range(0, len(df), chunk_rows):
+        buffer = io.StringIO()
+        df.iloc[start:start + chunk_rows].to_csv(buffer, header=False, index=False)
+        buffer.seek(0)
+        cur.copy_expert(sql, buffer)
+    return len(df)
+
+def report_loaded(name, count, started, skipped=None):
+    """Итог загрузки таблицы со скоростью"""
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0
+    print(f"✅ {name}: загружено {count} записей за {elapsed:.1f} с ({rate:,.0f} строк/с)")
+    if skipped:
+        details = ', '.join(f"{reason}: {count}" for reason, count in skipped.items())
+        print(f"  ⚠️ Пропущено строк - {details}")
+
+def index_exists(cur, index_name):
+    cur.execute("SELECT 1 FROM pg_indexes WHERE indexname = %s", (index_name,))
+    return cur.fetchone() is not None
+
+def constraint_exists(cur, constraint_name):
+    cur.execute("SELECT 1 FROM pg_constraint WHERE conname = %s", (constraint_name,))
+    return cur.fetchone() is not None
+
+def foreign_key_sql(table, name, definition):
+    return f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """Хэш содержимого файла (BLAKE2b, 128 бит)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def is_loaded(cur, path):
+    """Файл уже загружен (есть в load_manifest с тем же размером и содержимым).
+    
+    Хэш считается, только если размер совпал: правка без изменения размера
+    тоже приводит к перезагрузке."""
+    cur.execute("SELECT file_size, file_hash FROM load_manifest WHERE file_name = %s",
+                (os.path.basename(path),))
+    row = cur.fetchone()
+    return row is not None and row[0] == os.path.getsize(path) and row[1] == file_hash(path)
+
+def record_loaded(cur, path, rows_loaded):
+    cur.execute("""
+        INSERT INTO load_manifest (file_name, file_size, file_hash, rows_loaded) VALUES (%s, %s, %s, %s)
+        ON CONFLICT (file_name) DO UPDATE
+        SET file_size = EXCLUDED.file_size, file_hash = EXCLUDED.file_hash,
+            rows_loaded = EXCLUDED.rows_loaded, loaded_at = CURRENT_TIMESTAMP
+    """, (os.path.basename(path), os.path.getsize(path), file_hash(path), rows_loaded))
+
+def newest_loaded_snapshot(cur):
+    """Метка времени самого свежего снимка HH в load_manifest (None - снимков нет)"""
+    prefix = SNAPSHOT_PREFIXES['vacancies']
+    cur.execute("SELECT file_name FROM load_manifest")
+    timestamps = [os.path.splitext(name)[0][len(prefix):] for (name,) in cur.fetchall()
+                  if name.startswith(prefix)]
+    return max(timestamps, default=None)
+
+def stage_frame(cur, table_spec, df):
+    """Очищенные строки в нежурналируемую промежуточную таблицу staging_<таблица>.
     
-    if data_type == 'string':
-        result = str(value).strip()
-        if max_length:
-            result = result[:max_length]
-        return result if result else None
+    Столбцы - те же типы, что в целевой таблице, но без ограничений; row_no хранит
+    порядок строк файла (и, значит, порядок номеров id при переносе).
+    """
+    staging = f"staging_{table_spec.table}"
+    columns = ', '.join(spec.name for spec in table_spec.columns)
+    cur.execute(f"DROP TABLE IF EXISTS {staging}")
+    cur.execute(f"CREATE UNLOGGED TABLE {staging} AS SELECT {columns} FROM {table_spec.table} WITH NO DATA")
+    cur.execute(f"ALTER TABLE {staging} ADD COLUMN row_no BIGSERIAL")
+    copy_frame(cur, staging, df)
+    return staging
+
+def merge_staged(cur, table_spec, join_vacancies=False, bulk=False):
+    """Перенос строк из промежуточной таблицы: новые ключи вставляются, у существующих
+    обновляются изменившиеся столбцы. join_vacancies - только строки загруженных вакансий.
+    bulk - таблица пуста и без индексов: простая вставка (повторы ключа уже убрал clean_frame).
+    Возвращает число вставленных и обновлённых строк."""
+    columns = [spec.name for spec in table_spec.columns]
+    updated = [column for column in columns if column not in table_spec.unique]
+    join = "JOIN vacancy_details vd ON vd.vacancy_id = s.vacancy_id" if join_vacancies else ""
+    conflict = "" if bulk else f"""
+        ON CONFLICT ({', '.join(table_spec.unique)}) DO UPDATE
+        SET {', '.join(f'{column} = EXCLUDED.{column}' for column in updated)}
+        WHERE ({', '.join(f't.{column}' for column in updated)})
+              IS DISTINCT FROM ({', '.join(f'EXCLUDED.{column}' for column in updated)})"""
     
-    elif data_type == 'integer':
-        try:
-            num_value = float(value)
-            if pd.isna(num_value) or np.isinf(num_value):
-                return None
-            return int(num_value) if num_value <= 2147483647 else 2147483647
-        except (ValueError, TypeError, OverflowError):
-            return None
-    
-    elif data_type == 'bigint':
-        try:
-            num_value = float(value)
-            if pd.isna(num_value) or np.isinf(num_value):
-                return None
-            # Ограничиваем разумными пределами для зарплат
-            if num_value > 10000000:
-                return 10000000
-            if num_value < 0:
-                return None
-            return int(num_value)
-        except (ValueError, TypeError, OverflowError):
-            return None
-    
-    return value
-
-def create_final_tables():
-    """Создание финальных таблиц для OLAP анализа"""
+    cur.execute(f"""
+        INSERT INTO {table_spec.table} AS t ({', '.join(columns)})
+        SELECT {', '.join(f's.{column}' for column in columns)}
+        FROM staging_{table_spec.table} s
+        {join}
+        ORDER BY s.row_no{conflict}
+    """)
+    return cur.rowcount
+
+def report_missing_vacancies(cur, table_spec, name):
+    """Строки промежуточной таблицы, для которых нет вакансии в vacancy_details"""
+    cur.execute(f"""
+        SELECT COUNT(*), COUNT(DISTINCT s.vacancy_id)
+        FROM staging_{table_spec.table} s
+        WHERE NOT EXISTS (SELECT 1 FROM vacancy_details vd WHERE vd.vacancy_id = s.vacancy_id)
+    """)
+    missing_rows, missing_vacancies = cur.fetchone()
+    if missing_rows:
+        print(f"  ⚠️ {name} без вакансии: {missing_rows} строк, {missing_vacancies} вакансий нет в vacancy_details")
+
+def create_final_tables(drop_existing=True, deferred=False):
+    """Создание финальных таблиц для OLAP анализа.
+    
+    drop_existing=False - для дозагрузки: недостающие таблицы и индексы создаются,
+    существующие (и представления над ними) остаются как есть.
+    deferred - индексы и внешние ключи создаются позже (create_deferred_indexes).
+    """
     conn = get_connection()
     cur = conn.cursor()
     
-    print("🔧 Создание финальных таблиц для OLAP...")
+    print("🔧 Создание финальных таблиц для OLAP..." if drop_existing else "🔧 Проверка таблиц для дозагрузки...")
     
     try:
         # Очищаем существующие таблицы
         tables_to_drop = [
+            'load_manifest',
+            'vacancy_key_skills',
+            'key_skills',
             'vacancy_technologies_detailed',
             'vacancy_details', 
             'fgos_competencies',
             'otf_td_standards'
         ]
         
-        for table in tables_to_drop:
-            cur.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
+        if drop_existing:
+            for table in tables_to_drop:
+                cur.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
         
         # 1. Таблица ФГОС компетенций
         cur.execute("""
-            CREATE TABLE fgos_competencies (
+            CREATE TABLE IF NOT EXISTS fgos_competencies (
                 id SERIAL PRIMARY KEY,
                 direction_code VARCHAR(20) NOT NULL,
                 direction_name VARCHAR(500) NOT NULL,
@@ -97,7 +303,7 @@ def create_final_tables():
         
         # 2. Таблица профессиональных стандартов (OTF/TD)
         cur.execute("""
-            CREATE TABLE otf_td_standards (
+            CREATE TABLE IF NOT EXISTS otf_td_standards (
                 id SERIAL PRIMARY KEY,
                 standard_code VARCHAR(20) NOT NULL,
                 otf_code VARCHAR(10) NOT NULL,
@@ -112,12 +318,15 @@ def create_final_tables():
         
         # 3. Основная таблица вакансий
         cur.execute("""
-            CREATE TABLE vacancy_details (
+            CREATE TABLE IF NOT EXISTS vacancy_details (
                 id SERIAL PRIMARY KEY,
                 vacancy_id VARCHAR(50) UNIQUE NOT NULL,
                 title TEXT NOT NULL,
                 company VARCHAR(500),
                 company_size VARCHAR(50),
+                hiring_volume VARCHAR(20),
+                employer_type VARCHAR(50),
+                employer_industries TEXT,
                 area VARCHAR(100),
                 published_date TIMESTAMP,
                 experience_raw VARCHAR(100),
@@ -131,13 +340,14 @@ def create_final_tables():
                 skills_count INTEGER DEFAULT 0,
                 fgos_competencies_count INTEGER DEFAULT 0,
                 prof_competencies_count INTEGER DEFAULT 0,
+                text_source VARCHAR(20),
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
         
         # 4. Детальная таблица технологий
         cur.execute("""
-            CREATE TABLE vacancy_technologies_detailed (
+            CREATE TABLE IF NOT EXISTS vacancy_technologies_detailed (
                 id SERIAL PRIMARY KEY,
                 vacancy_id VARCHAR(50) NOT NULL,
                 technology VARCHAR(100) NOT NULL,
@@ -147,30 +357,74 @@ def create_final_tables():
                 domain VARCHAR(50),
                 fgos_competencies TEXT,
                 prof_standards TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # 5. Словарь ключевых навыков HH (номера - из снимка парсера)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS key_skills (
+                skill_id INTEGER PRIMARY KEY,
+                skill_name VARCHAR(300) NOT NULL
+            )
+        """)
+        
+        # 6. Факт вакансия <-> навык
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS vacancy_key_skills (
+                vacancy_id VARCHAR(50) NOT NULL,
+                skill_id INTEGER NOT NULL,
                 
-                FOREIGN KEY (vacancy_id) REFERENCES vacancy_details(vacancy_id) ON DELETE CASCADE
+                PRIMARY KEY (vacancy_id, skill_id)
             )
         """)
         
-        # Создаем индексы для OLAP
-        indexes = [
-            "CREATE INDEX idx_vac_role ON vacancy_details(role)",
-            "CREATE INDEX idx_vac_domain ON vacancy_details(domain)",
-            "CREATE INDEX idx_vac_exp_level ON vacancy_details(experience_level)",
-            "CREATE INDEX idx_vac_salary ON vacancy_details(avg_salary)",
-            "CREATE INDEX idx_tech_technology ON vacancy_technologies_detailed(technology)",
-            "CREATE INDEX idx_tech_category ON vacancy_technologies_detailed(category)",
-            "CREATE INDEX idx_fgos_direction ON fgos_competencies(direction_code)",
-            "CREATE INDEX idx_fgos_competency ON fgos_competencies(competency_code)",
-            "CREATE INDEX idx_otf_standard ON otf_td_standards(standard_code)"
-        ]
+        # 7. Журнал загруженных файлов (для дозагрузки)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS load_manifest (
+                file_name VARCHAR(300) PRIMARY KEY,
+                file_size BIGINT NOT NULL,
+                file_hash VARCHAR(32),
+                rows_loaded INTEGER,
+                loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Таблицы из прежних версий загрузчика: столбцы работодателя и источника текста,
+        # хэш файлов в журнале (файлы без хэша загрузятся ещё раз)
+        if not drop_existing:
+            cur.execute("ALTER TABLE load_manifest ADD COLUMN IF NOT EXISTS file_hash VARCHAR(32)")
+            cur.execute("""
+                ALTER TABLE vacancy_details
+                    ADD COLUMN IF NOT EXISTS hiring_volume VARCHAR(20),
+                    ADD COLUMN IF NOT EXISTS employer_type VARCHAR(50),
+                    ADD COLUMN IF NOT EXISTS employer_industries TEXT,
+                    ADD COLUMN IF NOT EXISTS text_source VARCHAR(20)
+            """)
+        
+        # Таблицы из прежних версий загрузчика: повторы технологий вакансии убираются
+        # до создания уникального индекса (остаётся первая строка)
+        if not drop_existing and not index_exists(cur, 'uq_tech_vacancy_technology'):
+            cur.execute("""
+                DELETE FROM vacancy_technologies_detailed a
+                USING vacancy_technologies_detailed b
+                WHERE a.vacancy_id = b.vacancy_id AND a.technology = b.technology AND a.id > b.id
+            """)
         
-        for index_sql in indexes:
-            cur.execute(index_sql)
+        # Создаем индексы для OLAP и внешние ключи
+        if not deferred:
+            for index_sql in INDEXES:
+                cur.execute(index_sql)
+            
+            for table, name, definition in FOREIGN_KEYS:
+                if not constraint_exists(cur, name):
+                    cur.execute(foreign_key_sql(table, name, definition))
         
         conn.commit()
-        print("✅ Финальные таблицы созданы")
+        if deferred:
+            print("✅ Финальные таблицы созданы (индексы - после загрузки)")
+        else:
+            print("✅ Финальные таблицы созданы" if drop_existing else "✅ Таблицы готовы к дозагрузке")
         
     except Exception as e:
         print(f"❌ Ошибка создания таблиц: {e}")
@@ -180,8 +434,8 @@ def create_final_tables():
         cur.close()
         conn.close()
 
-def load_fgos_data():
-    """Загрузка данных ФГОС"""
+def load_fgos_data(incremental=False, bulk=False):
+    """Загрузка данных ФГОС (incremental - только если файл изменился, bulk - см. merge_staged)"""
     csv_file = 'csv_files/fgos_competencies.csv'
     
     if not os.path.exists(csv_file):
@@ -190,38 +444,24 @@ def load_fgos_data():
     
     print(f"📚 Загрузка ФГОС из {csv_file}")
     
+    started = time.perf_counter()
     df = pd.read_csv(csv_file)
     conn = get_connection()
     cur = conn.cursor()
     
     try:
-        loaded_count = 0
-        for _, row in df.iterrows():
-            try:
-                cur.execute("""
-                    INSERT INTO fgos_competencies (
-                        direction_code, direction_name, competency_code, 
-                        competency_name, competency_description, competency_type,
-                        category, level_description
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (direction_code, competency_code) DO NOTHING
-                """, (
-                    clean_data(row.get('direction_code'), 'string', 20),
-                    clean_data(row.get('direction_name'), 'string', 500),
-                    clean_data(row.get('competency_code'), 'string', 20),
-                    clean_data(row.get('competency_name'), 'string'),
-                    clean_data(row.get('competency_description'), 'string'),
-                    clean_data(row.get('competency_type'), 'string', 20),
-                    clean_data(row.get('category'), 'string', 100),
-                    clean_data(row.get('level_description'), 'string')
-                ))
-                loaded_count += 1
-            except Exception as e:
-                print(f"⚠️ Ошибка загрузки ФГОС строки: {e}")
-                continue
+        if incremental and is_loaded(cur, csv_file):
+            print("⏭️ ФГОС: файл не изменился с прошлой загрузки")
+            return True
+        
+        rows, skipped = clean_frame(df, FGOS_SPEC)
+        stage_frame(cur, FGOS_SPEC, rows)
+        loaded_count = merge_staged(cur, FGOS_SPEC, bulk=bulk)
+        cur.execute(f"DROP TABLE staging_{FGOS_SPEC.table}")
+        record_loaded(cur, csv_file, loaded_count)
         
         conn.commit()
-        print(f"✅ ФГОС: загружено {loaded_count} записей")
+        report_loaded("ФГОС", loaded_count, started, skipped)
         return True
         
     except Exception as e:
@@ -232,8 +472,8 @@ def load_fgos_data():
         cur.close()
         conn.close()
 
-def load_otf_td_data():
-    """Загрузка данных профессиональных стандартов"""
+def load_otf_td_data(incremental=False, bulk=False):
+    """Загрузка данных профессиональных стандартов (incremental - только если файл изменился, bulk - см. merge_staged)"""
     csv_file = 'csv_files/otf_td.csv'
     
     if not os.path.exists(csv_file):
@@ -242,33 +482,24 @@ def load_otf_td_data():
     
     print(f"💼 Загрузка профстандартов из {csv_file}")
     
+    started = time.perf_counter()
     df = pd.read_csv(csv_file)
     conn = get_connection()
     cur = conn.cursor()
     
     try:
-        loaded_count = 0
-        for _, row in df.iterrows():
-            try:
-                cur.execute("""
-                    INSERT INTO otf_td_standards (
-                        standard_code, otf_code, otf_name, td_code, td_name
-                    ) VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (standard_code, td_code) DO NOTHING
-                """, (
-                    clean_data(row.get('Стандарт'), 'string', 20),
-                    clean_data(row.get('OTF_код'), 'string', 10),
-                    clean_data(row.get('OTF_наименование'), 'string', 500),
-                    clean_data(row.get('TD_код'), 'string', 20),
-                    clean_data(row.get('TD_наименование'), 'string')
-                ))
-                loaded_count += 1
-            except Exception as e:
-                print(f"⚠️ Ошибка загрузки ОТФ строки: {e}")
-                continue
+        if incremental and is_loaded(cur, csv_file):
+            print("⏭️ Профстандарты: файл не изменился с прошлой загрузки")
+            return True
+        
+        rows, skipped = clean_frame(df, OTF_TD_SPEC)
+        stage_frame(cur, OTF_TD_SPEC, rows)
+        loaded_count = merge_staged(cur, OTF_TD_SPEC, bulk=bulk)
+        cur.execute(f"DROP TABLE staging_{OTF_TD_SPEC.table}")
+        record_loaded(cur, csv_file, loaded_count)
         
         conn.commit()
-        print(f"✅ Профстандарты: загружено {loaded_count} записей")
+        report_loaded("Профстандарты", loaded_count, started, skipped)
         return True
         
     except Exception as e:
@@ -279,115 +510,181 @@ def load_otf_td_data():
         cur.close()
         conn.close()
 
-def load_hh_data():
-    """Загрузка данных HH"""
-    csv_dir = 'csv_files'
+def find_latest_snapshot(csv_dir, prefix):
+    """Самый свежий файл снимка HH; при равной метке времени Parquet важнее CSV"""
+    candidates = []
+    for f in os.listdir(csv_dir):
+        name, ext = os.path.splitext(f)
+        if f.startswith(prefix) and ext in ('.csv', '.parquet'):
+            candidates.append((name[len(prefix):], ext == '.parquet', f))
     
-    # Находим свежие файлы HH
-    vacancy_files = [f for f in os.listdir(csv_dir) if f.startswith('hh_vacancies_enhanced_')]
-    tech_files = [f for f in os.listdir(csv_dir) if f.startswith('hh_technologies_detailed_')]
+    return max(candidates)[2] if candidates else None
+
+def read_snapshot(path):
+    """Чтение снимка HH: Parquet уже типизирован, CSV разбирается pandas"""
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+def list_snapshots(csv_dir):
+    """Метки времени всех снимков HH по возрастанию"""
+    prefix = SNAPSHOT_PREFIXES['vacancies']
+    timestamps = {os.path.splitext(f)[0][len(prefix):] for f in os.listdir(csv_dir)
+                  if f.startswith(prefix) and f.endswith(('.csv', '.parquet'))}
+    return sorted(timestamps)
+
+def snapshot_files(csv_dir, timestamp):
+    """Файлы одного снимка: вид -> имя файла или None (навыков в старых снимках нет)"""
+    return {kind: find_latest_snapshot(csv_dir, f'{prefix}{timestamp}')
+            for kind, prefix in SNAPSHOT_PREFIXES.items()}
+
+def load_hh_skills(cur, skills_path, vacancy_skills_path):
+    """Слияние словаря ключевых навыков и факта вакансия <-> навык.
     
-    if not vacancy_files or not tech_files:
-        print("❌ Не найдены файлы HH данных в csv_files/")
-        return False
+    Номера навыков в снимке свои у каждого снимка: навыки сопоставляются с
+    таблицей по названию, новые получают следующие свободные номера.
+    Возвращает число строк по файлам.
+    """
+    loaded = {}
+    started = time.perf_counter()
+    skills, skipped = clean_frame(read_snapshot(skills_path), SKILL_SPEC)
+    stage_frame(cur, SKILL_SPEC, skills)
+    cur.execute("""
+        INSERT INTO key_skills (skill_id, skill_name)
+        SELECT (SELECT COALESCE(MAX(skill_id), 0) FROM key_skills) + ROW_NUMBER() OVER (ORDER BY s.row_no),
+               s.skill_name
+        FROM staging_key_skills s
+        WHERE NOT EXISTS (SELECT 1 FROM key_skills k WHERE lower(k.skill_name) = lower(s.skill_name))
+    """)
+    loaded['skills'] = cur.rowcount
+    report_loaded("Ключевые навыки (новые)", loaded['skills'], started, skipped)
     
-    latest_vacancy_file = max(vacancy_files)
-    latest_tech_file = max(tech_files)
+    started = time.perf_counter()
+    facts, skipped = clean_frame(read_snapshot(vacancy_skills_path), VACANCY_SKILL_SPEC)
+    stage_frame(cur, VACANCY_SKILL_SPEC, facts)
+    
+    # Навыки, которых у перезагруженных вакансий больше нет
+    cur.execute("""
+        DELETE FROM vacancy_key_skills t
+        USING staging_vacancy_details sv
+        WHERE t.vacancy_id = sv.vacancy_id
+          AND NOT EXISTS (
+              SELECT 1 FROM staging_vacancy_key_skills f
+              JOIN staging_key_skills s ON s.skill_id = f.skill_id
+              JOIN key_skills k ON lower(k.skill_name) = lower(s.skill_name)
+              WHERE f.vacancy_id = t.vacancy_id AND k.skill_id = t.skill_id
+          )
+    """)
+    cur.execute("""
+        INSERT INTO vacancy_key_skills (vacancy_id, skill_id)
+        SELECT f.vacancy_id, k.skill_id
+        FROM staging_vacancy_key_skills f
+        JOIN staging_key_skills s ON s.skill_id = f.skill_id
+        JOIN key_skills k ON lower(k.skill_name) = lower(s.skill_name)
+        JOIN vacancy_details vd ON vd.vacancy_id = f.vacancy_id
+        ORDER BY f.row_no
+        ON CONFLICT DO NOTHING
+    """)
+    loaded['vacancy_skills'] = cur.rowcount
+    report_loaded("Навыки вакансий", loaded['vacancy_skills'], started, skipped)
+    report_missing_vacancies(cur, VACANCY_SKILL_SPEC, "Навыки")
     
+    cur.execute("DROP TABLE staging_key_skills, staging_vacancy_key_skills")
+    return loaded
+
+def load_hh_snapshot(cur, csv_dir, files, bulk=False):
+    """Слияние одного снимка HH с таблицами; возвращает число строк по файлам"""
     print(f"💼 Загрузка данных HH:")
-    print(f"  📄 Вакансии: {latest_vacancy_file}")
-    print(f"  🔧 Технологии: {latest_tech_file}")
+    print(f"  📄 Вакансии: {files['vacancies']}")
+    print(f"  🔧 Технологии: {files['technologies']}")
+    print(f"  🧩 Навыки: {files['skills'] or 'нет в снимке'}")
+    
+    loaded = {}
+    
+    # Загружаем вакансии
+    started = time.perf_counter()
+    vacancy_df = read_snapshot(os.path.join(csv_dir, files['vacancies']))
+    vacancies, skipped = clean_frame(vacancy_df, VACANCY_SPEC)
+    stage_frame(cur, VACANCY_SPEC, vacancies)
+    loaded['vacancies'] = merge_staged(cur, VACANCY_SPEC, bulk=bulk)
+    report_loaded("Вакансии", loaded['vacancies'], started, skipped)
+    
+    # Загружаем технологии: связь с вакансией проверяется одним JOIN
+    started = time.perf_counter()
+    tech_df = read_snapshot(os.path.join(csv_dir, files['technologies']))
+    technologies, skipped = clean_frame(tech_df, TECH_SPEC)
+    stage_frame(cur, TECH_SPEC, technologies)
+    
+    # Технологии, которых у перезагруженных вакансий больше нет
+    cur.execute("""
+        DELETE FROM vacancy_technologies_detailed t
+        USING staging_vacancy_details sv
+        WHERE t.vacancy_id = sv.vacancy_id
+          AND NOT EXISTS (
+              SELECT 1 FROM staging_vacancy_technologies_detailed st
+              WHERE st.vacancy_id = t.vacancy_id AND st.technology = t.technology
+          )
+    """)
+    loaded['technologies'] = merge_staged(cur, TECH_SPEC, join_vacancies=True, bulk=bulk)
+    report_loaded("Технологии", loaded['technologies'], started, skipped)
+    report_missing_vacancies(cur, TECH_SPEC, "Технологии")
+    cur.execute("DROP TABLE staging_vacancy_technologies_detailed")
+    
+    if files['skills'] and files['vacancy_skills']:
+        loaded.update(load_hh_skills(cur, os.path.join(csv_dir, files['skills']),
+                                     os.path.join(csv_dir, files['vacancy_skills'])))
+    
+    cur.execute("DROP TABLE staging_vacancy_details")
+    return loaded
+
+def load_hh_data(incremental=False, bulk=False):
+    """Загрузка данных HH: последний снимок или (incremental) снимки новее загруженных.
+    
+    Снимки старше самого свежего в load_manifest не сливаются: их вакансии
+    затёрли бы более новые данные. Сам этот снимок загружается повторно,
+    если его файлы изменились (например, дописаны после --resume)."""
+    csv_dir = 'csv_files'
+    
+    # Находим снимки HH (CSV или Parquet)
+    timestamps = list_snapshots(csv_dir)
+    if not timestamps:
+        print("❌ Не найдены файлы HH данных в csv_files/")
+        return False
+    if not incremental:
+        timestamps = timestamps[-1:]
     
     conn = get_connection()
     cur = conn.cursor()
     
     try:
-        # Загружаем вакансии
-        vacancy_df = pd.read_csv(os.path.join(csv_dir, latest_vacancy_file))
-        
-        vacancy_loaded = 0
-        for _, row in vacancy_df.iterrows():
-            try:
-                # Обработка даты
-                published_date = row.get('published_date')
-                if pd.notna(published_date) and published_date != '':
-                    try:
-                        published_date = pd.to_datetime(published_date).strftime('%Y-%m-%d %H:%M:%S')
-                    except:
-                        published_date = None
-                else:
-                    published_date = None
-                
-                cur.execute("""
-                    INSERT INTO vacancy_details (
-                        vacancy_id, title, company, company_size, area,
-                        published_date, experience_raw, experience_level,
-                        role, domain, salary_from, salary_to, avg_salary,
-                        tech_count, skills_count, fgos_competencies_count, prof_competencies_count
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (vacancy_id) DO NOTHING
-                """, (
-                    clean_data(row.get('vacancy_id'), 'string', 50),
-                    clean_data(row.get('title'), 'string'),
-                    clean_data(row.get('company'), 'string', 500),
-                    clean_data(row.get('company_size'), 'string', 50),
-                    clean_data(row.get('area'), 'string', 100),
-                    published_date,
-                    clean_data(row.get('experience_raw'), 'string', 100),
-                    clean_data(row.get('experience_level'), 'string', 50),
-                    clean_data(row.get('role'), 'string', 50),
-                    clean_data(row.get('domain'), 'string', 50),
-                    clean_data(row.get('salary_from'), 'bigint'),
-                    clean_data(row.get('salary_to'), 'bigint'),
-                    clean_data(row.get('avg_salary'), 'bigint'),
-                    clean_data(row.get('tech_count'), 'integer') or 0,
-                    clean_data(row.get('skills_count'), 'integer') or 0,
-                    clean_data(row.get('fgos_competencies_count'), 'integer') or 0,
-                    clean_data(row.get('prof_competencies_count'), 'integer') or 0
-                ))
-                vacancy_loaded += 1
-            except Exception as e:
-                print(f"⚠️ Ошибка загрузки вакансии: {e}")
-                continue
+        if incremental:
+            newest = newest_loaded_snapshot(cur)
+            if newest is not None:
+                older = [timestamp for timestamp in timestamps if timestamp < newest]
+                if older:
+                    print(f"⏭️ Снимков HH старше загруженного {newest}: {len(older)}, пропускаем")
+                timestamps = [timestamp for timestamp in timestamps if timestamp >= newest]
         
-        print(f"✅ Вакансии: загружено {vacancy_loaded} записей")
-        
-        # Загружаем технологии
-        tech_df = pd.read_csv(os.path.join(csv_dir, latest_tech_file))
-        
-        tech_loaded = 0
-        for _, row in tech_df.iterrows():
-            try:
-                vacancy_id = clean_data(row.get('vacancy_id'), 'string', 50)
-                
-                # Проверяем существование вакансии
-                cur.execute("SELECT 1 FROM vacancy_details WHERE vacancy_id = %s", (vacancy_id,))
-                if not cur.fetchone():
-                    continue
-                
-                cur.execute("""
-                    INSERT INTO vacancy_technologies_detailed (
-                        vacancy_id, technology, frequency, category, level,
-                        domain, fgos_competencies, prof_standards
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    vacancy_id,
-                    clean_data(row.get('technology'), 'string', 100),
-                    clean_data(row.get('frequency'), 'integer') or 1,
-                    clean_data(row.get('category'), 'string', 100),
-                    clean_data(row.get('level'), 'string', 50),
-                    clean_data(row.get('domain'), 'string', 50),
-                    clean_data(row.get('fgos_competencies'), 'string'),
-                    clean_data(row.get('prof_standards'), 'string')
-                ))
-                tech_loaded += 1
-            except Exception as e:
-                print(f"⚠️ Ошибка загрузки технологии: {e}")
+        merged = 0
+        for timestamp in timestamps:
+            files = snapshot_files(csv_dir, timestamp)
+            if not files['technologies']:
+                print(f"⚠️ Снимок {timestamp}: нет файла технологий, пропускаем")
                 continue
+            
+            paths = {kind: os.path.join(csv_dir, name) for kind, name in files.items() if name}
+            if incremental and all(is_loaded(cur, path) for path in paths.values()):
+                continue
+            
+            # Каждый снимок - отдельная транзакция: представления видят его целиком или никак
+            loaded = load_hh_snapshot(cur, csv_dir, files, bulk)
+            for kind, path in paths.items():
+                record_loaded(cur, path, loaded.get(kind))
+            conn.commit()
+            merged += 1
         
-        print(f"✅ Технологии: загружено {tech_loaded} записей")
-        
-        conn.commit()
+        if not merged:
+            print("✅ Новых снимков HH нет")
         return True
         
     except Exception as e:
@@ -398,6 +695,87 @@ def load_hh_data():
         cur.close()
         conn.close()
 
+def run_timed(function, *args):
+    """Результат функции и время её выполнения"""
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+def execute_statement(sql):
+    """Одна команда в своём подключении (autocommit); возвращает время или None при ошибке"""
+    started = time.perf_counter()
+    conn = get_connection()
+    conn.autocommit = True
+    cur = conn.cursor()
+    
+    try:
+        cur.execute(sql)
+        return time.perf_counter() - started
+    except Exception as e:
+        print(f"❌ Ошибка: {sql}: {e}")
+        return None
+    finally:
+        cur.close()
+        conn.close()
+
+def execute_parallel(statements, workers=LOAD_WORKERS):
+    """Команды в workers подключениях одновременно; True, если все выполнены"""
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ddl') as executor:
+        timings = list(executor.map(execute_statement, statements))
+    
+    done = [(elapsed, sql) for elapsed, sql in zip(timings, statements) if elapsed is not None]
+    if done:
+        elapsed, sql = max(done)
+        print(f"  ⏱️ Дольше всех ({elapsed:.1f} с): {sql}")
+    return len(done) == len(statements)
+
+def create_deferred_indexes(workers=LOAD_WORKERS):
+    """Индексы и внешние ключи после загрузки данных, параллельно.
+    
+    Внешние ключи проверяются одним запросом по всей таблице вместо проверки
+    каждой вставленной строки; ждут построения индексов своих таблиц (блокировки).
+    """
+    print(f"🔧 Создание индексов и внешних ключей ({workers} подключения)...")
+    statements = INDEXES + [foreign_key_sql(*foreign_key) for foreign_key in FOREIGN_KEYS]
+    if execute_parallel(statements, workers):
+        print(f"✅ Индексы ({len(INDEXES)}) и внешние ключи ({len(FOREIGN_KEYS)}) созданы")
+        return True
+    return False
+
+def analyze_tables(workers=LOAD_WORKERS):
+    """Статистика планировщика по загруженным таблицам"""
+    print("📈 ANALYZE загруженных таблиц...")
+    if execute_parallel([f"ANALYZE {table}" for table in DATA_TABLES], workers):
+        print("✅ Статистика обновлена")
+        return True
+    return False
+
+def load_all_parallel(workers=LOAD_WORKERS):
+    """ФГОС, профстандарты и HH одновременно, каждый в своём подключении.
+    
+    Таблицы только что созданы без индексов, поэтому строки вставляются без
+    ON CONFLICT (bulk). Возвращает {источник: (успех, время)}.
+    """
+    print(f"⚡ Параллельная загрузка ({workers} подключения)")
+    loaders = {
+        'ФГОС': load_fgos_data,
+        'Профстандарты': load_otf_td_data,
+        'HH': load_hh_data
+    }
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='load') as executor:
+        futures = {name: executor.submit(run_timed, loader, False, True) for name, loader in loaders.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def report_phases(phases, started):
+    """Время загрузки по этапам и общее"""
+    total = time.perf_counter() - started
+    print(f"\n⏱️ ВРЕМЯ ЗАГРУЗКИ ПО ЭТАПАМ")
+    print("=" * 60)
+    for name, elapsed in phases:
+        share = elapsed / total * 100 if total > 0 else 0
+        print(f"  {name:<36} {elapsed:>8.2f} с {share:>5.1f}%")
+    print(f"  {'Всего':<36} {total:>8.2f} с")
+
 def create_olap_views():
     """Создание представлений для OLAP анализа"""
     conn = get_connection()
@@ -492,6 +870,21 @@ def create_olap_views():
             GROUP BY role, technology, salary_range
         """)
         
+        # 4. Рынок ключевых навыков
+        cur.execute("""
+            CREATE OR REPLACE VIEW skill_market_summary AS
+            SELECT 
+                ks.skill_id,
+                ks.skill_name,
+                COUNT(*) as vacancy_count,
+                AVG(vd.avg_salary) as avg_salary,
+                MODE() WITHIN GROUP (ORDER BY vd.role) as top_role
+            FROM vacancy_key_skills vks
+            JOIN key_skills ks ON ks.skill_id = vks.skill_id
+            JOIN vacancy_details vd ON vd.vacancy_id = vks.vacancy_id
+            GROUP BY ks.skill_id, ks.skill_name
+        """)
+        
         conn.commit()
         print("✅ OLAP представления созданы")
         
@@ -517,6 +910,8 @@ def show_final_summary():
         ("🔧 Технологии (детально)", "SELECT COUNT(*) FROM vacancy_technologies_detailed"),
         ("💰 Вакансии с зарплатами", "SELECT COUNT(*) FROM vacancy_details WHERE avg_salary IS NOT NULL"),
         ("🌟 Уникальных технологий", "SELECT COUNT(DISTINCT technology) FROM vacancy_technologies_detailed"),
+        ("🧩 Ключевых навыков", "SELECT COUNT(*) FROM key_skills"),
+        ("🔗 Навыков в вакансиях", "SELECT COUNT(*) FROM vacancy_key_skills"),
         ("🏭 Уникальных компаний", "SELECT COUNT(DISTINCT company) FROM vacancy_details WHERE company IS NOT NULL")
     ]
     
@@ -544,30 +939,70 @@ def show_final_summary():
     cur.close()
     conn.close()
 
-def main():
-    """Главная функция загрузки"""
-    print("🚀 ФИНАЛЬНАЯ ЗАГРУЗКА ДАННЫХ ДЛЯ OLAP АНАЛИЗА")
+def main(incremental=False, parallel=False, workers=LOAD_WORKERS):
+    """Главная функция загрузки.
+    
+    incremental - дозагрузка без пересоздания таблиц: загружаются только файлы,
+    которых нет в load_manifest, строки сливаются с уже загруженными.
+    parallel - полная загрузка источников одновременно в workers подключениях;
+    индексы и внешние ключи строятся после данных, затем ANALYZE.
+    """
+    print("🚀 ФИНАЛЬНАЯ ЗАГРУЗКА ДАННЫХ ДЛЯ OLAP АНАЛИЗА" if not incremental else "🚀 ДОЗАГРУЗКА ДАННЫХ ДЛЯ OLAP АНАЛИЗА")
     print("=" * 70)
     
+    load_started = time.perf_counter()
+    phases = []
+    
     try:
         # 1. Создаем таблицы
-        create_final_tables()
+        _, elapsed = run_timed(create_final_tables, not incremental, parallel)
+        phases.append(("Создание таблиц", elapsed))
         
-        # 2. Загружаем ФГОС
-        if not load_fgos_data():
-            print("⚠️ Проблемы с загрузкой ФГОС, но продолжаем...")
-        
-        # 3. Загружаем профстандарты
-        if not load_otf_td_data():
-            print("⚠️ Проблемы с загрузкой профстандартов, но продолжаем...")
-        
-        # 4. Загружаем данные HH
-        if not load_hh_data():
-            print("❌ Критическая ошибка с данными HH")
-            return False
+        if parallel:
+            # 2-4. ФГОС, профстандарты и HH одновременно
+            results, elapsed = run_timed(load_all_parallel, workers)
+            phases.append(("Загрузка данных (параллельно)", elapsed))
+            for name, (_, source_elapsed) in results.items():
+                phases.append((f"  • {name}", source_elapsed))
+            
+            for name, (success, _) in results.items():
+                if not success and name != 'HH':
+                    print(f"⚠️ Проблемы с загрузкой ({name}), но продолжаем...")
+            
+            # Индексы нужны и после неудачной загрузки HH: без них дозагрузка не работает
+            _, elapsed = run_timed(create_deferred_indexes, workers)
+            phases.append(("Индексы и внешние ключи", elapsed))
+            
+            if not results['HH'][0]:
+                print("❌ Критическая ошибка с данными HH")
+                return False
+            
+            _, elapsed = run_timed(analyze_tables, workers)
+            phases.append(("ANALYZE", elapsed))
+        else:
+            # 2. Загружаем ФГОС
+            success, elapsed = run_timed(load_fgos_data, incremental)
+            phases.append(("ФГОС", elapsed))
+            if not success:
+                print("⚠️ Проблемы с загрузкой ФГОС, но продолжаем...")
+            
+            # 3. Загружаем профстандарты
+            success, elapsed = run_timed(load_otf_td_data, incremental)
+            phases.append(("Профстандарты", elapsed))
+            if not success:
+                print("⚠️ Проблемы с загрузкой профстандартов, но продолжаем...")
+            
+            # 4. Загружаем данные HH
+            success, elapsed = run_timed(load_hh_data, incremental)
+            phases.append(("HH", elapsed))
+            if not success:
+                print("❌ Критическая ошибка с данными HH")
+                return False
         
         # 5. Создаем OLAP представления
-        create_olap_views()
+        _, elapsed = run_timed(create_olap_views)
+        phases.append(("OLAP представления", elapsed))
+        report_phases(phases, load_started)
         
         # 6. Показываем итоги
         show_final_summary()
@@ -588,4 +1023,14 @@ def main():
         return False
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    arg_parser = argparse.ArgumentParser(description="Загрузка данных для OLAP анализа")
+    mode = arg_parser.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true',
+                      help="дозагрузить новые файлы без пересоздания таблиц")
+    mode.add_argument('--parallel', action='store_true',
+                      help="полная загрузка в несколько подключений, индексы - после данных")
+    arg_parser.add_argument('--workers', type=int, default=LOAD_WORKERS,
+                            help="подключений для --parallel")
+    args = arg_parser.parse_args()
+    
+    main(incremental=args.incremental, parallel=args.parallel, workers=args.workers)
\ No newline at end of file
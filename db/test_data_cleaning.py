@@ -0,0 +1,167 @@
+import os
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_cleaning import clean_column, clean_frame, clean_value, column
+from db_loader import FGOS_SPEC, OTF_TD_SPEC, TECH_SPEC, VACANCY_SPEC, find_latest_snapshot, read_snapshot
+
+# Векторная очистка (clean_column / clean_frame) совпадает с построчной clean_data:
+# те же значения в ячейках и те же строки, что оставляла вставка по строке
+
+CSV_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'csv_files')
+
+EDGE_VALUES = [
+    None, np.nan, pd.NA, '', '   ', ' Python ', 'x' * 700, 'Москва', 0, 1, -1, 12, 12.7, -3.5, 0.4,
+    '12', ' 12 ', '1e3', '1_000', 'abc', 'nan', 'inf', '-inf', np.inf, -np.inf, True, False,
+    3e9, 2147483647, 2147483647.5, 2147483648, 10000000, 10000000.5, 15000000, -0.5, 1e30, -3e9,
+    '2025-07-04T12:10:30+0300', '2025-07-04', '04/07/2025', 'не дата', '2025-13-45T00:00:00+0300'
+]
+
+SPECS = [
+    column('text'),
+    column('text', max_length=5),
+    column('count', 'integer'),
+    column('count', 'integer', default=0),
+    column('frequency', 'integer', default=1),
+    column('salary', 'bigint'),
+    column('published_date', 'timestamp')
+]
+
+
+def normalize(values):
+    """NaN/NA -> None, числа NumPy -> int для сравнения"""
+    result = []
+    for value in values:
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            result.append(None)
+        elif isinstance(value, (np.integer, int)) and not isinstance(value, bool):
+            result.append(int(value))
+        else:
+            result.append(value)
+    return result
+
+
+def edge_columns():
+    """Граничные значения в столбцах разных типов (object, float, int, строки pandas, Arrow)"""
+    rng = random.Random(7)
+    numbers = [v for v in EDGE_VALUES if isinstance(v, (int, float)) and not isinstance(v, bool)]
+    strings = [v for v in EDGE_VALUES if isinstance(v, str)]
+    columns = {
+        'object': lambda: pd.Series(EDGE_VALUES, dtype=object),
+        'float64': lambda: pd.Series([float(v) for v in numbers]),
+        'int64': lambda: pd.Series([12, 0, -1, 2147483648, 15000000]),
+        'str': lambda: pd.Series(strings + [None], dtype='str'),
+        'shuffled': lambda: pd.Series(rng.sample(EDGE_VALUES, len(EDGE_VALUES)), dtype=object)
+    }
+    params = [pytest.param(make, id=label) for label, make in columns.items()]
+    params.append(pytest.param(lambda: pytest.importorskip('pyarrow').array(strings + [None]), id='arrow'))
+    return params
+
+
+def reference_frame(df, table_spec):
+    """Строки, которые оставляла прежняя загрузка (NOT NULL и ON CONFLICT DO NOTHING)"""
+    rows, seen = [], set()
+    sources = [df[spec.source].tolist() if spec.source in df.columns else [None] * len(df)
+               for spec in table_spec.columns]
+    names = [spec.name for spec in table_spec.columns]
+    for values in zip(*sources):
+        row = dict(zip(names, (clean_value(value, spec) for value, spec in zip(values, table_spec.columns))))
+        if any(row[spec.name] is None for spec in table_spec.columns if spec.required):
+            continue
+        if table_spec.unique:
+            key = tuple(row[name] for name in table_spec.unique)
+            if key in seen:
+                continue
+            seen.add(key)
+        rows.append([row[name] for name in names])
+    return rows
+
+
+def cleaned_rows(df, table_spec):
+    cleaned, skipped = clean_frame(df, table_spec)
+    return [normalize(row) for row in cleaned.astype(object).values.tolist()], skipped
+
+
+@pytest.mark.parametrize('spec', SPECS, ids=lambda spec: f"{spec.kind}-{spec.max_length}-{spec.default}")
+@pytest.mark.parametrize('make_values', edge_columns())
+def test_clean_column_matches_clean_data(make_values, spec):
+    values = make_values()
+    raw = values.to_pylist() if hasattr(values, 'to_pylist') else values.tolist()
+    expected = normalize(clean_value(value, spec) for value in raw)
+    actual = normalize(clean_column(values, spec).tolist())
+    assert [(value, want, got) for value, want, got in zip(raw, expected, actual) if want != got] == []
+
+
+def test_vacancy_frame_edge_cases():
+    """Пропуски, пустые строки, зарплаты строками, плохие даты и повтор ключа"""
+    df = pd.DataFrame({
+        'vacancy_id': ['1', '2', '3', '4', np.nan, '  ', '1', '5'],
+        'title': [' Python разработчик ', 'Data analyst', '', 'Go', 'Java', 'Rust', 'Повтор', np.nan],
+        'salary_from': ['1_000', 'abc', '1e3', '-5', '120000', '3e7', '5', '100'],
+        'salary_to': [np.nan, np.inf, '', ' 250000 ', 'nan', 0, 1, 2],
+        'published_date': ['2025-07-04T12:10:30+0300', 'не дата', '2025-13-45T00:00:00+0300',
+                           '2025-07-04', np.nan, '', '04/07/2025', '2025-07-04T12:10:30Z'],
+        'tech_count': [3, np.nan, '', '7.9', 'abc', 1, 2, 3]
+    })
+    rows, skipped = cleaned_rows(df, VACANCY_SPEC)
+
+    assert rows == [normalize(row) for row in reference_frame(df, VACANCY_SPEC)]
+    # Без id и названия, а также повтор id '1' - пропускаются
+    assert skipped == {'пустые обязательные поля': 4, 'повтор ключа': 1}
+
+    names = [spec.name for spec in VACANCY_SPEC.columns]
+    by_id = {row[0]: dict(zip(names, row)) for row in rows}
+    assert list(by_id) == ['1', '2', '4']
+    assert by_id['1']['title'] == 'Python разработчик'
+    assert by_id['1']['salary_from'] == 1000
+    assert by_id['2']['salary_from'] is None
+    assert by_id['4']['salary_from'] is None
+    assert by_id['2']['salary_to'] is None
+    assert by_id['4']['salary_to'] == 250000
+    assert by_id['1']['published_date'] == '2025-07-04 12:10:30'
+    assert by_id['2']['published_date'] is None
+    assert by_id['4']['published_date'] == '2025-07-04 00:00:00'
+    # Пустые счётчики - значение по умолчанию
+    assert [by_id[key]['tech_count'] for key in ('1', '2', '4')] == [3, 0, 7]
+
+
+def test_tech_frame_defaults_and_duplicates():
+    df = pd.DataFrame({
+        'vacancy_id': ['1', '1', '1', '2', '2'],
+        'technology': ['Python', 'Python', '   ', 'Go', 'Docker'],
+        'frequency': [2, 5, 1, np.nan, 0],
+        'level': ['middle', 'senior', None, '', 'x' * 80]
+    })
+    rows, skipped = cleaned_rows(df, TECH_SPEC)
+
+    assert rows == [normalize(row) for row in reference_frame(df, TECH_SPEC)]
+    assert skipped == {'пустые обязательные поля': 1, 'повтор ключа': 1}
+    frequency = [spec.name for spec in TECH_SPEC.columns].index('frequency')
+    assert [row[frequency] for row in rows] == [2, 1, 1]
+
+
+def test_empty_frame():
+    df = pd.DataFrame({'vacancy_id': pd.Series([], dtype=object), 'title': pd.Series([], dtype=object)})
+    cleaned, skipped = clean_frame(df, VACANCY_SPEC)
+    assert cleaned.empty
+    assert list(cleaned.columns) == [spec.name for spec in VACANCY_SPEC.columns]
+    assert reference_frame(df, VACANCY_SPEC) == []
+
+
+@pytest.mark.parametrize('table_spec, name', [
+    (FGOS_SPEC, 'fgos_competencies.csv'), (OTF_TD_SPEC, 'otf_td.csv'),
+    (VACANCY_SPEC, 'hh_vacancies_enhanced_'), (TECH_SPEC, 'hh_technologies_detailed_')
+], ids=lambda value: getattr(value, 'table', ''))
+def test_snapshot_tables_match(table_spec, name):
+    """Файлы из csv_files/: таблицы после очистки совпадают"""
+    if not name.endswith('.csv'):
+        name = find_latest_snapshot(CSV_DIR, name) if os.path.isdir(CSV_DIR) else None
+    if not name or not os.path.exists(os.path.join(CSV_DIR, name)):
+        pytest.skip(f"нет файла {table_spec.table} в csv_files")
+
+    df = read_snapshot(os.path.join(CSV_DIR, name))
+    rows, _ = cleaned_rows(df, table_spec)
+    assert rows == [normalize(row) for row in reference_frame(df, table_spec)]
@@ -0,0 +1,109 @@
+import os
+import shutil
+
+import pandas as pd
+import psycopg2
+import pytest
+
+import db_loader
+
+# Полная загрузка и дозагрузка (--incremental) на живой PostgreSQL. Таблицы
+# пересоздаются, поэтому нужна отдельная база: DB_LOADER_TEST_DATABASE=<имя>
+
+TEST_DATABASE = os.environ.get('DB_LOADER_TEST_DATABASE')
+REPO_CSV_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'csv_files')
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE, reason="не задана DB_LOADER_TEST_DATABASE")
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Рабочий каталог с csv_files/ (ФГОС и профстандарты - из репозитория) и тестовая база"""
+    monkeypatch.setitem(db_loader.DB_CONFIG, 'database', TEST_DATABASE)
+    try:
+        psycopg2.connect(**db_loader.DB_CONFIG).close()
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"PostgreSQL недоступен: {e}")
+
+    os.makedirs(tmp_path / 'csv_files')
+    for name in ('fgos_competencies.csv', 'otf_td.csv'):
+        shutil.copy(os.path.join(REPO_CSV_DIR, name), tmp_path / 'csv_files' / name)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def write_snapshot(timestamp, vacancies):
+    """Снимок HH: вакансии {id: (зарплата, [технологии])}"""
+    pd.DataFrame([{'vacancy_id': vacancy_id, 'title': f'Вакансия {vacancy_id}', 'avg_salary': salary}
+                  for vacancy_id, (salary, _) in vacancies.items()]
+                 ).to_csv(f'csv_files/hh_vacancies_enhanced_{timestamp}.csv', index=False)
+    pd.DataFrame([{'vacancy_id': vacancy_id, 'technology': tech, 'frequency': 1}
+                  for vacancy_id, (_, techs) in vacancies.items() for tech in techs]
+                 ).to_csv(f'csv_files/hh_technologies_detailed_{timestamp}.csv', index=False)
+
+
+def load(incremental):
+    """Загрузка в порядке main(), без представлений и итогов"""
+    db_loader.create_final_tables(drop_existing=not incremental)
+    assert db_loader.load_fgos_data(incremental)
+    assert db_loader.load_otf_td_data(incremental)
+    assert db_loader.load_hh_data(incremental)
+
+
+def vacancies_in_db():
+    conn = psycopg2.connect(**db_loader.DB_CONFIG)
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT vacancy_id, avg_salary FROM vacancy_details")
+        salaries = dict(cur.fetchall())
+        cur.execute("SELECT vacancy_id, technology FROM vacancy_technologies_detailed")
+        techs = {}
+        for vacancy_id, tech in cur.fetchall():
+            techs.setdefault(vacancy_id, set()).add(tech)
+        return {vacancy_id: (salary, techs.get(vacancy_id, set())) for vacancy_id, salary in salaries.items()}
+    finally:
+        conn.close()
+
+
+def query_value(sql):
+    conn = psycopg2.connect(**db_loader.DB_CONFIG)
+    try:
+        cur = conn.cursor()
+        cur.execute(sql)
+        return cur.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_incremental_after_full_load_skips_older_snapshots(workdir):
+    write_snapshot('20250701_000000', {'1': (100000, ['Python']), '2': (90000, ['Java'])})
+    write_snapshot('20250702_000000', {'1': (200000, ['Go']), '3': (150000, ['Rust'])})
+
+    load(incremental=False)
+    current = {'1': (200000, {'Go'}), '3': (150000, {'Rust'})}
+    assert vacancies_in_db() == current
+
+    # Старый снимок не попал в журнал полной загрузки, но и дозагружаться не должен
+    load(incremental=True)
+    assert vacancies_in_db() == current
+
+    write_snapshot('20250703_000000', {'3': (160000, ['Rust', 'Docker']), '4': (80000, ['PHP'])})
+    load(incremental=True)
+    assert vacancies_in_db() == {'1': (200000, {'Go'}), '3': (160000, {'Rust', 'Docker'}),
+                                 '4': (80000, {'PHP'})}
+
+
+def test_same_size_edit_is_reloaded(workdir):
+    write_snapshot('20250701_000000', {'1': (100000, ['Python'])})
+    load(incremental=False)
+
+    path = 'csv_files/fgos_competencies.csv'
+    with open(path, 'rb') as f:
+        data = f.read()
+    edited = data.replace(b'02.03.03', b'02.03.99', 1)
+    assert len(edited) == len(data) and edited != data
+    with open(path, 'wb') as f:
+        f.write(edited)
+
+    load(incremental=True)
+    assert query_value("SELECT COUNT(*) FROM fgos_competencies WHERE direction_code = '02.03.99'") > 0
@@ -0,0 +1,95 @@
+from collections import Counter
+
+ANALYTICS_COLUMNS = ['technology', 'total_mentions', 'vacancy_count', 'avg_salary',
+                     'min_salary', 'max_salary', 'top_role', 'top_experience', 'top_domain']
+
+# Счётчики значений, по которым выбирается самое частое
+MODE_FIELDS = ('roles', 'experience_levels', 'domains')
+
+
+class TechAnalyticsAggregator:
+    """Потоковая агрегация аналитики по технологиям (вакансии не хранятся).
+
+    На технологию хранятся только суммы, минимум/максимум зарплаты и счётчики
+    значений, поэтому память - O(технологий). Агрегаты частей выборки (шардов,
+    процессов) объединяются merge; объединение по порядку частей даёт тот же
+    результат, что последовательная обработка всех вакансий.
+    """
+
+    def __init__(self):
+        self.tech_stats = {}
+
+    def add(self, vacancy):
+        """Учёт одной обработанной вакансии"""
+        for tech, info in vacancy['technologies'].items():
+            stats = self._stats(tech)
+            stats['total_mentions'] += info['frequency']
+            stats['vacancy_count'] += 1
+
+            salary = vacancy.get('avg_salary')
+            if salary:
+                stats['salary_sum'] += salary
+                stats['salary_count'] += 1
+                if stats['salary_min'] is None or salary < stats['salary_min']:
+                    stats['salary_min'] = salary
+                if stats['salary_max'] is None or salary > stats['salary_max']:
+                    stats['salary_max'] = salary
+
+            stats['roles'][vacancy['role']] += 1
+            stats['experience_levels'][vacancy['experience_level']] += 1
+            stats['domains'][vacancy['domain']] += 1
+
+    def merge(self, other):
+        """Добавление агрегатов другой части выборки (other не изменяется)"""
+        for tech, other_stats in other.tech_stats.items():
+            stats = self._stats(tech)
+            for field in ('total_mentions', 'vacancy_count', 'salary_sum', 'salary_count'):
+                stats[field] += other_stats[field]
+
+            if other_stats['salary_min'] is not None:
+                if stats['salary_min'] is None or other_stats['salary_min'] < stats['salary_min']:
+                    stats['salary_min'] = other_stats['salary_min']
+                if stats['salary_max'] is None or other_stats['salary_max'] > stats['salary_max']:
+                    stats['salary_max'] = other_stats['salary_max']
+
+            for field in MODE_FIELDS:
+                stats[field].update(other_stats[field])
+        return self
+
+    def _stats(self, tech):
+        stats = self.tech_stats.get(tech)
+        if stats is None:
+            stats = self.tech_stats[tech] = {
+                'total_mentions': 0,
+                'vacancy_count': 0,
+                'salary_sum': 0,
+                'salary_count': 0,
+                'salary_min': None,
+                'salary_max': None,
+                'roles': Counter(),
+                'experience_levels': Counter(),
+                'domains': Counter()
+            }
+        return stats
+
+    def rows(self):
+        """Итоговые строки аналитики (порядок - по первому упоминанию технологии)"""
+        analytics = []
+        for tech, stats in self.tech_stats.items():
+            analytics.append({
+                'technology': tech,
+                'total_mentions': stats['total_mentions'],
+                'vacancy_count': stats['vacancy_count'],
+                'avg_salary': stats['salary_sum'] / stats['salary_count'] if stats['salary_count'] else None,
+                'min_salary': stats['salary_min'],
+                'max_salary': stats['salary_max'],
+                'top_role': top_value(stats['roles']),
+                'top_experience': top_value(stats['experience_levels']),
+                'top_domain': top_value(stats['domains'])
+            })
+        return analytics
+
+
+def top_value(counter):
+    """Самое частое значение (при равенстве - встреченное первым)"""
+    return max(counter, key=counter.get) if counter else None
@@ -0,0 +1,136 @@
+import argparse
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from mock_hh_server import add_server_arguments
+from new_parser import HHEnhancedParser
+
+# Сквозной замер парсинга: run_enhanced_parsing против локальной заглушки API HH.
+# Заглушка работает в отдельном процессе, чтобы не делить GIL с парсером.
+# Результат можно сохранить (--save) и сравнить с прошлым (--baseline).
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_mock_server(args, port):
+    """Запуск mock_hh_server.py в отдельном процессе и ожидание готовности"""
+    command = [sys.executable, os.path.join(HERE, 'mock_hh_server.py'), '--port', str(port),
+               '--vacancies', str(args.vacancies), '--latency-ms', str(args.latency_ms),
+               '--error-rate', str(args.error_rate), '--throttle-rate', str(args.throttle_rate),
+               '--seed', str(args.seed)]
+    if args.fixtures:
+        command += ['--fixtures'] + [os.path.abspath(path) for path in args.fixtures]
+
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError("заглушка API HH не запустилась")
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("заглушка API HH не ответила за 60 с")
+
+
+def run_benchmark(args):
+    port = free_port()
+    server = start_mock_server(args, port)
+    workdir = tempfile.TemporaryDirectory(prefix='hh_bench_')
+    cwd = os.getcwd()
+    try:
+        # Файлы снимка, журнал и состояние пишутся во временный каталог (удаляется после замера)
+        os.chdir(workdir.name)
+        parser = HHEnhancedParser(max_workers=args.workers, requests_per_second=args.rps,
+                                  cache_path=None, archive_dir=None, pipeline=args.pipeline,
+                                  analysis_workers=args.analysis_workers,
+                                  base_url=f"http://127.0.0.1:{port}", enrich_employers=args.employers)
+        started = time.perf_counter()
+        total = parser.run_enhanced_parsing()
+        elapsed = time.perf_counter() - started
+    finally:
+        os.chdir(cwd)
+        workdir.cleanup()
+        server.terminate()
+        server.wait()
+
+    requests_count = parser.connection_stats.summary()['requests']
+    return {
+        'mode': 'pipeline' if args.pipeline else 'sequential',
+        'workers': args.workers,
+        'latency_ms': args.latency_ms,
+        'vacancies': total,
+        'requests': requests_count,
+        'seconds': elapsed,
+        'vacancies_per_second': total / elapsed,
+        'requests_per_second': requests_count / elapsed,
+        # ru_maxrss в Linux - в килобайтах; процессы анализа (--pipeline) сюда не входят
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def check_regression(result, baseline, tolerance):
+    """Список регрессий относительно сохранённого результата"""
+    problems = []
+    if result['vacancies_per_second'] < baseline['vacancies_per_second'] * (1 - tolerance):
+        problems.append(f"вакансий/с: {result['vacancies_per_second']:.1f} "
+                        f"(было {baseline['vacancies_per_second']:.1f})")
+    if result['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + tolerance):
+        problems.append(f"пиковая память: {result['peak_rss_mb']:.0f} МБ "
+                        f"(было {baseline['peak_rss_mb']:.0f} МБ)")
+    return problems
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Замер парсинга против заглушки API HH")
+    add_server_arguments(arg_parser)
+    arg_parser.add_argument('--workers', type=int, default=8)
+    arg_parser.add_argument('--rps', type=float, default=1000.0,
+                            help="лимит запросов в секунду (по умолчанию не ограничивает)")
+    arg_parser.add_argument('--pipeline', action='store_true')
+    arg_parser.add_argument('--analysis-workers', type=int, default=None)
+    arg_parser.add_argument('--employers', action='store_true',
+                            help="запрашивать сведения о работодателях (/employers/{id})")
+    arg_parser.add_argument('--save', metavar='PATH', help="сохранить результат в JSON")
+    arg_parser.add_argument('--baseline', metavar='PATH', help="сравнить с сохранённым результатом")
+    arg_parser.add_argument('--tolerance', type=float, default=0.15,
+                            help="допустимое ухудшение относительно --baseline")
+    args = arg_parser.parse_args()
+
+    result = run_benchmark(args)
+
+    print(f"\n🏁 Режим {result['mode']}, {result['workers']} потоков, задержка {result['latency_ms']:.0f} мс")
+    print(f"  Вакансий: {result['vacancies']} за {result['seconds']:.1f} с "
+          f"({result['vacancies_per_second']:.1f}/с)")
+    print(f"  Запросов: {result['requests']} ({result['requests_per_second']:.1f}/с)")
+    print(f"  Пиковая память: {result['peak_rss_mb']:.0f} МБ")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            problems = check_regression(result, json.load(f), args.tolerance)
+        if problems:
+            print("❌ Регрессия: " + "; ".join(problems))
+            sys.exit(1)
+        print("✅ Без регрессий относительно базового замера")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import random
+import re
+import time
+
+from keyword_matcher import KeywordMatcher
+
+# Микробенчмарк: пропускная способность поиска технологий в зависимости от размера словаря.
+# Сравнивается прежний подход (re.findall на каждую технологию) и KeywordMatcher.
+
+BASE_TECHNOLOGIES = ['python', 'javascript', 'react', 'sql', 'docker', 'git']
+FILLER_WORDS = ['опыт', 'работы', 'разработка', 'команда', 'проект', 'сервис', 'знание',
+                'backend', 'api', 'данные', 'задачи', 'условия', 'офис', 'удалённо']
+
+
+def make_dictionary(size, rng):
+    """Словарь из реальных технологий, дополненный синтетическими названиями"""
+    dictionary = list(BASE_TECHNOLOGIES)
+    while len(dictionary) < size:
+        length = rng.randint(3, 12)
+        word = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(length))
+        if rng.random() < 0.2:
+            word += rng.choice(['.js', ' core', '-cli', '++'])
+        if word not in dictionary:
+            dictionary.append(word)
+    return dictionary
+
+
+def make_documents(dictionary, count, rng, words_per_doc=400):
+    """Тексты вакансий: обычные слова вперемешку с технологиями словаря"""
+    documents = []
+    for _ in range(count):
+        words = [rng.choice(dictionary) if rng.random() < 0.05 else rng.choice(FILLER_WORDS)
+                 for _ in range(words_per_doc)]
+        documents.append(' '.join(words))
+    return documents
+
+
+def count_per_keyword(dictionary, text):
+    """Прежняя реализация: отдельный проход регулярным выражением на каждую технологию"""
+    found = {}
+    for tech in dictionary:
+        matches = len(re.findall(r'\b' + re.escape(tech) + r'\b', text))
+        if matches > 0:
+            found[tech] = matches
+    return found
+
+
+def measure(function, documents):
+    """Время обработки документов и пропускная способность в МБ/с"""
+    started = time.perf_counter()
+    results = [function(document) for document in documents]
+    elapsed = time.perf_counter() - started
+    megabytes = sum(len(document.encode('utf-8')) for document in documents) / 1024 / 1024
+    return results, elapsed, megabytes / elapsed
+
+
+def main():
+    rng = random.Random(42)
+
+    print(f"{'Словарь':>8} | {'re.findall, МБ/с':>17} | {'KeywordMatcher, МБ/с':>21} | {'Сборка, с':>9} | Ускорение")
+    print("-" * 78)
+
+    for size in [6, 100, 1000, 5000]:
+        dictionary = make_dictionary(size, rng)
+        documents = make_documents(dictionary, 200, rng)
+
+        started = time.perf_counter()
+        matcher = KeywordMatcher(dictionary)
+        build_time = time.perf_counter() - started
+
+        # Прежний подход на больших словарях слишком медленный - меряем на части текстов
+        sample = documents[:max(5, 200 * 6 // size)]
+        old_results, _, old_speed = measure(lambda text: count_per_keyword(dictionary, text), sample)
+        new_results, _, new_speed = measure(lambda text: dict(matcher.count(text)), documents)
+
+        assert old_results == new_results[:len(sample)], "результаты поиска расходятся"
+
+        print(f"{size:>8} | {old_speed:>17.2f} | {new_speed:>21.2f} | {build_time:>9.3f} | {new_speed / old_speed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import json
+import random
+import time
+import tracemalloc
+
+from new_parser import HHEnhancedParser
+
+# Замер памяти: 100 тыс. обработанных вакансий в прежнем виде (вложенные словари)
+# и в виде VacancyRecord. JSON каждой вакансии разбирается отдельно, как ответ API,
+# поэтому одинаковые строки разных вакансий - разные объекты.
+
+VACANCY_COUNT = 100_000
+
+AREAS = ['Москва', 'Санкт-Петербург', 'Новосибирск', 'Екатеринбург', 'Казань']
+EXPERIENCE = ['Нет опыта', 'От 1 года до 3 лет', 'От 3 до 6 лет', 'Более 6 лет']
+SCHEDULES = ['Полный день', 'Удаленная работа', 'Гибкий график']
+COMPANIES = [f'Компания {index}' for index in range(2000)]
+TEXT_WORDS = ['python', 'javascript', 'react', 'sql', 'docker', 'git', 'backend', 'api',
+              'данные', 'банк', 'опыт', 'разработка', 'команда', 'проект']
+
+
+def make_raw_vacancy(vacancy_id, rng):
+    """JSON вакансии в формате API HH"""
+    salary_from = rng.choice([None, 80000, 120000, 200000])
+    data = {
+        'id': str(vacancy_id),
+        'name': rng.choice(['Python разработчик', 'Backend разработчик', 'Data analyst']),
+        'employer': {'name': rng.choice(COMPANIES)},
+        'area': {'name': rng.choice(AREAS)},
+        'published_at': f'2025-07-{rng.randint(1, 28):02d}T12:00:00+0300',
+        'experience': {'name': rng.choice(EXPERIENCE)},
+        'schedule': {'name': rng.choice(SCHEDULES)},
+        'employment': {'name': 'Полная занятость'},
+        'salary': {'from': salary_from, 'to': salary_from and salary_from + 50000,
+                   'currency': 'RUR', 'gross': False} if salary_from else None,
+        'description': ' '.join(rng.choice(TEXT_WORDS) for _ in range(60)),
+        'key_skills': [{'name': rng.choice(['Git', 'SQL', 'Python', 'Linux'])} for _ in range(3)]
+    }
+    return json.loads(json.dumps(data, ensure_ascii=False))
+
+
+def process_as_dict(parser, vacancy_data):
+    """Прежнее представление: словарь с копией метаданных каждой технологии"""
+    record = parser.process_vacancy_data(vacancy_data)
+    processed = {key: getattr(record, key) for key in record.__slots__[:-4]}
+    technologies = parser.describe_technologies(dict(zip(
+        (record.catalog.names[tech_id] for tech_id in record.tech_ids), record.tech_frequencies)))
+    competencies = parser.map_to_competencies(technologies)
+    processed.update({
+        'technologies': technologies,
+        'tech_count': len(technologies),
+        'key_skills': list(record.key_skills),
+        'skills_count': len(record.key_skills),
+        'fgos_competencies': competencies['fgos'],
+        'prof_standard_competencies': competencies['prof_standards']
+    })
+    return processed
+
+
+def measure(build, raw_vacancies):
+    """Память, занятая результатами обработки (без исходных JSON)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    results = [build(vacancy_data) for vacancy_data in raw_vacancies]
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, current, elapsed
+
+
+def main():
+    rng = random.Random(42)
+    parser = HHEnhancedParser(max_workers=1, cache_path=None)
+
+    print(f"Генерация {VACANCY_COUNT} вакансий...")
+    raw_vacancies = [make_raw_vacancy(index, rng) for index in range(VACANCY_COUNT)]
+
+    dicts, dict_memory, dict_time = measure(lambda data: process_as_dict(parser, data), raw_vacancies)
+    del dicts
+    records, record_memory, record_time = measure(parser.process_vacancy_data, raw_vacancies)
+
+    # Контроль: компактная запись даёт те же данные
+    for vacancy_data, record in zip(raw_vacancies[:1000], records):
+        expected = process_as_dict(parser, vacancy_data)
+        actual = record.to_dict()
+        expected['fgos_competencies'] = sorted(expected['fgos_competencies'])
+        expected['prof_standard_competencies'] = sorted(expected['prof_standard_competencies'])
+        assert expected == actual, f"вакансия {vacancy_data['id']} расходится"
+
+    print(f"{'Представление':>16} | {'Память, МБ':>10} | {'Байт на вакансию':>16} | {'Время, с':>8}")
+    print("-" * 62)
+    for name, memory, elapsed in [('dict', dict_memory, dict_time),
+                                  ('VacancyRecord', record_memory, record_time)]:
+        print(f"{name:>16} | {memory / 1024 / 1024:>10.1f} | {memory / VACANCY_COUNT:>16.0f} | {elapsed:>8.1f}")
+    print(f"Экономия памяти: {dict_memory / record_memory:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
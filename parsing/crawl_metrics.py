@@ -0,0 +1,194 @@
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+# Границы корзин гистограмм задержек, секунды
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROCESS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+METRIC_HELP = {
+    'hh_http_request_duration_seconds': ('histogram', "Время HTTP-запроса к API HH"),
+    'hh_http_responses_total': ('counter', "Ответы API HH по коду (error - сетевая ошибка)"),
+    'hh_http_response_bytes_total': ('counter', "Объём тел ответов API HH после распаковки"),
+    'hh_http_retries_total': ('counter', "Повторы запросов после 429/5xx и сетевых ошибок"),
+    'hh_http_throttles_total': ('counter', "Ответы 429 (ограничение скорости)"),
+    'hh_cache_requests_total': ('counter', "Обращения к кэшу деталей вакансий"),
+    'hh_lite_vacancies_total': ('counter', "Облегчённый режим: источник записи (cached, snippet, detail)"),
+    'hh_vacancy_process_seconds': ('histogram', "Время process_vacancy_data на вакансию"),
+    'hh_query_vacancies_total': ('counter', "Обработанные вакансии по запросу"),
+    'hh_query_duration_seconds': ('gauge', "Время от начала поиска по запросу до последней вакансии"),
+    'hh_query_vacancies_per_second': ('gauge', "Скорость обработки вакансий по запросу"),
+    'hh_crawl_duration_seconds': ('gauge', "Длительность запуска")
+}
+
+HISTOGRAM_BUCKETS = {
+    'hh_http_request_duration_seconds': LATENCY_BUCKETS,
+    'hh_vacancy_process_seconds': PROCESS_BUCKETS
+}
+
+_ID_SEGMENT_RE = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_label(path):
+    """Метка эндпоинта без идентификаторов: /vacancies/123 -> /vacancies/{id}"""
+    return _ID_SEGMENT_RE.sub('/{id}', path)
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами (как в Prometheus)"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Накопленные значения по корзинам, последняя - +Inf"""
+        total, result = 0, []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class CrawlMetrics:
+    """Счётчики и гистограммы парсинга с выгрузкой в JSON или textfile Prometheus"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.counters = Counter()
+        self.histograms = {}
+        # Запрос -> [начало, конец последней вакансии, число вакансий]
+        self.queries = {}
+
+    def inc(self, name, value=1, **labels):
+        with self.lock:
+            self.counters[name, tuple(sorted(labels.items()))] += value
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.counters[name, tuple(sorted(labels.items()))] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(HISTOGRAM_BUCKETS[name])
+            histogram.observe(value)
+
+    def start_query(self, query):
+        now = time.perf_counter()
+        with self.lock:
+            self.queries.setdefault(query, [now, now, 0])
+
+    def vacancy_done(self, query):
+        now = time.perf_counter()
+        with self.lock:
+            timing = self.queries.setdefault(query, [now, now, 0])
+            timing[1] = now
+            timing[2] += 1
+
+    def total_time(self, name):
+        """Суммарное время по всем гистограммам метрики и число наблюдений"""
+        with self.lock:
+            histograms = [h for (metric, _), h in self.histograms.items() if metric == name]
+            return sum(h.sum for h in histograms), sum(h.count for h in histograms)
+
+    def snapshot(self):
+        """Все метрики: имя -> список (метки, значение); гистограммы - словарём"""
+        with self.lock:
+            metrics = {}
+            for (name, labels), value in self.counters.items():
+                metrics.setdefault(name, []).append((dict(labels), value))
+
+            for (name, labels), histogram in self.histograms.items():
+                metrics.setdefault(name, []).append((dict(labels), {
+                    'buckets': [[bound, count] for bound, count in histogram.cumulative()],
+                    'sum': histogram.sum,
+                    'count': histogram.count
+                }))
+
+            for query, (started, finished, count) in self.queries.items():
+                duration = finished - started
+                labels = {'query': query}
+                metrics.setdefault('hh_query_vacancies_total', []).append((labels, count))
+                metrics.setdefault('hh_query_duration_seconds', []).append((labels, duration))
+                metrics.setdefault('hh_query_vacancies_per_second', []).append(
+                    (labels, count / duration if duration > 0 else 0.0))
+
+            metrics['hh_crawl_duration_seconds'] = [({}, time.perf_counter() - self.started)]
+            return metrics
+
+    def to_json(self):
+        result = {}
+        for name, samples in self.snapshot().items():
+            result[name] = [dict(labels=labels, value=value) for labels, value in samples]
+            for sample in result[name]:
+                value = sample['value']
+                if isinstance(value, dict):
+                    # +Inf в JSON не представим
+                    value['buckets'] = [['+Inf' if bound == float('inf') else bound, count]
+                                        for bound, count in value['buckets']]
+        return result
+
+    def to_prometheus(self):
+        """Текстовый формат экспозиции Prometheus"""
+        lines = []
+        for name, samples in sorted(self.snapshot().items()):
+            kind, help_text = METRIC_HELP.get(name, ('untyped', name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                if kind != 'histogram':
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                for bound, count in value['buckets']:
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{name}_bucket{_format_labels(dict(labels, le=le))} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path):
+        """Запись метрик через временный файл: .json - JSON, иначе textfile Prometheus"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if path.endswith('.json'):
+            content = json.dumps(self.to_json(), ensure_ascii=False, indent=2)
+        else:
+            content = self.to_prometheus()
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        print(f"  📈 Метрики: {path}")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return '{' + ','.join(escaped) + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
@@ -0,0 +1,219 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# Маркер завершения стадии
+_DONE = object()
+
+# Парсер внутри процесса анализа (создаётся инициализатором пула)
+_worker_parser = None
+
+
+def init_analysis_worker(tables):
+    """Инициализация процесса анализа: словари берутся из основного парсера"""
+    global _worker_parser
+    from new_parser import HHEnhancedParser
+
+    _worker_parser = HHEnhancedParser(max_workers=1, cache_path=None, enrich_employers=False)
+    for name, value in tables.items():
+        setattr(_worker_parser, name, value)
+    _worker_parser.build_text_matcher()
+
+
+def analyze_vacancy(vacancy_data):
+    """Анализ текста вакансии в процессе пула: (результат, время анализа)"""
+    started = time.perf_counter()
+    processed = _worker_parser.process_vacancy_data(vacancy_data)
+    return processed, time.perf_counter() - started
+
+
+def analyze_batch(batch):
+    """Анализ пачки вакансий (меньше накладных расходов на передачу между процессами)"""
+    return [analyze_vacancy(vacancy_data) for vacancy_data in batch]
+
+
+def analysis_tables(parser):
+    """Словари парсера, влияющие на анализ текста"""
+    return {
+        'tech_competency_mapping': parser.tech_competency_mapping,
+        'role_keywords': parser.role_keywords,
+        'domain_keywords': parser.domain_keywords,
+        'experience_mapping': parser.experience_mapping
+    }
+
+
+class StageCounter:
+    """Счётчик пропускной способности стадии конвейера"""
+
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.items = 0
+        self.errors = 0
+        self.busy_time = 0.0
+
+    def record(self, seconds, error=False):
+        with self.lock:
+            self.items += 1
+            self.busy_time += seconds
+            if error:
+                self.errors += 1
+
+    def report(self, elapsed):
+        rate = self.items / elapsed if elapsed else 0.0
+        return f"{self.name}: {self.items} шт. ({rate:.1f}/с), ошибок {self.errors}, в работе {self.busy_time:.1f} с"
+
+
+class CrawlPipeline:
+    """Конвейер парсинга: поиск -> загрузка деталей (потоки) -> анализ (процессы) -> запись.
+
+    Стадии связаны ограниченными очередями, поэтому быстрая стадия ждёт медленную
+    (обратное давление), а память не растёт при отставании анализа или записи.
+    """
+
+    def __init__(self, parser, fetch_workers=8, analysis_workers=None, queue_size=200):
+        self.parser = parser
+        self.fetch_workers = max(1, fetch_workers)
+        self.analysis_workers = analysis_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+
+        self.counters = {
+            'fetch': StageCounter('Загрузка'),
+            'analysis': StageCounter('Анализ'),
+            'write': StageCounter('Запись')
+        }
+
+    def run(self, queries, max_pages, sink):
+        """Запуск конвейера; sink(vacancy) вызывается для каждой обработанной вакансии"""
+        fetch_queue = queue.Queue(maxsize=self.queue_size)
+        raw_queue = queue.Queue(maxsize=self.queue_size)
+        # Очередь future в порядке отправки: её размер ограничивает задачи в пуле
+        result_queue = queue.Queue(maxsize=self.analysis_workers * 4)
+        started = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=self.analysis_workers,
+                                 initializer=init_analysis_worker,
+                                 initargs=(analysis_tables(self.parser),)) as executor:
+            threads = [threading.Thread(target=self._search, args=(queries, max_pages, fetch_queue),
+                                        name='search', daemon=True)]
+            threads += [threading.Thread(target=self._fetch, args=(fetch_queue, raw_queue),
+                                         name=f'fetch-{i}', daemon=True)
+                        for i in range(self.fetch_workers)]
+            threads.append(threading.Thread(target=self._dispatch, args=(raw_queue, result_queue, executor),
+                                            name='dispatch', daemon=True))
+            for thread in threads:
+                thread.start()
+
+            self._write(result_queue, sink)
+
+            for thread in threads:
+                thread.join()
+
+        elapsed = time.perf_counter() - started
+        print(f"  ⚙️ Конвейер за {elapsed:.1f} с:")
+        for counter in self.counters.values():
+            print(f"    {counter.report(elapsed)}")
+
+    def _search(self, queries, max_pages, fetch_queue):
+        """Стадия поиска: вакансии со страниц выдачи в очередь загрузки"""
+        try:
+            for query, page, vacancies in self.parser.iter_search_pages(queries, max_pages):
+                for vacancy in vacancies:
+                    fetch_queue.put((query, page, vacancy))
+                print(f"  Страница {page + 1}: {len(vacancies)} вакансий в очереди")
+        finally:
+            for _ in range(self.fetch_workers):
+                fetch_queue.put(_DONE)
+
+    def _fetch(self, fetch_queue, raw_queue):
+        """Стадия загрузки: детали вакансий (JSON) в очередь анализа"""
+        counter = self.counters['fetch']
+        while True:
+            item = fetch_queue.get()
+            if item is _DONE:
+                raw_queue.put(_DONE)
+                return
+
+            query, page, vacancy = item
+            started = time.perf_counter()
+            try:
+                vacancy_data = self.parser.get_vacancy_json(vacancy['id'], vacancy)
+            except Exception as e:
+                print(f"Ошибка загрузки вакансии {vacancy.get('id')}: {e}")
+                counter.record(time.perf_counter() - started, error=True)
+                self.parser.finish_vacancy(query, page, vacancy['id'], False)
+                continue
+
+            counter.record(time.perf_counter() - started)
+            # Блокируется, если анализ не успевает (обратное давление)
+            raw_queue.put((query, page, vacancy['id'], vacancy_data))
+
+    def _dispatch(self, raw_queue, result_queue, executor):
+        """Передача JSON в пул процессов анализа"""
+        finished_fetchers = 0
+        while finished_fetchers < self.fetch_workers:
+            item = raw_queue.get()
+            if item is _DONE:
+                finished_fetchers += 1
+                continue
+            query, page, vacancy_id, vacancy_data = item
+            result_queue.put((query, page, vacancy_id, executor.submit(analyze_vacancy, vacancy_data)))
+        result_queue.put(_DONE)
+
+    def _write(self, result_queue, sink):
+        """Стадия записи: результаты анализа в sink"""
+        while True:
+            item = result_queue.get()
+            if item is _DONE:
+                return
+
+            query, page, vacancy_id, future = item
+            try:
+                processed, analysis_time = future.result()
+                self.counters['analysis'].record(analysis_time)
+                self.parser.metrics.observe('hh_vacancy_process_seconds', analysis_time)
+            except Exception as e:
+                print(f"Ошибка обработки вакансии {vacancy_id}: {e}")
+                self.counters['analysis'].record(0.0, error=True)
+                self.parser.finish_vacancy(query, page, vacancy_id, False)
+                continue
+
+            started = time.perf_counter()
+            sink(processed)
+            self.counters['write'].record(time.perf_counter() - started)
+            self.parser.finish_vacancy(query, page, vacancy_id, True)
+
+
+def reprocess_records(parser, records, sink, analysis_workers=None, batch_size=64):
+    """Анализ готовых JSON вакансий в пуле процессов без обращения к сети.
+
+    Пачки отправляются скользящим окном, поэтому в памяти не больше нескольких
+    пачек на процесс; порядок результатов совпадает с порядком записей.
+    """
+    workers = analysis_workers or os.cpu_count() or 1
+    records = iter(records)
+    window = deque()
+    total = 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_analysis_worker,
+                             initargs=(analysis_tables(parser),)) as executor:
+        while True:
+            while len(window) < workers * 4:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                window.append(executor.submit(analyze_batch, batch))
+
+            if not window:
+                break
+
+            for processed, analysis_time in window.popleft().result():
+                parser.metrics.observe('hh_vacancy_process_seconds', analysis_time)
+                sink(processed)
+                total += 1
+
+    return total
@@ -0,0 +1,169 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+# Поиск HH отдаёт не больше 2000 вакансий на запрос (20 страниц по 100)
+SEARCH_DEPTH_LIMIT = 2000
+PER_PAGE = 100
+
+# Россия - вся страна одним регионом
+DEFAULT_AREAS = ('113',)
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+
+
+class Shard:
+    """Часть поискового запроса: регион и окно дат публикации [date_from, date_to]"""
+
+    def __init__(self, query, area, date_from, date_to):
+        self.query = query
+        self.area = area
+        self.date_from = date_from
+        self.date_to = date_to
+
+    @property
+    def key(self):
+        """Метка шарда для журнала и вывода"""
+        return (f"{self.query} [area={self.area} "
+                f"{self.date_from.strftime(DATE_FORMAT)}..{self.date_to.strftime(DATE_FORMAT)}]")
+
+    def params(self, page):
+        return {
+            'text': self.query,
+            'page': page,
+            'per_page': PER_PAGE,
+            'area': self.area,
+            'date_from': self.date_from.strftime(DATE_FORMAT),
+            'date_to': self.date_to.strftime(DATE_FORMAT),
+            'only_with_salary': 'false'
+        }
+
+    def can_split(self):
+        return self.date_to - self.date_from >= timedelta(seconds=2)
+
+    def split(self):
+        """Две половины окна без пересечения (границы с точностью до секунды)"""
+        middle = self.date_from + (self.date_to - self.date_from) / 2
+        middle = middle.replace(microsecond=0)
+        return [Shard(self.query, self.area, self.date_from, middle),
+                Shard(self.query, self.area, middle + timedelta(seconds=1), self.date_to)]
+
+
+class CrawlPlanner:
+    """Шардированный обход выдачи HH в обход ограничения глубины пагинации.
+
+    Запрос делится на шарды по регионам и окнам дат; шард, в котором найдено
+    больше SEARCH_DEPTH_LIMIT вакансий, делится пополам по времени. Шарды
+    обходятся параллельно, все запросы идут через общий лимитер парсера.
+    """
+
+    def __init__(self, parser, areas=DEFAULT_AREAS, workers=4, period_days=30):
+        self.parser = parser
+        self.areas = list(areas)
+        self.workers = max(1, workers)
+        self.period = timedelta(days=period_days)
+        self.split_count = 0
+        # Были ли ошибки в последнем обходе (водяной знак тогда не сдвигается)
+        self.failed = False
+
+    def initial_shards(self, query, date_from=None, date_to=None):
+        """Шарды запроса до деления: по одному на регион"""
+        date_to = date_to or datetime.now().astimezone()
+        date_from = date_from or date_to - self.period
+        date_to, date_from = date_to.replace(microsecond=0), date_from.replace(microsecond=0)
+        return [Shard(query, area, date_from, date_to) for area in self.areas]
+
+    def iter_pages(self, query, date_from=None, date_to=None):
+        """Страницы выдачи всех шардов запроса: (шард, страница, вакансии)"""
+        # Ограниченная очередь: обход выдачи не убегает вперёд загрузки деталей
+        results = queue.Queue(maxsize=self.workers * 2)
+        stop = threading.Event()
+        pending = 0
+        failed = False
+
+        def put(item):
+            """False - обход прерван, шард дальше не обходится"""
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='shard') as executor:
+            def submit(shard):
+                nonlocal pending
+                pending += 1
+                executor.submit(self._crawl_shard, shard, put, stop)
+
+            try:
+                for shard in self.initial_shards(query, date_from, date_to):
+                    submit(shard)
+
+                while pending:
+                    kind, shard, payload = results.get()
+                    if kind == 'split':
+                        self.split_count += 1
+                        for child in payload:
+                            submit(child)
+                    elif kind == 'page':
+                        page, vacancies = payload
+                        yield shard, page, vacancies
+                    elif kind == 'done':
+                        pending -= 1
+                        failed = failed or payload
+            finally:
+                # Прерванный обход: освобождаем потоки, ждущие места в очереди
+                stop.set()
+
+        self.failed = failed
+
+    def _crawl_shard(self, shard, put, stop):
+        """Обход одного шарда в потоке пула; результаты передаются через put"""
+        if stop.is_set():
+            return
+        failed = False
+        try:
+            failed = self._crawl_pages(shard, put)
+        except Exception as e:
+            print(f"Ошибка шарда {shard.key}: {e}")
+            failed = True
+        finally:
+            put(('done', shard, failed))
+
+    def _crawl_pages(self, shard, put):
+        journal = self.parser.journal
+        # Первая страница нужна всегда: по found решаем, делить ли шард
+        data = self.parser.api_get("/vacancies", shard.params(0))
+        found = data.get('found', 0)
+
+        failed = False
+        if found > SEARCH_DEPTH_LIMIT:
+            if shard.can_split():
+                put(('split', shard, shard.split()))
+                return False
+            print(f"⚠️ Шард {shard.key}: найдено {found}, доступно только {SEARCH_DEPTH_LIMIT}")
+            # Выдача шарда неполная - как при ошибке, водяной знак не сдвигается
+            failed = True
+
+        pages = min(data.get('pages', 1), SEARCH_DEPTH_LIMIT // PER_PAGE)
+        for page in range(pages):
+            if journal is not None and journal.is_page_done(shard.key, page):
+                continue
+
+            if page:
+                try:
+                    data = self.parser.api_get("/vacancies", shard.params(page))
+                except Exception as e:
+                    # Повторы исчерпаны - пропускаем страницу, но не весь шард
+                    print(f"Ошибка на странице {page + 1} шарда {shard.key}: {e}")
+                    failed = True
+                    continue
+
+            vacancies = data.get('items', [])
+            if not vacancies or not put(('page', shard, (page, vacancies))):
+                break
+
+        return failed
@@ -0,0 +1,274 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+
+def parse_published_at(value):
+    """Разбор published_at из API HH (2025-07-04T12:12:30+0300)"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z')
+    except (TypeError, ValueError):
+        return None
+
+
+class CrawlState:
+    """Состояние инкрементального парсинга: водяные знаки запросов и просмотренные вакансии"""
+
+    def __init__(self, path='state/crawl_state.json'):
+        self.path = path
+        self.lock = threading.Lock()
+        self.watermarks = {}
+        self.seen_ids = set()
+        # Вакансии, взятые в работу в текущем запуске (дедупликация между запросами):
+        # id -> (запрос, published_at)
+        self.claimed = {}
+        # Итоги поиска текущего запуска: запрос -> (самая свежая published_at, выдача получена целиком)
+        self.searches = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        self.watermarks = data.get('watermarks', {})
+        self.seen_ids = set(data.get('seen_ids', []))
+
+    def save(self):
+        """Атомарная запись состояния (через временный файл)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self.lock:
+            data = {
+                'watermarks': self.watermarks,
+                'seen_ids': sorted(self.seen_ids),
+                'updated_at': datetime.now().isoformat(timespec='seconds')
+            }
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def date_from(self, query):
+        """Водяной знак запроса для параметра date_from (None - с начала)"""
+        return self.watermarks.get(query)
+
+    def claim(self, vacancy_id, query=None, published_at=None):
+        """True, если вакансия новая и ещё не взята другим запросом"""
+        vacancy_id = str(vacancy_id)
+        with self.lock:
+            if vacancy_id in self.seen_ids or vacancy_id in self.claimed:
+                return False
+            self.claimed[vacancy_id] = (query, published_at)
+            return True
+
+    def mark_done(self, vacancy_id):
+        """Вакансия успешно обработана - не загружать в следующих запусках"""
+        with self.lock:
+            self.seen_ids.add(str(vacancy_id))
+
+    def finish_search(self, query, published_values, complete):
+        """Итог поиска по запросу: даты публикации в выдаче и получены ли все её страницы"""
+        newest, newest_raw = None, None
+        for value in published_values:
+            published = parse_published_at(value)
+            if published and (newest is None or published > newest):
+                newest, newest_raw = published, value
+
+        with self.lock:
+            previous = self.searches.get(query)
+            if previous is not None:
+                # Запрос встретился повторно (например, после --resume): нужны обе выдачи
+                complete = complete and previous[1]
+                if previous[0] and (newest is None or parse_published_at(previous[0]) > newest):
+                    newest_raw = previous[0]
+            self.searches[query] = (newest_raw, complete)
+
+    def advance_watermarks(self):
+        """Сдвиг водяных знаков по итогам запуска; вызывать, когда все вакансии обработаны.
+
+        Знак запроса сдвигается на самую свежую дату публикации, только если выдача
+        получена целиком. Вакансии запроса, которые не удалось обработать, ограничивают
+        сдвиг своей самой ранней датой публикации (date_from включает границу, поэтому
+        следующий запуск найдёт их снова). Возвращает запросы, знак которых не сдвинут
+        до конца выдачи.
+        """
+        held_back = []
+        with self.lock:
+            unresolved = {}
+            for vacancy_id, (query, published_at) in self.claimed.items():
+                if vacancy_id not in self.seen_ids:
+                    unresolved.setdefault(query, []).append(published_at)
+
+            for query, (newest_raw, complete) in self.searches.items():
+                current_raw = self.watermarks.get(query)
+                if not complete:
+                    held_back.append(query)
+                    continue
+
+                target_raw = newest_raw
+                failed = [parse_published_at(value) for value in unresolved.get(query, [])]
+                if failed:
+                    held_back.append(query)
+                    if not all(failed):
+                        # Дата публикации неизвестна - граница для повтора не определена
+                        continue
+                    oldest = min(failed)
+                    oldest_raw = unresolved[query][failed.index(oldest)]
+                    if target_raw is None or oldest < parse_published_at(target_raw):
+                        target_raw = oldest_raw
+
+                current = parse_published_at(current_raw)
+                target = parse_published_at(target_raw)
+                if target and (current is None or target > current):
+                    self.watermarks[query] = target_raw
+        return held_back
+
+
+class CrawlJournal:
+    """Журнал прогресса парсинга для продолжения прерванного запуска (--resume).
+
+    События копятся в памяти и дописываются в файл вместе с контрольной точкой -
+    размерами CSV-файлов после их fsync. При продолжении учитываются только события
+    до последней контрольной точки, а CSV обрезаются до записанных в ней размеров,
+    поэтому журнал никогда не опережает данные на диске.
+    """
+
+    def __init__(self, path='state/crawl_journal.jsonl', resume=False):
+        self.path = path
+        self.lock = threading.Lock()
+        self.pending_events = []
+
+        self.timestamp = None
+        self.checkpoint_sizes = None
+        self.done_pages = set()
+        # Записанные вакансии: (запрос, страница, id) - дубликаты между запросами сохраняются
+        self.done_items = set()
+        self.finished = False
+
+        # Открытые страницы: (запрос, страница) -> вакансии без результата
+        self.open_pages = {}
+
+        if resume and os.path.exists(path):
+            self.load()
+            if self.finished:
+                print("ℹ️ Прошлый запуск завершён полностью, начинаем новый")
+            else:
+                print(f"♻️ Продолжение запуска {self.timestamp}: {len(self.done_pages)} страниц "
+                      f"и {len(self.done_items)} вакансий уже обработаны")
+
+        if not resume or self.finished or self.timestamp is None:
+            self.start()
+
+    def load(self):
+        """Чтение журнала до последней контрольной точки"""
+        applied_pages, applied_items = set(), set()
+        batch_pages, batch_items = set(), set()
+
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    break  # оборванная последняя строка
+
+                kind = event.get('event')
+                if kind == 'start':
+                    self.timestamp = event['timestamp']
+                elif kind == 'page':
+                    batch_pages.add((event['query'], event['page']))
+                elif kind == 'vacancy':
+                    batch_items.add((event['query'], event['page'], event['id']))
+                elif kind == 'checkpoint':
+                    applied_pages |= batch_pages
+                    applied_items |= batch_items
+                    batch_pages, batch_items = set(), set()
+                    self.checkpoint_sizes = event['sizes']
+                elif kind == 'finished':
+                    self.finished = True
+
+        self.done_pages = applied_pages
+        self.done_items = applied_items
+
+    def start(self):
+        """Новый журнал для нового запуска"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.checkpoint_sizes = None
+        self.done_pages, self.done_items = set(), set()
+        self.finished = False
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'event': 'start', 'timestamp': self.timestamp}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def is_page_done(self, query, page):
+        return (query, page) in self.done_pages
+
+    def is_vacancy_done(self, query, page, vacancy_id):
+        return (query, page, str(vacancy_id)) in self.done_items
+
+    def open_page(self, query, page, vacancy_ids):
+        """Страница выдачи взята в работу; завершится, когда все вакансии получат результат"""
+        key = (query, page)
+        with self.lock:
+            pending = {str(vacancy_id) for vacancy_id in vacancy_ids}
+            if pending:
+                self.open_pages[key] = pending
+            else:
+                self._page_done(key)
+
+    def resolve(self, query, page, vacancy_id, success):
+        """Результат по вакансии страницы: success=True - записана в CSV"""
+        key, vacancy_id = (query, page), str(vacancy_id)
+        with self.lock:
+            if success:
+                self.done_items.add((query, page, vacancy_id))
+                self.pending_events.append({'event': 'vacancy', 'query': query,
+                                            'page': page, 'id': vacancy_id})
+
+            pending = self.open_pages.get(key)
+            if pending is None:
+                return
+            pending.discard(vacancy_id)
+            if not pending:
+                del self.open_pages[key]
+                self._page_done(key)
+
+    def _page_done(self, key):
+        self.done_pages.add(key)
+        self.pending_events.append({'event': 'page', 'query': key[0], 'page': key[1]})
+
+    def checkpoint(self, sizes):
+        """Запись накопленных событий после fsync CSV-файлов"""
+        with self.lock:
+            events = self.pending_events + [{'event': 'checkpoint', 'sizes': sizes}]
+            self.pending_events = []
+            self.checkpoint_sizes = sizes
+            self._append(events)
+
+    def finish(self):
+        """Запуск завершён - продолжать нечего"""
+        with self.lock:
+            events = self.pending_events + [{'event': 'finished'}]
+            self.pending_events = []
+            self.finished = True
+            self._append(events)
+
+    def _append(self, events):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(event, ensure_ascii=False) + '\n' for event in events))
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,114 @@
+import threading
+from collections import Counter
+
+# Объём найма по числу открытых вакансий работодателя. Это не размер компании:
+# численность сотрудников API HH не отдаёт
+HIRING_VOLUME_THRESHOLDS = [(100, 'high'), (10, 'medium'), (0, 'low')]
+
+
+def employer_details(employer_data):
+    """Нужные парсеру поля ответа /employers/{id}"""
+    return {
+        'id': str(employer_data.get('id')),
+        'name': employer_data.get('name'),
+        'type': employer_data.get('type'),
+        'open_vacancies': employer_data.get('open_vacancies'),
+        'industries': [industry.get('name') for industry in employer_data.get('industries') or []],
+        'area': (employer_data.get('area') or {}).get('name')
+    }
+
+
+def hiring_volume(details):
+    """Объём найма (low/medium/high) по числу открытых вакансий; None - сведений нет"""
+    open_vacancies = (details or {}).get('open_vacancies')
+    if open_vacancies is None:
+        return None
+    for threshold, volume in HIRING_VOLUME_THRESHOLDS:
+        if open_vacancies >= threshold:
+            return volume
+    return None
+
+
+def employer_dimension(details):
+    """Поля работодателя для снимка: объём найма, тип и отрасли (через "; ")"""
+    details = details or {}
+    industries = [industry for industry in details.get('industries') or [] if industry]
+    return {
+        'hiring_volume': hiring_volume(details),
+        'employer_type': details.get('type'),
+        'employer_industries': '; '.join(industries) or None
+    }
+
+
+class EmployerDirectory:
+    """Сведения о работодателях на время парсинга.
+
+    Каждый работодатель запрашивается не больше одного раза: повторные
+    обращения (в том числе одновременные из других потоков) ждут первый
+    запрос и получают его результат. Между запусками сведения берутся из
+    EmployerCache, пока запись не устарела.
+    """
+
+    def __init__(self, fetch, cache=None):
+        # fetch(employer_id) -> JSON ответа /employers/{id}
+        self.fetch = fetch
+        self.cache = cache
+        self.lock = threading.Lock()
+        self.known = {}
+        self.pending = {}
+        self.stats = Counter()
+
+    def get(self, employer_id):
+        """Сведения о работодателе или None (анонимная вакансия, ошибка запроса)"""
+        if not employer_id:
+            return None
+        employer_id = str(employer_id)
+
+        with self.lock:
+            if employer_id in self.known:
+                self.stats['memory'] += 1
+                return self.known[employer_id]
+            event = self.pending.get(employer_id)
+            owner = event is None
+            if owner:
+                event = self.pending[employer_id] = threading.Event()
+
+        if not owner:
+            event.wait()
+            with self.lock:
+                self.stats['memory'] += 1
+                return self.known.get(employer_id)
+
+        details = None
+        try:
+            details = self._load(employer_id)
+        finally:
+            with self.lock:
+                self.known[employer_id] = details
+                del self.pending[employer_id]
+            event.set()
+        return details
+
+    def _load(self, employer_id):
+        if self.cache is not None:
+            details = self.cache.get(employer_id)
+            if details is not None:
+                self._count('cache')
+                return details
+
+        try:
+            details = employer_details(self.fetch(employer_id))
+        except Exception as e:
+            # Без сведений размер определяется по названию
+            print(f"Ошибка загрузки работодателя {employer_id}: {e}")
+            self._count('failed')
+            return None
+
+        self._count('fetched')
+        if self.cache is not None:
+            self.cache.store(employer_id, details)
+        return details
+
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class ConnectionStats:
+    """Статистика установки соединений (TCP + TLS) и числа запросов"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.connect_time = 0.0
+        self.requests = 0
+
+    def record_connection(self, seconds):
+        with self.lock:
+            self.connections += 1
+            self.connect_time += seconds
+
+    def record_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def summary(self):
+        """Сводка для вывода в конце парсинга"""
+        with self.lock:
+            avg_ms = self.connect_time / self.connections * 1000 if self.connections else 0.0
+            per_request_ms = self.connect_time / self.requests * 1000 if self.requests else 0.0
+            return {
+                'requests': self.requests,
+                'connections': self.connections,
+                'connect_time_total': self.connect_time,
+                'connect_time_avg_ms': avg_ms,
+                'connect_time_per_request_ms': per_request_ms
+            }
+
+
+def _timed_connection_class(base_class, stats):
+    """Класс соединения urllib3, замеряющий время connect()"""
+
+    class TimedConnection(base_class):
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                return super().connect()
+            finally:
+                stats.record_connection(time.perf_counter() - started)
+
+    return TimedConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter с пулом keep-alive соединений и замером их установки"""
+
+    def __init__(self, stats, **kwargs):
+        # stats нужен до super().__init__, который вызывает init_poolmanager
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+
+        http_pool = type('TimedHTTPConnectionPool', (HTTPConnectionPool,), {
+            'ConnectionCls': _timed_connection_class(HTTPConnection, self.stats)
+        })
+        https_pool = type('TimedHTTPSConnectionPool', (HTTPSConnectionPool,), {
+            'ConnectionCls': _timed_connection_class(HTTPSConnection, self.stats)
+        })
+        self.poolmanager.pool_classes_by_scheme = {'http': http_pool, 'https': https_pool}
+
+
+def create_session(headers, pool_size=10, stats=None):
+    """Сессия requests с пулом соединений, keep-alive и gzip"""
+    session = requests.Session()
+    session.headers.update(headers)
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+
+    # pool_block=True: потоков больше, чем соединений - ждут свободное соединение
+    adapter = TimedHTTPAdapter(stats or ConnectionStats(), pool_connections=2,
+                               pool_maxsize=pool_size, pool_block=True)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
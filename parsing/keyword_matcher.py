@@ -0,0 +1,73 @@
+import re
+from collections import Counter
+
+
+class KeywordMatcher:
+    """Поиск всех ключевых слов за один проход по тексту.
+
+    Эквивалентно len(re.findall(r'\\b' + re.escape(keyword) + r'\\b', text))
+    для каждого слова, но словарь собирается в одно регулярное выражение-трие,
+    поэтому стоимость прохода почти не зависит от размера словаря.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = sorted({keyword for keyword in keywords if keyword})
+
+        trie = {}
+        for keyword in self.keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = keyword
+
+        # Для каждого слова - более короткие слова словаря, являющиеся его префиксом
+        self.prefixes = {}
+        for keyword in self.keywords:
+            node, found = trie, []
+            for char in keyword[:-1]:
+                node = node[char]
+                if '' in node:
+                    found.append(node[''])
+            self.prefixes[keyword] = found
+
+        # \b перед словом одинаков для всех слов, поэтому вынесен из группы;
+        # опережающая проверка позволяет находить пересекающиеся совпадения
+        body = self._trie_regex(trie) if trie else r'(?!)'
+        self.pattern = re.compile(r'\b(?=(' + body + r'))')
+        self.boundary = re.compile(r'\b')
+
+    def _trie_regex(self, node):
+        """Регулярное выражение для поддерева (длинные совпадения приоритетнее)"""
+        alternatives = [re.escape(char) + self._trie_regex(child)
+                        for char, child in sorted(node.items()) if char]
+        if '' in node:
+            alternatives.append(r'\b')
+
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return '(?:' + '|'.join(alternatives) + ')'
+
+    def count(self, text):
+        """Частоты найденных слов: Counter {keyword: количество}"""
+        counts = Counter()
+        if not text:
+            return counts
+
+        last_end = {}
+        for match in self.pattern.finditer(text):
+            start = match.start()
+            longest = match.group(1)
+
+            # Все слова, совпадающие в этой позиции, - префиксы самого длинного
+            candidates = [longest]
+            for prefix in self.prefixes[longest]:
+                if self.boundary.match(text, start + len(prefix)):
+                    candidates.append(prefix)
+
+            for keyword in candidates:
+                # Как в re.findall: совпадения одного слова не пересекаются
+                if start >= last_end.get(keyword, 0):
+                    counts[keyword] += 1
+                    last_end[keyword] = start + len(keyword)
+
+        return counts
@@ -0,0 +1,283 @@
+import argparse
+import glob
+import hashlib
+import json
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from raw_archive import iter_archive
+
+# Локальная замена api.hh.ru для воспроизводимых замеров парсера:
+# поиск /vacancies (пагинация, found/pages, лимит глубины 2000, area и окно дат)
+# детали /vacancies/{id} с ETag и /employers/{id}. Задержка, ошибки 5xx и 429 настраиваются.
+
+SEARCH_DEPTH_LIMIT = 2000
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+
+AREAS = [('1', 'Москва'), ('2', 'Санкт-Петербург'), ('4', 'Новосибирск'),
+         ('3', 'Екатеринбург'), ('88', 'Казань')]
+TITLES = ['Python разработчик', 'Backend разработчик', 'Frontend разработчик',
+          'Fullstack разработчик', 'Системный аналитик', 'Data analyst', 'DevOps инженер',
+          'Java разработчик', 'QA инженер', 'Mobile разработчик']
+EXPERIENCE = ['Нет опыта', 'От 1 года до 3 лет', 'От 3 до 6 лет', 'Более 6 лет']
+DESCRIPTION_WORDS = ['python', 'javascript', 'react', 'sql', 'docker', 'git', 'api',
+                     'микросервис', 'интерфейс', 'данные', 'банк', 'платеж', 'опыт',
+                     'разработка', 'команда', 'проект', 'задачи', 'условия', 'офис']
+SKILLS = ['Git', 'SQL', 'Python', 'Linux', 'Docker', 'PostgreSQL', 'React', 'TypeScript']
+
+
+def synthetic_vacancies(count, seed=42, employers=500):
+    """Синтетические вакансии в формате деталей API HH за последние 30 дней"""
+    rng = random.Random(seed)
+    now = datetime.now().astimezone().replace(microsecond=0)
+    vacancies = []
+    for index in range(count):
+        area_id, area_name = rng.choice(AREAS)
+        employer_id = str(rng.randint(1, employers))
+        salary_from = rng.choice([None, 60000, 90000, 120000, 180000, 250000])
+        description = ' '.join(rng.choice(DESCRIPTION_WORDS) for _ in range(rng.randint(80, 400)))
+        vacancies.append({
+            'id': str(10_000_000 + index),
+            'name': rng.choice(TITLES),
+            'area': {'id': area_id, 'name': area_name},
+            'employer': {'id': employer_id, 'name': f'Компания {employer_id}'},
+            'published_at': (now - timedelta(seconds=rng.randint(0, 30 * 86400))).strftime(DATE_FORMAT),
+            'experience': {'name': rng.choice(EXPERIENCE)},
+            'schedule': {'name': rng.choice(['Полный день', 'Удаленная работа', 'Гибкий график'])},
+            'employment': {'name': 'Полная занятость'},
+            'salary': {'from': salary_from, 'to': salary_from + 40000, 'currency': 'RUR',
+                       'gross': False} if salary_from else None,
+            'description': f'<p>{description}</p>',
+            'key_skills': [{'name': skill} for skill in rng.sample(SKILLS, rng.randint(0, 5))]
+        })
+    return vacancies
+
+
+def search_item(vacancy):
+    """Краткая карточка вакансии в поисковой выдаче"""
+    text = vacancy.get('description') or ''
+    return {
+        'id': str(vacancy['id']),
+        'name': vacancy.get('name'),
+        'area': vacancy.get('area'),
+        'employer': vacancy.get('employer'),
+        'salary': vacancy.get('salary'),
+        'published_at': vacancy.get('published_at'),
+        'experience': vacancy.get('experience'),
+        'snippet': {'requirement': text[:200], 'responsibility': None}
+    }
+
+
+def employer_profiles(vacancies):
+    """Ответы /employers/{id} для работодателей из выборки"""
+    profiles = {}
+    for vacancy in vacancies:
+        employer = vacancy.get('employer') or {}
+        employer_id = employer.get('id')
+        if not employer_id:
+            continue
+        profile = profiles.setdefault(str(employer_id), {
+            'id': str(employer_id),
+            'name': employer.get('name'),
+            'type': 'company',
+            'area': vacancy.get('area'),
+            'industries': [{'id': '7.540', 'name': 'Разработка программного обеспечения'}],
+            # Выборка - малая часть вакансий работодателя на HH: добавляем постоянную "остальную" часть
+            'open_vacancies': zlib.crc32(str(employer_id).encode()) % 250
+        })
+        profile['open_vacancies'] += 1
+    return profiles
+
+
+class MockHHServer:
+    """Сервер-заглушка API HH в фоновом потоке.
+
+    latency - средняя задержка ответа в секундах (равномерно ±50%), error_rate -
+    доля ответов 500, throttle_rate - доля ответов 429 с Retry-After.
+    """
+
+    def __init__(self, vacancies, host='127.0.0.1', port=0, latency=0.0,
+                 error_rate=0.0, throttle_rate=0.0, retry_after=1, seed=42):
+        self.vacancies = sorted(vacancies, key=lambda v: v.get('published_at') or '', reverse=True)
+        self.by_id = {str(v['id']): v for v in self.vacancies}
+        self.search_text = {str(v['id']): f"{v.get('name', '')} {v.get('description', '')}".lower()
+                            for v in self.vacancies}
+        self.bodies = {}
+        self.employers = employer_profiles(self.vacancies)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.httpd = ThreadingHTTPServer((host, port), _MockHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='mock-hh', daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def next_fault(self):
+        """Случайная задержка и подмена ответа (429/500) для очередного запроса"""
+        with self.lock:
+            self.request_count += 1
+            roll = self.rng.random()
+            delay = self.latency * (0.5 + self.rng.random()) if self.latency else 0.0
+        if roll < self.throttle_rate:
+            return delay, 429
+        if roll < self.throttle_rate + self.error_rate:
+            return delay, 500
+        return delay, None
+
+    def search(self, params):
+        text = params.get('text', '').lower().split()
+        area = params.get('area')
+        date_from = _parse_date(params.get('date_from'))
+        date_to = _parse_date(params.get('date_to'))
+        page = int(params.get('page', 0))
+        per_page = int(params.get('per_page', 20))
+
+        if (page + 1) * per_page > SEARCH_DEPTH_LIMIT:
+            return 400, {'errors': [{'type': 'bad_argument', 'value': 'page'}]}
+
+        found = []
+        for vacancy in self.vacancies:
+            if text and not any(word in self.search_text[str(vacancy['id'])] for word in text):
+                continue
+            if area and area != '113' and (vacancy.get('area') or {}).get('id') != area:
+                continue
+            published = _parse_date(vacancy.get('published_at'))
+            if published and ((date_from and published < date_from) or (date_to and published > date_to)):
+                continue
+            found.append(vacancy)
+
+        items = found[page * per_page:(page + 1) * per_page]
+        return 200, {
+            'items': [search_item(vacancy) for vacancy in items],
+            'found': len(found),
+            'pages': min(-(-len(found) // per_page), SEARCH_DEPTH_LIMIT // per_page) if per_page else 0,
+            'page': page,
+            'per_page': per_page
+        }
+
+    def detail_body(self, vacancy_id):
+        """Тело ответа с деталями вакансии и его ETag (кэшируются)"""
+        body = self.bodies.get(vacancy_id)
+        if body is None:
+            content = json.dumps(self.by_id[vacancy_id], ensure_ascii=False).encode('utf-8')
+            body = self.bodies[vacancy_id] = (content, '"' + hashlib.md5(content).hexdigest() + '"')
+        return body
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        mock = self.server.mock
+        delay, fault = mock.next_fault()
+        if delay:
+            time.sleep(delay)
+
+        if fault == 429:
+            return self._send(429, b'', {'Retry-After': str(mock.retry_after)})
+        if fault == 500:
+            return self._send(500, b'')
+
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+
+        if parts == ['vacancies']:
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            status, data = mock.search(params)
+            return self._send(status, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+        if len(parts) == 2 and parts[0] == 'vacancies' and parts[1] in mock.by_id:
+            content, etag = mock.detail_body(parts[1])
+            if self.headers.get('If-None-Match') == etag:
+                return self._send(304, b'', {'ETag': etag})
+            return self._send(200, content, {'ETag': etag})
+
+        if len(parts) == 2 and parts[0] == 'employers' and parts[1] in mock.employers:
+            return self._send(200, json.dumps(mock.employers[parts[1]], ensure_ascii=False).encode('utf-8'))
+
+        return self._send(404, b'{"errors": [{"type": "not_found"}]}')
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, DATE_FORMAT) if value else None
+    except ValueError:
+        return None
+
+
+def load_fixtures(archive_patterns):
+    """Записанные вакансии из архивов raw/*.jsonl.gz (без дубликатов)"""
+    vacancies = {}
+    paths = sorted(path for pattern in archive_patterns for path in glob.glob(pattern))
+    for vacancy in iter_archive(paths):
+        vacancies[str(vacancy['id'])] = vacancy
+    return list(vacancies.values())
+
+
+def add_server_arguments(arg_parser):
+    """Параметры заглушки (общие для сервера и бенчмарка)"""
+    arg_parser.add_argument('--vacancies', type=int, default=3000,
+                            help="синтетических вакансий (если нет --fixtures)")
+    arg_parser.add_argument('--fixtures', nargs='+', default=None, metavar='ARCHIVE',
+                            help="записанные вакансии: архивы raw/*.jsonl.gz")
+    arg_parser.add_argument('--latency-ms', type=float, default=20.0, help="средняя задержка ответа")
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help="доля ответов 500")
+    arg_parser.add_argument('--throttle-rate', type=float, default=0.0, help="доля ответов 429")
+    arg_parser.add_argument('--seed', type=int, default=42)
+
+
+def create_server(args, port=0):
+    vacancies = load_fixtures(args.fixtures) if args.fixtures else synthetic_vacancies(args.vacancies, args.seed)
+    return MockHHServer(vacancies, port=port, latency=args.latency_ms / 1000,
+                        error_rate=args.error_rate, throttle_rate=args.throttle_rate, seed=args.seed)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Локальная заглушка API HH")
+    arg_parser.add_argument('--port', type=int, default=8765)
+    add_server_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    server = create_server(args, args.port)
+    print(f"🧪 Заглушка API HH: {server.url} ({len(server.vacancies)} вакансий)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
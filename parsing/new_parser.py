@@ -1,16 +1,128 @@
 import requests
+import argparse
+import html
+import json
 import re
+import threading
 import time
 import csv
-import pandas as pd
 from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from rate_limiter import AdaptiveRateLimiter, parse_retry_after, backoff_delay
+from http_session import ConnectionStats, create_session
+from response_cache import VacancyCache, EmployerCache
+from employer_directory import EmployerDirectory, employer_dimension
+from crawl_state import CrawlState, CrawlJournal, parse_published_at
+from crawl_planner import CrawlPlanner, DEFAULT_AREAS, PER_PAGE, SEARCH_DEPTH_LIMIT
+from keyword_matcher import KeywordMatcher
+from crawl_pipeline import CrawlPipeline, reprocess_records
+from snapshot_writer import SnapshotWriter, write_csv_atomic
+from analytics import ANALYTICS_COLUMNS, TechAnalyticsAggregator
+from parquet_export import check_parquet_support, export_snapshot
+from raw_archive import RawArchive, iter_latest
+from vacancy_record import TechCatalog, VacancyRecord
+from crawl_metrics import CrawlMetrics, endpoint_label
+
+# Коды ответа, после которых запрос повторяется с ожиданием
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# HTML-теги в описаниях вакансий HH
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Поля карточки выдачи, которые перечитываются в облегчённом режиме
+LISTING_KEYS = ('id', 'name', 'employer', 'area', 'published_at', 'experience',
+                'schedule', 'employment', 'salary')
+
+
+def listing_fields(vacancy_data):
+    """Поля карточки, по которым видно, что вакансия изменилась после загрузки деталей"""
+    employer = vacancy_data.get('employer') or {}
+    salary = vacancy_data.get('salary') or {}
+    return (vacancy_data.get('name'), vacancy_data.get('published_at'),
+            (vacancy_data.get('area') or {}).get('id'), (vacancy_data.get('experience') or {}).get('name'),
+            employer.get('id'), employer.get('name'),
+            salary.get('from'), salary.get('to'), salary.get('currency'), salary.get('gross'))
+
+
+# Предел словаря разобранных навыков (различных навыков на HH - десятки тысяч)
+SKILL_MATCH_CACHE_SIZE = 200_000
+
 class HHEnhancedParser:
-    def __init__(self):
-        self.base_url = "https://api.hh.ru"
+    def __init__(self, max_workers=8, requests_per_second=5.0, max_retries=4,
+                 pool_size=None, connect_timeout=5, read_timeout=30,
+                 cache_path='cache/hh_vacancy_cache.sqlite', cache_max_bytes=512 * 1024 * 1024,
+                 cache_max_age=6 * 3600, incremental=False, state_path='state/crawl_state.json',
+                 pipeline=False, analysis_workers=None, resume=False,
+                 journal_path='state/crawl_journal.jsonl', output_format='csv', archive_dir='raw',
+                 sharded=False, areas=None, shard_workers=4, metrics_path=None,
+                 base_url="https://api.hh.ru", employer_cache_path='cache/hh_employer_cache.sqlite',
+                 enrich_employers=False, lite=False):
+        self.base_url = base_url.rstrip('/')
         self.headers = {'User-Agent': 'HH-User-Agent'}
         
+        # Количество параллельных загрузок деталей вакансий (1 - последовательно)
+        self.max_workers = max(1, int(max_workers))
+        
+        # Одна сессия с пулом keep-alive соединений на все запросы и страницы
+        self.connection_stats = ConnectionStats()
+        search_workers = shard_workers if sharded else 0
+        self.session = create_session(self.headers, pool_size or max(self.max_workers + search_workers, 2),
+                                      self.connection_stats)
+        self.timeout = (connect_timeout, read_timeout)
+        
+        # Кэш деталей вакансий между запусками (None - без кэша)
+        self.cache = VacancyCache(cache_path, cache_max_bytes, cache_max_age) if cache_path else None
+        self.cache_stats = Counter()
+        
+        # Сведения о работодателях (/employers/{id}, по запросу): один запрос на работодателя за запуск
+        self.employers = None
+        if enrich_employers:
+            employer_cache = EmployerCache(employer_cache_path) if employer_cache_path else None
+            self.employers = EmployerDirectory(lambda employer_id: self.api_get(f"/employers/{employer_id}"),
+                                               employer_cache)
+        
+        # Облегчённый режим: записи из поисковой выдачи, детали - только когда без них никак
+        self.lite = lite
+        self.lite_stats = Counter()
+        
+        # Инкрементальный режим: водяные знаки date_from и уже загруженные вакансии
+        self.crawl_state = CrawlState(state_path) if incremental else None
+        
+        # Журнал прогресса создаётся при запуске парсинга; resume - продолжить прерванный
+        self.resume = resume
+        self.journal_path = journal_path
+        self.journal = None
+        
+        # Формат снимка: csv, parquet (CSV преобразуется в конце и удаляется) или both
+        self.output_format = output_format
+        if output_format in ('parquet', 'both'):
+            check_parquet_support()
+        
+        # Архив исходных JSON для повторной обработки без сети (None - не писать)
+        self.archive_dir = archive_dir
+        self.archive = None
+        
+        # Шардированный обход: регионы и окна дат вместо одной выдачи по Москве
+        self.planner = CrawlPlanner(self, areas or DEFAULT_AREAS, shard_workers) if sharded else None
+        
+        # Конвейерный режим: загрузка в потоках, анализ текста в пуле процессов
+        self.pipeline = pipeline
+        self.analysis_workers = analysis_workers
+        
+        # Метрики запуска; metrics_path - выгрузка в конце (.json или textfile Prometheus)
+        self.metrics = CrawlMetrics()
+        self.metrics_path = metrics_path
+        # Метка страницы выдачи (запрос или шард) -> поисковый запрос
+        self.label_queries = {}
+        
+        # Общий лимит запросов для поиска и деталей вакансий
+        self.rate_limiter = AdaptiveRateLimiter(requests_per_second)
+        self.max_retries = max_retries
+        self.retry_count = 0
+        self.stats_lock = threading.Lock()
+        
         # Расширенная карта технологий с привязкой к компетенциям ФГОС/Профстандартов
         self.tech_competency_mapping = {
             # Программирование
@@ -69,6 +181,19 @@ class HHEnhancedParser:
             'qa': ['qa', 'тестировщик', 'тестирование', 'автотест']
         }
         
+        # Ключевые слова для определения предметной области
+        self.domain_keywords = {
+            'fintech': ['банк', 'финанс', 'платеж', 'криптовалют'],
+            'ecommerce': ['интернет-магазин', 'ecommerce', 'торговл'],
+            'gamedev': ['игр', 'геймдев', 'unity', 'unreal'],
+            'edtech': ['образование', 'обучение', 'курс'],
+            'healthtech': ['медицин', 'здоровье', 'клиник'],
+            'government': ['государств', 'госуслуг', 'бюджет']
+        }
+        
+        # Все словари компилируются в один матчер один раз на экземпляр парсера
+        self.build_text_matcher()
+        
         # Уровни опыта
         self.experience_mapping = {
             'Нет опыта': 'junior',
@@ -77,71 +202,358 @@ class HHEnhancedParser:
             'Более 6 лет': 'senior'
         }
 
-    def search_vacancies_enhanced(self, queries, max_pages=3):
-        """Расширенный поиск вакансий с детальной информацией"""
-        all_vacancies = []
-        
-        for query in queries:
-            print(f"🔍 Поиск по запросу: {query}")
+    def api_request(self, path, params=None, headers=None):
+        """GET-запрос к API HH с лимитом скорости и повторами при 429/5xx"""
+        url = f"{self.base_url}{path}"
+        endpoint = endpoint_label(path)
+        last_error = None
+        
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            retry_after = None
             
-            for page in range(max_pages):
-                params = {
-                    'text': query,
-                    'page': page,
-                    'per_page': 100,
-                    'area': 1,  # Москва
-                    'only_with_salary': 'false'
-                }
+            started = time.perf_counter()
+            try:
+                self.connection_stats.record_request()
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                self.metrics.observe('hh_http_request_duration_seconds', time.perf_counter() - started,
+                                     endpoint=endpoint)
+                self.metrics.inc('hh_http_responses_total', endpoint=endpoint, status='error')
+                last_error = e
+            else:
+                self.metrics.observe('hh_http_request_duration_seconds', time.perf_counter() - started,
+                                     endpoint=endpoint)
+                self.metrics.inc('hh_http_responses_total', endpoint=endpoint, status=response.status_code)
+                self.metrics.inc('hh_http_response_bytes_total', len(response.content), endpoint=endpoint)
+                if response.status_code == 429:
+                    self.metrics.inc('hh_http_throttles_total', endpoint=endpoint)
                 
-                try:
-                    response = requests.get(f"{self.base_url}/vacancies", 
-                                          params=params, headers=self.headers)
-                    data = response.json()
-                    
-                    vacancies = data.get('items', [])
-                    if not vacancies:
-                        break
-                        
-                    # Получаем детальную информацию сразу
-                    detailed_vacancies = self.get_detailed_vacancies(vacancies)
-                    all_vacancies.extend(detailed_vacancies)
-                    
-                    print(f"  Страница {page + 1}: {len(detailed_vacancies)} вакансий")
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    print(f"Ошибка: {e}")
-                    break
-        
-        return all_vacancies
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    self.rate_limiter.on_success()
+                    return response
+                
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                self.rate_limiter.on_throttle(retry_after)
+                last_error = requests.HTTPError(
+                    f"{response.status_code} для {path}", response=response)
+            
+            if attempt < self.max_retries:
+                with self.stats_lock:
+                    self.retry_count += 1
+                self.metrics.inc('hh_http_retries_total', endpoint=endpoint)
+                delay = backoff_delay(attempt)
+                # Retry-After соблюдается ограничителем, сверху добавляем джиттер
+                time.sleep(retry_after + delay if retry_after else delay)
+        
+        raise last_error
 
-    def get_detailed_vacancies(self, vacancy_list):
-        """Получение детальной информации по вакансиям"""
-        detailed = []
+    def api_get(self, path, params=None):
+        """GET-запрос к API HH, возвращает JSON"""
+        return self.api_request(path, params).json()
+
+    def get_vacancy_json(self, vacancy_id, search_item=None):
+        """Детали вакансии: из кэша, через условный запрос (304) или полная загрузка.
+        
+        В облегчённом режиме по карточке выдачи (search_item) детали могут не запрашиваться.
+        Записи из сниппета не архивируются: --reprocess получил бы по ним урезанный текст.
+        """
+        vacancy_data = None
+        if self.lite and search_item is not None:
+            vacancy_data = self.lite_vacancy_json(search_item)
+        if vacancy_data is None:
+            vacancy_data = self.load_vacancy_json(vacancy_id)
+        if self.employers is not None:
+            self.enrich_employer(vacancy_data)
+        if self.archive is not None and 'snippet_analysis' not in vacancy_data:
+            self.archive.append(vacancy_data)
+        return vacancy_data
+
+    def lite_vacancy_json(self, search_item):
+        """JSON вакансии без запроса деталей или None, если детали нужно загрузить.
+        
+        Новые вакансии (их нет в кэше деталей) загружаются полностью. Вакансия из
+        кэша с той же карточкой в выдаче берётся из кэша как есть. Если карточка
+        изменилась, запись строится из свежих полей выдачи, текста сниппета и
+        навыков из кэша; анализ сниппета передаётся в process_vacancy_data
+        (snippet_analysis). По неоднозначному сниппету (пустой, без технологий
+        или без признаков роли) детали всё-таки запрашиваются.
+        """
+        cached = self.cache.get(search_item['id']) if self.cache is not None else None
+        if cached is None:
+            self.count_lite('detail')
+            return None
         
-        for vacancy in vacancy_list:
-            try:
-                # Базовая информация
-                vacancy_id = vacancy['id']
-                
-                # Получаем полное описание
-                response = requests.get(f"{self.base_url}/vacancies/{vacancy_id}",
-                                      headers=self.headers)
-                full_data = response.json()
+        details = json.loads(cached['body'])
+        if listing_fields(details) == listing_fields(search_item):
+            self.count_lite('cached')
+            return details
+        
+        vacancy_data = {key: search_item[key] for key in LISTING_KEYS if search_item.get(key) is not None}
+        snippet = search_item.get('snippet') or {}
+        vacancy_data['description'] = ' '.join(filter(None, [snippet.get('requirement'),
+                                                             snippet.get('responsibility')]))
+        vacancy_data['key_skills'] = details.get('key_skills', [])
+        
+        skill_names = [skill.get('name') for skill in vacancy_data['key_skills'] if skill.get('name')]
+        analysis = self.analyze_text(f"{vacancy_data.get('name')} {vacancy_data['description']}", skill_names)
+        if not (vacancy_data['description'] and analysis['technologies']
+                and any(analysis['role_scores'].values())):
+            self.count_lite('detail')
+            return None
+        
+        vacancy_data['snippet_analysis'] = analysis
+        self.count_lite('snippet')
+        return vacancy_data
+
+    def count_lite(self, key):
+        with self.stats_lock:
+            self.lite_stats[key] += 1
+
+    def enrich_employer(self, vacancy_data):
+        """Сведения о работодателе в JSON вакансии (employer_details) - попадают и в архив"""
+        employer_id = (vacancy_data.get('employer') or {}).get('id')
+        details = self.employers.get(employer_id)
+        if details is not None:
+            vacancy_data['employer_details'] = details
+
+    def load_vacancy_json(self, vacancy_id):
+        """Загрузка деталей вакансии с учётом кэша"""
+        path = f"/vacancies/{vacancy_id}"
+        if self.cache is None:
+            return self.api_get(path)
+        
+        cached = self.cache.get(vacancy_id)
+        if cached and cached['fresh']:
+            with self.stats_lock:
+                self.cache_stats['hit'] += 1
+            return json.loads(cached['body'])
+        
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        response = self.api_request(path, headers=headers)
+        
+        if response.status_code == 304 and cached:
+            self.cache.mark_revalidated(vacancy_id)
+            with self.stats_lock:
+                self.cache_stats['not_modified'] += 1
+            return json.loads(cached['body'])
+        
+        self.cache.store(vacancy_id, response.text,
+                         response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        with self.stats_lock:
+            self.cache_stats['downloaded'] += 1
+        return response.json()
+
+    def iter_search_pages(self, queries, max_pages):
+        """Страницы поисковой выдачи: (метка запроса или шарда, номер страницы, вакансии)"""
+        for query in queries:
+            print(f"🔍 Поиск по запросу: {query}")
+            self.metrics.start_query(query)
+            published_values = []
+            errors = []
+            
+            if self.planner is not None:
+                pages = self.iter_sharded_pages(query, errors)
+            else:
+                pages = self.iter_query_pages(query, max_pages, errors)
+            
+            for label, page, vacancies in pages:
+                if self.journal is not None:
+                    # Вакансии страницы, записанные до прерывания, не загружаются повторно
+                    done = [v for v in vacancies if self.journal.is_vacancy_done(label, page, v['id'])]
+                    vacancies = [v for v in vacancies if not self.journal.is_vacancy_done(label, page, v['id'])]
+                    if self.crawl_state is not None:
+                        for vacancy in done:
+                            self.crawl_state.mark_done(vacancy['id'])
                 
-                processed_vacancy = self.process_vacancy_data(full_data)
-                detailed.append(processed_vacancy)
+                if self.crawl_state is not None:
+                    published_values.extend(v.get('published_at') for v in vacancies)
+                    # Пропускаем уже загруженные и найденные другими запросами
+                    vacancies = [v for v in vacancies
+                                 if self.crawl_state.claim(v['id'], query, v.get('published_at'))]
                 
-                time.sleep(0.2)  # Небольшая задержка
+                if self.journal is not None:
+                    self.journal.open_page(label, page, [v['id'] for v in vacancies])
                 
+                self.label_queries[label] = query
+                yield label, page, vacancies
+            
+            # Водяной знак сдвигается в конце запуска (advance_watermarks), и только
+            # если все страницы запроса получены
+            if self.crawl_state is not None:
+                self.crawl_state.finish_search(query, published_values, not errors)
+
+    def iter_query_pages(self, query, max_pages, errors):
+        """Выдача одного запроса по Москве, не глубже max_pages страниц.
+        
+        В инкрементальном режиме выдача идёт от свежих вакансий к старым. Дельта
+        с date_from читается целиком (до предела глубины поиска HH), иначе часть
+        новых вакансий оказалась бы ниже водяного знака. Первый запуск (знака ещё
+        нет) читает max_pages страниц. Знак сдвигается по самому свежему окну
+        выдачи, прочитанному полностью; более старые вакансии за пределами окна
+        без --sharded недоступны.
+        """
+        date_from = self.crawl_state.date_from(query) if self.crawl_state is not None else None
+        if date_from:
+            max_pages = SEARCH_DEPTH_LIMIT // PER_PAGE
+        found = 0
+        
+        for page in range(max_pages):
+            if self.journal is not None and self.journal.is_page_done(query, page):
+                print(f"  Страница {page + 1}: уже обработана в прошлом запуске")
+                continue
+            
+            params = {
+                'text': query,
+                'page': page,
+                'per_page': PER_PAGE,
+                'area': 1,  # Москва
+                'only_with_salary': 'false'
+            }
+            
+            if self.crawl_state is not None:
+                # Только вакансии с момента прошлого запуска, свежие первыми
+                params['order_by'] = 'publication_time'
+                if date_from:
+                    params['date_from'] = date_from
+            
+            try:
+                data = self.api_get("/vacancies", params)
             except Exception as e:
-                print(f"Ошибка обработки вакансии {vacancy.get('id')}: {e}")
+                # Повторы исчерпаны - пропускаем страницу, но не весь запрос
+                print(f"Ошибка на странице {page + 1}: {e}")
+                errors.append(page)
                 continue
+            
+            vacancies = data.get('items', [])
+            if not vacancies:
+                return
+            found = data.get('found', 0)
+            
+            yield query, page, vacancies
+        
+        if self.crawl_state is not None and found > max_pages * PER_PAGE:
+            # Прочитаны самые свежие вакансии: знак сдвигается по ним, более старые пропущены
+            print(f"⚠️ {query}: найдено {found}, прочитано {max_pages * PER_PAGE} самых свежих - "
+                  f"для полной выдачи используйте --sharded")
+
+    def iter_sharded_pages(self, query, errors):
+        """Полная выдача запроса по шардам (регионы и окна дат), шарды обходятся параллельно"""
+        date_from = None
+        if self.crawl_state is not None:
+            date_from = parse_published_at(self.crawl_state.date_from(query))
+        
+        # Верхняя граница окна - время начала снимка: при --resume шарды совпадут с прошлыми
+        date_to = None
+        if self.journal is not None:
+            date_to = datetime.strptime(self.journal.timestamp, "%Y%m%d_%H%M%S").astimezone()
+        
+        for shard, page, vacancies in self.planner.iter_pages(query, date_from, date_to):
+            yield shard.key, page, vacancies
+        
+        if self.planner.failed:
+            errors.append(query)
+
+    def search_vacancies_enhanced(self, queries, max_pages=3, sink=None):
+        """Расширенный поиск вакансий с детальной информацией.
+        
+        Без sink возвращает список вакансий; с sink передаёт их по одной и
+        возвращает количество (вакансии в памяти не накапливаются).
+        """
+        all_vacancies = []
+        total = 0
+        
+        for query, page, vacancies in self.iter_search_pages(queries, max_pages):
+            # Получаем детальную информацию сразу
+            detailed_vacancies = self.get_detailed_vacancies(vacancies)
+            total += len(detailed_vacancies)
+            
+            for vacancy in detailed_vacancies:
+                if sink is None:
+                    all_vacancies.append(vacancy)
+                else:
+                    sink(vacancy)
+                self.finish_vacancy(query, page, vacancy['vacancy_id'], True)
+            
+            processed_ids = {str(vacancy['vacancy_id']) for vacancy in detailed_vacancies}
+            for vacancy in vacancies:
+                if str(vacancy['id']) not in processed_ids:
+                    self.finish_vacancy(query, page, vacancy['id'], False)
+            
+            print(f"  Страница {page + 1}: {len(detailed_vacancies)} вакансий")
+        
+        return all_vacancies if sink is None else total
+
+    def search_vacancies_pipelined(self, queries, max_pages=3, sink=None):
+        """Поиск вакансий конвейером: загрузка, анализ и запись работают одновременно"""
+        all_vacancies = []
+        total = 0
+        
+        def collect(vacancy):
+            nonlocal total
+            total += 1
+            if sink is None:
+                all_vacancies.append(vacancy)
+            else:
+                sink(vacancy)
+        
+        pipeline = CrawlPipeline(self, fetch_workers=self.max_workers,
+                                 analysis_workers=self.analysis_workers)
+        pipeline.run(queries, max_pages, collect)
         
-        return detailed
+        return all_vacancies if sink is None else total
+
+    def finish_vacancy(self, query, page, vacancy_id, success):
+        """Итог по вакансии страницы: для инкрементального состояния и журнала"""
+        if success:
+            self.metrics.vacancy_done(self.label_queries.get(query, query))
+        if success and self.crawl_state is not None:
+            self.crawl_state.mark_done(vacancy_id)
+        if self.journal is not None:
+            self.journal.resolve(query, page, vacancy_id, success)
+
+    def get_detailed_vacancies(self, vacancy_list):
+        """Получение детальной информации по вакансиям"""
+        if self.max_workers == 1 or len(vacancy_list) <= 1:
+            results = [self.fetch_vacancy_detail(vacancy) for vacancy in vacancy_list]
+        else:
+            # Пул потоков ограничен max_workers, map сохраняет порядок вакансий
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(self.fetch_vacancy_detail, vacancy_list))
+        
+        return [vacancy for vacancy in results if vacancy is not None]
+
+    def fetch_vacancy_detail(self, vacancy):
+        """Загрузка и обработка одной вакансии (None при ошибке)"""
+        try:
+            # Базовая информация
+            vacancy_id = vacancy['id']
+            
+            # Получаем полное описание (с учётом локального кэша)
+            full_data = self.get_vacancy_json(vacancy_id, vacancy)
+            
+            started = time.perf_counter()
+            processed = self.process_vacancy_data(full_data)
+            self.metrics.observe('hh_vacancy_process_seconds', time.perf_counter() - started)
+            return processed
+            
+        except Exception as e:
+            print(f"Ошибка обработки вакансии {vacancy.get('id')}: {e}")
+            return None
 
     def process_vacancy_data(self, vacancy_data):
-        """Обработка данных вакансии с извлечением всей нужной информации"""
+        """Обработка данных вакансии с извлечением всей нужной информации.
+        
+        Возвращает VacancyRecord: метаданные технологий и компетенции берутся
+        из каталога по номеру технологии, а не копируются в каждую вакансию.
+        """
         
         # Базовые данные
         processed = {
@@ -149,12 +561,16 @@ class HHEnhancedParser:
             'title': vacancy_data.get('name'),
             'company': vacancy_data.get('employer', {}).get('name'),
             'company_size': self.get_company_size(vacancy_data.get('employer', {})),
+            # Сведения /employers/{id} (--employers): объём найма, тип и отрасли работодателя
+            **employer_dimension(vacancy_data.get('employer_details')),
             'area': vacancy_data.get('area', {}).get('name'),
             'published_date': vacancy_data.get('published_at'),
             'experience_raw': vacancy_data.get('experience', {}).get('name'),
             'experience_level': self.map_experience_level(vacancy_data.get('experience', {}).get('name')),
             'schedule': vacancy_data.get('schedule', {}).get('name'),
             'employment': vacancy_data.get('employment', {}).get('name'),
+            # Облегчённый режим: текст из сниппета выдачи, а не из описания вакансии
+            'text_source': 'snippet' if 'snippet_analysis' in vacancy_data else 'details',
         }
         
         # Зарплата
@@ -168,57 +584,111 @@ class HHEnhancedParser:
                 'avg_salary': self.calculate_avg_salary(salary)
             })
         
-        # Полный текст для анализа
+        # Текст для анализа; ключевые навыки разбираются отдельно, через словарь навыков
         description = vacancy_data.get('description', '') or ''
         key_skills = vacancy_data.get('key_skills', [])
-        skills_text = ' '.join([skill.get('name', '') for skill in key_skills])
+        skill_names = [skill.get('name') for skill in key_skills if skill.get('name')]
         
-        full_text = f"{processed['title']} {description} {skills_text}"
+        full_text = f"{processed['title']} {description}"
         
-        # Извлечение технологий с детальной информацией
-        technologies = self.extract_technologies_detailed(full_text)
-        processed['technologies'] = technologies
-        processed['tech_count'] = len(technologies)
+        # Один проход анализа текста: технологии, роль и домен (сниппет уже разобран)
+        analysis = vacancy_data.get('snippet_analysis') or self.analyze_text(full_text, skill_names)
         
         # Определение роли/домена
-        processed['role'] = self.determine_role(full_text)
-        processed['domain'] = self.determine_domain(full_text)
-        
-        # Ключевые навыки
-        processed['key_skills'] = [skill.get('name') for skill in key_skills]
-        processed['skills_count'] = len(key_skills)
+        processed['role'] = self.pick_best(analysis['role_scores'])
+        processed['domain'] = self.pick_best(analysis['domain_scores'])
         
-        # Связь с компетенциями ФГОС/Профстандартов
-        competencies = self.map_to_competencies(technologies)
-        processed['fgos_competencies'] = competencies['fgos']
-        processed['prof_standard_competencies'] = competencies['prof_standards']
+        return VacancyRecord(self.tech_catalog, analysis['technologies'],
+                             key_skills=skill_names, **processed)
+
+    def build_text_matcher(self):
+        """Компиляция словарей технологий, ролей и доменов (вызывать после их изменения)"""
+        self.tech_order = {tech: index for index, tech in enumerate(self.tech_competency_mapping)}
+        self.tech_catalog = TechCatalog(self.tech_competency_mapping)
+        
+        # Ключевое слово -> список (таблица, метка); одно слово может входить в несколько таблиц
+        self.keyword_targets = defaultdict(list)
+        for tech in self.tech_competency_mapping:
+            self.keyword_targets[tech.lower()].append(('tech', tech))
+        for role, keywords in self.role_keywords.items():
+            for keyword in keywords:
+                self.keyword_targets[keyword].append(('role', role))
+        for domain, keywords in self.domain_keywords.items():
+            for keyword in keywords:
+                self.keyword_targets[keyword].append(('domain', domain))
         
-        return processed
+        self.text_matcher = KeywordMatcher(self.keyword_targets)
+        # Навык -> найденные в нём слова; словари изменились - прежние результаты не годятся
+        self.skill_matches = {}
 
-    def extract_technologies_detailed(self, text):
-        """Детальное извлечение технологий с метаинформацией"""
+    def normalize_text(self, text):
+        """Нормализация текста для анализа: без HTML-разметки, в нижнем регистре"""
         if not text:
-            return {}
+            return ''
+        return html.unescape(HTML_TAG_RE.sub(' ', text)).lower()
+
+    def skill_keywords(self, skill):
+        """Слова словарей в названии навыка; разбор каждого навыка выполняется один раз"""
+        counts = self.skill_matches.get(skill)
+        if counts is None:
+            counts = self.text_matcher.count(self.normalize_text(skill))
+            if len(self.skill_matches) < SKILL_MATCH_CACHE_SIZE:
+                self.skill_matches[skill] = counts
+        return counts
+
+    def analyze_text(self, text, skills=()):
+        """Анализ текста за один проход: частоты технологий, баллы ролей и доменов.
+        
+        skills - ключевые навыки вакансии: повторяются от вакансии к вакансии,
+        поэтому разбираются поиском в словаре навыков, а не регулярным выражением.
+        """
+        tech_counts = {}
+        role_scores = dict.fromkeys(self.role_keywords, 0)
+        domain_scores = dict.fromkeys(self.domain_keywords, 0)
+        tables = {'tech': tech_counts, 'role': role_scores, 'domain': domain_scores}
         
-        text_lower = text.lower()
+        keyword_counts = self.text_matcher.count(self.normalize_text(text))
+        for skill in skills:
+            keyword_counts.update(self.skill_keywords(skill))
+        
+        for keyword, matches in keyword_counts.items():
+            for table, label in self.keyword_targets[keyword]:
+                scores = tables[table]
+                scores[label] = scores.get(label, 0) + matches
+        
+        # Порядок технологий - как в tech_competency_mapping
+        ordered_techs = sorted(tech_counts, key=self.tech_order.get)
+        
+        return {
+            'technologies': {tech: tech_counts[tech] for tech in ordered_techs},
+            'role_scores': role_scores,
+            'domain_scores': domain_scores
+        }
+
+    def describe_technologies(self, tech_counts):
+        """Метаинформация по найденным технологиям"""
         found_technologies = {}
         
-        for tech, info in self.tech_competency_mapping.items():
-            pattern = r'\b' + re.escape(tech.lower()) + r'\b'
-            matches = len(re.findall(pattern, text_lower))
-            
-            if matches > 0:
-                found_technologies[tech] = {
-                    'frequency': matches,
-                    'category': info['category'],
-                    'level': info['level'],
-                    'domain': info['domain'],
-                    'fgos_competencies': info['fgos_competencies'],
-                    'prof_standards': info['prof_standards']
-                }
+        for tech, matches in tech_counts.items():
+            info = self.tech_competency_mapping[tech]
+            found_technologies[tech] = {
+                'frequency': matches,
+                'category': info['category'],
+                'level': info['level'],
+                'domain': info['domain'],
+                'fgos_competencies': info['fgos_competencies'],
+                'prof_standards': info['prof_standards']
+            }
         
         return found_technologies
 
+    def extract_technologies_detailed(self, text):
+        """Детальное извлечение технологий с метаинформацией"""
+        if not text:
+            return {}
+        
+        return self.describe_technologies(self.analyze_text(text)['technologies'])
+
     def map_to_competencies(self, technologies):
         """Сопоставление технологий с компетенциями"""
         fgos_competencies = set()
@@ -233,36 +703,17 @@ class HHEnhancedParser:
             'prof_standards': list(prof_standards)
         }
 
+    def pick_best(self, scores):
+        """Метка с наибольшим баллом (при равенстве - первая по порядку словаря)"""
+        return max(scores, key=scores.get) if scores else 'general'
+
     def determine_role(self, text):
         """Определение роли разработчика"""
-        text_lower = text.lower()
-        role_scores = defaultdict(int)
-        
-        for role, keywords in self.role_keywords.items():
-            for keyword in keywords:
-                role_scores[role] += len(re.findall(r'\b' + re.escape(keyword) + r'\b', text_lower))
-        
-        return max(role_scores, key=role_scores.get) if role_scores else 'general'
+        return self.pick_best(self.analyze_text(text)['role_scores'])
 
     def determine_domain(self, text):
         """Определение предметной области"""
-        domain_keywords = {
-            'fintech': ['банк', 'финанс', 'платеж', 'криптовалют'],
-            'ecommerce': ['интернет-магазин', 'ecommerce', 'торговл'],
-            'gamedev': ['игр', 'геймдев', 'unity', 'unreal'],
-            'edtech': ['образование', 'обучение', 'курс'],
-            'healthtech': ['медицин', 'здоровье', 'клиник'],
-            'government': ['государств', 'госуслуг', 'бюджет']
-        }
-        
-        text_lower = text.lower()
-        domain_scores = defaultdict(int)
-        
-        for domain, keywords in domain_keywords.items():
-            for keyword in keywords:
-                domain_scores[domain] += len(re.findall(r'\b' + re.escape(keyword) + r'\b', text_lower))
-        
-        return max(domain_scores, key=domain_scores.get) if domain_scores else 'general'
+        return self.pick_best(self.analyze_text(text)['domain_scores'])
 
     def get_company_size(self, employer_data):
         """Определение размера компании"""
@@ -296,102 +747,18 @@ class HHEnhancedParser:
         if not timestamp:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # 1. Основной файл с вакансиями
-        vacancies_file = f'csv_files/hh_vacancies_enhanced_{timestamp}.csv'
-        
-        vacancies_data = []
-        for vacancy in processed_vacancies:
-            row = {
-                'vacancy_id': vacancy['vacancy_id'],
-                'title': vacancy['title'],
-                'company': vacancy['company'],
-                'company_size': vacancy.get('company_size'),
-                'area': vacancy['area'],
-                'published_date': vacancy['published_date'],
-                'experience_raw': vacancy['experience_raw'],
-                'experience_level': vacancy['experience_level'],
-                'role': vacancy['role'],
-                'domain': vacancy['domain'],
-                'salary_from': vacancy.get('salary_from'),
-                'salary_to': vacancy.get('salary_to'),
-                'avg_salary': vacancy.get('avg_salary'),
-                'tech_count': vacancy['tech_count'],
-                'skills_count': vacancy['skills_count'],
-                'fgos_competencies_count': len(vacancy['fgos_competencies']),
-                'prof_competencies_count': len(vacancy['prof_standard_competencies'])
-            }
-            vacancies_data.append(row)
-        
-        pd.DataFrame(vacancies_data).to_csv(vacancies_file, index=False, encoding='utf-8')
-        
-        # 2. Детальный файл технологий
-        tech_file = f'csv_files/hh_technologies_detailed_{timestamp}.csv'
-        tech_data = []
-        
+        writer = SnapshotWriter(timestamp)
         for vacancy in processed_vacancies:
-            for tech, info in vacancy['technologies'].items():
-                tech_data.append({
-                    'vacancy_id': vacancy['vacancy_id'],
-                    'technology': tech,
-                    'frequency': info['frequency'],
-                    'category': info['category'],
-                    'level': info['level'],
-                    'domain': info['domain'],
-                    'fgos_competencies': ','.join(info['fgos_competencies']),
-                    'prof_standards': ','.join(info['prof_standards'])
-                })
-        
-        pd.DataFrame(tech_data).to_csv(tech_file, index=False, encoding='utf-8')
-        
-        # 3. Сводная аналитика
-        analytics_file = f'csv_files/hh_analytics_{timestamp}.csv'
-        self.create_analytics_summary(processed_vacancies, analytics_file)
-        
-        print(f"✅ Сохранены файлы:")
-        print(f"  📄 Вакансии: {vacancies_file}")
-        print(f"  🔧 Технологии: {tech_file}")
-        print(f"  📊 Аналитика: {analytics_file}")
+            writer.write(vacancy)
+        writer.close()
 
     def create_analytics_summary(self, processed_vacancies, filename):
         """Создание сводной аналитики"""
-        analytics = []
-        
-        # Агрегация по технологиям
-        tech_stats = defaultdict(lambda: {
-            'total_mentions': 0,
-            'vacancy_count': 0,
-            'avg_salary': [],
-            'roles': defaultdict(int),
-            'experience_levels': defaultdict(int),
-            'domains': defaultdict(int)
-        })
-        
+        aggregator = TechAnalyticsAggregator()
         for vacancy in processed_vacancies:
-            for tech, info in vacancy['technologies'].items():
-                stats = tech_stats[tech]
-                stats['total_mentions'] += info['frequency']
-                stats['vacancy_count'] += 1
-                
-                if vacancy.get('avg_salary'):
-                    stats['avg_salary'].append(vacancy['avg_salary'])
-                
-                stats['roles'][vacancy['role']] += 1
-                stats['experience_levels'][vacancy['experience_level']] += 1
-                stats['domains'][vacancy['domain']] += 1
-        
-        # Формирование итоговой аналитики
-        for tech, stats in tech_stats.items():
-            analytics.append({
-                'technology': tech,
-                'total_mentions': stats['total_mentions'],
-                'vacancy_count': stats['vacancy_count'],
-                'avg_salary': sum(stats['avg_salary']) / len(stats['avg_salary']) if stats['avg_salary'] else None,
-                'top_role': max(stats['roles'], key=stats['roles'].get) if stats['roles'] else None,
-                'top_experience': max(stats['experience_levels'], key=stats['experience_levels'].get) if stats['experience_levels'] else None,
-                'top_domain': max(stats['domains'], key=stats['domains'].get) if stats['domains'] else None
-            })
+            aggregator.add(vacancy)
         
-        pd.DataFrame(analytics).to_csv(filename, index=False, encoding='utf-8')
+        write_csv_atomic(filename, ANALYTICS_COLUMNS, aggregator.rows())
 
     def run_enhanced_parsing(self):
         """Запуск расширенного парсинга"""
@@ -408,17 +775,168 @@ class HHEnhancedParser:
             "devops инженер"
         ]
         
-        # Сбор данных
-        all_vacancies = self.search_vacancies_enhanced(queries, max_pages=2)
+        # Журнал прогресса: при --resume продолжаем тот же снимок с места остановки
+        self.journal = CrawlJournal(self.journal_path, resume=self.resume)
+        
+        # Сбор данных: вакансии пишутся в файлы по мере обработки
+        writer = SnapshotWriter(self.journal.timestamp, resume_sizes=self.journal.checkpoint_sizes,
+                                on_flush=self.journal.checkpoint)
+        if self.archive_dir:
+            self.archive = RawArchive(self.journal.timestamp, self.archive_dir)
+        
+        try:
+            if self.pipeline:
+                total = self.search_vacancies_pipelined(queries, max_pages=2, sink=writer.write)
+            else:
+                total = self.search_vacancies_enhanced(queries, max_pages=2, sink=writer.write)
+        finally:
+            saved = writer.close()
+            if self.archive is not None:
+                self.archive.close()
+            self.flush_caches()
+        
+        print(f"\n📊 Собрано {total} вакансий")
+        if self.planner is not None:
+            print(f"  🧩 Шардов разделено из-за лимита выдачи: {self.planner.split_count}")
+        print(f"  🔁 Повторов запросов: {self.retry_count}, "
+              f"ограничений скорости: {self.rate_limiter.throttle_count}")
+        
+        connections = self.connection_stats.summary()
+        print(f"  🔌 Соединений: {connections['connections']} на {connections['requests']} запросов, "
+              f"установка {connections['connect_time_avg_ms']:.1f} мс в среднем "
+              f"({connections['connect_time_per_request_ms']:.1f} мс на запрос)")
+        if self.cache is not None:
+            print(f"  💾 Кэш деталей: {self.cache_stats['hit']} без запроса, "
+                  f"{self.cache_stats['not_modified']} не изменились (304), "
+                  f"{self.cache_stats['downloaded']} загружено")
+        
+        if self.lite:
+            lite_total = sum(self.lite_stats.values())
+            avoided = self.lite_stats['cached'] + self.lite_stats['snippet']
+            print(f"  🪶 Облегчённый режим: запрошено деталей {self.lite_stats['detail']} из {lite_total}, "
+                  f"избежано {avoided} ({self.lite_stats['cached']} по кэшу, "
+                  f"{self.lite_stats['snippet']} по сниппету)")
+        if self.employers is not None:
+            employer_stats = self.employers.stats
+            share = employer_stats['fetched'] / total * 100 if total else 0.0
+            print(f"  🏢 Работодатели: {employer_stats['fetched']} загружено ({share:.1f}% от числа вакансий), "
+                  f"{employer_stats['cache']} из кэша, {employer_stats['failed']} с ошибкой")
+        self.report_metrics()
+        
+        if not saved:
+            print("ℹ️ Новых вакансий нет, файлы не создаются")
+        
+        # Состояние сохраняется после файлов, чтобы сбой не потерял дельту
+        if self.crawl_state is not None:
+            held_back = self.crawl_state.advance_watermarks()
+            if held_back:
+                print(f"  ⏸️ Водяной знак сдвинут не до конца (неполная выдача или ошибки): {', '.join(held_back)}")
+            self.crawl_state.save()
+        self.journal.finish()
+        
+        # Parquet строится из завершённых CSV, поэтому запись остаётся устойчивой к сбоям
+        if saved and self.output_format in ('parquet', 'both'):
+            export_snapshot(writer.snapshot_files(),
+                            keep_csv=self.output_format == 'both')
+        
+        return total
+
+    def flush_caches(self):
+        """Отложенные записи кэшей деталей и работодателей - на диск"""
+        if self.cache is not None:
+            self.cache.flush()
+        if self.employers is not None and self.employers.cache is not None:
+            self.employers.cache.flush()
+
+    def report_metrics(self):
+        """Сводка по сети и анализу текста; выгрузка метрик, если задан metrics_path"""
+        for result, count in self.cache_stats.items():
+            self.metrics.set('hh_cache_requests_total', count, result=result)
+        for source, count in self.lite_stats.items():
+            self.metrics.set('hh_lite_vacancies_total', count, source=source)
+        
+        network_time, requests_count = self.metrics.total_time('hh_http_request_duration_seconds')
+        process_time, processed_count = self.metrics.total_time('hh_vacancy_process_seconds')
+        print(f"  ⏱️ Ожидание сети: {network_time:.1f} с на {requests_count} запросов, "
+              f"анализ текста: {process_time:.1f} с на {processed_count} вакансий")
+        
+        for query, (started, finished, count) in self.metrics.queries.items():
+            duration = finished - started
+            if count and duration > 0:
+                print(f"    {query}: {count} вакансий, {count / duration:.1f}/с")
+        
+        if self.metrics_path:
+            self.metrics.export(self.metrics_path)
+
+    def reprocess_archive(self, archive_paths):
+        """Повторный анализ архива JSON текущими словарями - без сети, в пуле процессов.
         
-        print(f"\n📊 Собрано {len(all_vacancies)} вакансий")
+        Вакансия из нескольких запусков анализируется один раз, по самой свежей записи.
+        """
+        print(f"♻️ Повторная обработка архивов: {len(archive_paths)} файлов")
+        started = time.perf_counter()
         
-        # Сохранение
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.save_enhanced_csv(all_vacancies, timestamp)
-        
-        return all_vacancies
+        writer = SnapshotWriter(timestamp)
+        try:
+            total = reprocess_records(self, iter_latest(archive_paths), writer.write,
+                                      analysis_workers=self.analysis_workers)
+        finally:
+            saved = writer.close()
+        
+        elapsed = time.perf_counter() - started
+        print(f"\n📊 Обработано {total} вакансий за {elapsed:.1f} с")
+        self.report_metrics()
+        
+        if saved and self.output_format in ('parquet', 'both'):
+            export_snapshot(writer.snapshot_files(),
+                            keep_csv=self.output_format == 'both')
+        
+        return total
 
 if __name__ == "__main__":
-    parser = HHEnhancedParser()
-    vacancies = parser.run_enhanced_parsing()
\ No newline at end of file
+    arg_parser = argparse.ArgumentParser(description="Расширенный парсинг вакансий HH")
+    arg_parser.add_argument('--workers', type=int, default=8,
+                            help="параллельных загрузок деталей вакансий")
+    arg_parser.add_argument('--rps', type=float, default=5.0,
+                            help="лимит запросов в секунду к API")
+    arg_parser.add_argument('--incremental', action='store_true',
+                            help="только новые вакансии с прошлого запуска (дельта)")
+    arg_parser.add_argument('--resume', action='store_true',
+                            help="продолжить прерванный запуск с места остановки")
+    arg_parser.add_argument('--format', choices=['csv', 'parquet', 'both'], default='csv',
+                            help="формат снимка (parquet требует pyarrow)")
+    arg_parser.add_argument('--reprocess', nargs='+', metavar='ARCHIVE',
+                            help="пересчитать снимок из архивов raw/*.jsonl.gz без сети")
+    arg_parser.add_argument('--sharded', action='store_true',
+                            help="полная выдача: шарды по регионам и окнам дат (обход лимита в 2000)")
+    arg_parser.add_argument('--areas', nargs='+', default=None, metavar='AREA',
+                            help="регионы HH для --sharded (по умолчанию 113 - вся Россия)")
+    arg_parser.add_argument('--shard-workers', type=int, default=4,
+                            help="параллельно обходимых шардов")
+    arg_parser.add_argument('--metrics', metavar='PATH', default=None,
+                            help="выгрузить метрики: *.json или textfile Prometheus (*.prom)")
+    arg_parser.add_argument('--base-url', default="https://api.hh.ru",
+                            help="адрес API (например, локальная заглушка mock_hh_server.py)")
+    arg_parser.add_argument('--employers', action='store_true',
+                            help="запрашивать сведения о работодателях (объём найма, тип, отрасли)")
+    arg_parser.add_argument('--lite', action='store_true',
+                            help="быстрый срез: записи из поисковой выдачи, детали только при необходимости")
+    arg_parser.add_argument('--pipeline', action='store_true',
+                            help="конвейер: загрузка и анализ текста параллельно")
+    arg_parser.add_argument('--analysis-workers', type=int, default=None,
+                            help="процессов анализа текста (по умолчанию - число ядер)")
+    args = arg_parser.parse_args()
+    
+    parser = HHEnhancedParser(max_workers=args.workers, requests_per_second=args.rps,
+                              incremental=args.incremental, pipeline=args.pipeline,
+                              analysis_workers=args.analysis_workers, resume=args.resume,
+                              output_format=args.format, sharded=args.sharded,
+                              areas=args.areas, shard_workers=args.shard_workers,
+                              metrics_path=args.metrics, base_url=args.base_url,
+                              enrich_employers=args.employers, lite=args.lite)
+    
+    if args.reprocess:
+        parser.reprocess_archive(args.reprocess)
+    else:
+        parser.run_enhanced_parsing()
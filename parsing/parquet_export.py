@@ -0,0 +1,100 @@
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow нужен только для формата parquet
+    pa = None
+
+# Низкокардинальные строковые столбцы хранятся со словарным кодированием
+CATEGORY = 'category'
+
+
+def _column_type(kind):
+    return {
+        'string': pa.string(),
+        CATEGORY: pa.dictionary(pa.int32(), pa.string()),
+        'int32': pa.int32(),
+        'int64': pa.int64(),
+        'float64': pa.float64()
+    }[kind]
+
+
+# Схемы снимков HH; published_date остаётся строкой ISO 8601, чтобы не терять смещение пояса
+SNAPSHOT_SCHEMAS = {
+    'hh_vacancies_enhanced': [
+        ('vacancy_id', 'string'), ('title', 'string'), ('company', 'string'),
+        ('company_size', CATEGORY), ('hiring_volume', CATEGORY), ('employer_type', CATEGORY),
+        ('employer_industries', CATEGORY), ('area', CATEGORY), ('published_date', 'string'),
+        ('experience_raw', CATEGORY), ('experience_level', CATEGORY),
+        ('role', CATEGORY), ('domain', CATEGORY),
+        ('salary_from', 'float64'), ('salary_to', 'float64'), ('avg_salary', 'float64'),
+        ('tech_count', 'int32'), ('skills_count', 'int32'),
+        ('fgos_competencies_count', 'int32'), ('prof_competencies_count', 'int32'),
+        ('text_source', CATEGORY)
+    ],
+    'hh_technologies_detailed': [
+        ('vacancy_id', 'string'), ('technology', CATEGORY), ('frequency', 'int32'),
+        ('category', CATEGORY), ('level', CATEGORY), ('domain', CATEGORY),
+        ('fgos_competencies', CATEGORY), ('prof_standards', CATEGORY)
+    ],
+    'hh_analytics': [
+        ('technology', 'string'), ('total_mentions', 'int64'), ('vacancy_count', 'int64'),
+        ('avg_salary', 'float64'), ('min_salary', 'float64'), ('max_salary', 'float64'),
+        ('top_role', CATEGORY),
+        ('top_experience', CATEGORY), ('top_domain', CATEGORY)
+    ],
+    'hh_skills': [('skill_id', 'int32'), ('skill', 'string')],
+    'hh_vacancy_skills': [('vacancy_id', 'string'), ('skill_id', 'int32')]
+}
+
+
+def check_parquet_support():
+    """Ошибка заранее, а не после многочасового парсинга"""
+    if pa is None:
+        raise ImportError("Для формата parquet нужен pyarrow: pip install pyarrow")
+
+
+def snapshot_kind(csv_path):
+    """Тип файла снимка по имени (hh_vacancies_enhanced_20250704_181455.csv -> hh_vacancies_enhanced)"""
+    name = os.path.basename(csv_path)
+    for kind in SNAPSHOT_SCHEMAS:
+        if name.startswith(kind + '_'):
+            return kind
+    raise ValueError(f"Неизвестный файл снимка: {csv_path}")
+
+
+def csv_to_parquet(csv_path, compression='zstd'):
+    """Потоковое преобразование CSV снимка в Parquet с типизированной схемой"""
+    check_parquet_support()
+    columns = SNAPSHOT_SCHEMAS[snapshot_kind(csv_path)]
+    schema = pa.schema([(name, _column_type(kind)) for name, kind in columns])
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+
+    convert_options = pa_csv.ConvertOptions(
+        column_types={field.name: field.type for field in schema},
+        strings_can_be_null=True
+    )
+    reader = pa_csv.open_csv(csv_path, convert_options=convert_options)
+
+    tmp_path = parquet_path + '.tmp'
+    with pq.ParquetWriter(tmp_path, schema, compression=compression, use_dictionary=True) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+    os.replace(tmp_path, parquet_path)
+
+    return parquet_path
+
+
+def export_snapshot(csv_paths, keep_csv=False):
+    """Преобразование файлов снимка в Parquet; CSV удаляются, если keep_csv=False"""
+    parquet_paths = []
+    for csv_path in csv_paths:
+        parquet_path = csv_to_parquet(csv_path)
+        csv_size, parquet_size = os.path.getsize(csv_path), os.path.getsize(parquet_path)
+        print(f"  🗜️ {parquet_path}: {parquet_size / 1024:.0f} КБ (CSV {csv_size / 1024:.0f} КБ)")
+        if not keep_csv:
+            os.remove(csv_path)
+        parquet_paths.append(parquet_path)
+    return parquet_paths
@@ -0,0 +1,88 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+
+class AdaptiveRateLimiter:
+    """Token bucket с адаптивной скоростью (общий для всех запросов к API)"""
+
+    def __init__(self, requests_per_second=5.0, burst=None, min_rate=0.5, recovery_step=0.1):
+        self.max_rate = float(requests_per_second)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.rate = self.max_rate
+        self.capacity = float(burst) if burst else max(1.0, self.max_rate)
+        # Доля максимальной скорости, возвращаемая после каждого успешного ответа
+        self.recovery_step = recovery_step
+
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.throttle_count = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        """Пополнение корзины токенов по текущей скорости"""
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def acquire(self):
+        """Ожидание разрешения на один запрос"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+    def on_success(self):
+        """Плавное восстановление скорости после успешного ответа"""
+        with self.lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery_step)
+
+    def on_throttle(self, retry_after=None):
+        """Снижение скорости после 429/5xx, пауза на Retry-After для всех потоков"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.throttle_count += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+
+def parse_retry_after(value):
+    """Разбор заголовка Retry-After (секунды или HTTP-дата)"""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    """Экспоненциальная задержка с полным джиттером"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -0,0 +1,73 @@
+import gzip
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+
+
+class RawArchive:
+    """Архив исходных JSON вакансий: gzip, одна вакансия на строку.
+
+    Каждый запуск пишет отдельный файл; сжатый поток сбрасывается (Z_SYNC_FLUSH)
+    каждые flush_every записей, поэтому после сбоя читается всё до последнего сброса.
+    """
+
+    def __init__(self, snapshot_timestamp, archive_dir='raw', flush_every=100):
+        os.makedirs(archive_dir, exist_ok=True)
+        started = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.path = os.path.join(archive_dir, f'hh_raw_{snapshot_timestamp}_{started}.jsonl.gz')
+        self.flush_every = flush_every
+        self.count = 0
+        self.lock = threading.Lock()
+        self.handle = gzip.open(self.path, 'wt', encoding='utf-8')
+
+    def append(self, vacancy_data):
+        line = json.dumps(vacancy_data, ensure_ascii=False) + '\n'
+        with self.lock:
+            self.handle.write(line)
+            self.count += 1
+            if self.count % self.flush_every == 0:
+                # GzipFile.flush по умолчанию делает Z_SYNC_FLUSH - данные читаемы без конца потока
+                self.handle.flush()
+                os.fsync(self.handle.buffer.fileobj.fileno())
+
+    def close(self):
+        with self.lock:
+            self.handle.close()
+        print(f"  🗄️ Архив JSON: {self.path} ({self.count} вакансий)")
+
+
+def iter_archive(paths, quiet=False):
+    """Вакансии из архивов по порядку; оборванный хвост после сбоя пропускается"""
+    for path in paths:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            try:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        break  # недописанная строка
+            except (EOFError, zlib.error):
+                if not quiet:
+                    print(f"⚠️ Архив {path} оборван (прерванный запуск), прочитано до места сбоя")
+
+
+def iter_latest(paths):
+    """Вакансии архивов без повторов: по каждому id - самая свежая запись.
+
+    Архивы упорядочиваются по имени (метки времени снимка и запуска), свежей
+    считается последняя запись вакансии. Первый проход запоминает её место,
+    второй отдаёт записи - в памяти только id, а не сами вакансии.
+    """
+    paths = sorted(paths, key=os.path.basename)
+    latest = {}
+    total = 0
+    for total, vacancy in enumerate(iter_archive(paths), start=1):
+        latest[str(vacancy.get('id'))] = total
+    if total > len(latest):
+        print(f"  🔁 Повторов вакансий в архивах: {total - len(latest)}, берутся самые свежие записи")
+
+    for position, vacancy in enumerate(iter_archive(paths, quiet=True), start=1):
+        if latest.get(str(vacancy.get('id'))) == position:
+            yield vacancy
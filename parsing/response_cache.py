@@ -0,0 +1,220 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Отметки обращений (accessed_at для вытеснения) пишутся пачками, а не при каждом чтении
+TOUCH_BATCH_SIZE = 1000
+
+
+def flush_touches(conn, table, key_column, touched):
+    """Запись накопленных отметок обращений; commit - за вызывающим"""
+    if touched:
+        conn.executemany(f"UPDATE {table} SET accessed_at = ? WHERE {key_column} = ?",
+                         [(accessed_at, key) for key, accessed_at in touched.items()])
+        touched.clear()
+
+
+class VacancyCache:
+    """Локальный кэш ответов /vacancies/{id} в SQLite с вытеснением по размеру"""
+
+    def __init__(self, path='cache/hh_vacancy_cache.sqlite', max_bytes=512 * 1024 * 1024, max_age=6 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        # Сколько секунд запись считается свежей и отдаётся без запроса к API
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        # Прочитанные записи, время обращения к которым ещё не записано: ключ -> время
+        self.touched = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS vacancy_responses (
+                vacancy_id TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON vacancy_responses(accessed_at)")
+        self.conn.commit()
+
+        self.total_size = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM vacancy_responses").fetchone()[0]
+
+    def get(self, vacancy_id):
+        """Запись кэша или None; fresh=True - перепроверка не нужна"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM vacancy_responses WHERE vacancy_id = ?",
+                (str(vacancy_id),)).fetchone()
+            if not row:
+                return None
+
+            now = time.time()
+            self.touched[str(vacancy_id)] = now
+            if len(self.touched) >= TOUCH_BATCH_SIZE:
+                flush_touches(self.conn, 'vacancy_responses', 'vacancy_id', self.touched)
+                self.conn.commit()
+
+        body, etag, last_modified, fetched_at = row
+        return {
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fresh': now - fetched_at < self.max_age
+        }
+
+    def store(self, vacancy_id, body, etag=None, last_modified=None):
+        """Сохранение ответа с валидаторами ETag/Last-Modified"""
+        size = len(body.encode('utf-8'))
+        now = time.time()
+
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM vacancy_responses WHERE vacancy_id = ?",
+                                    (str(vacancy_id),)).fetchone()
+            self.conn.execute("""
+                INSERT OR REPLACE INTO vacancy_responses
+                    (vacancy_id, body, etag, last_modified, size, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (str(vacancy_id), body, etag, last_modified, size, now, now))
+            self.total_size += size - (old[0] if old else 0)
+            self.touched.pop(str(vacancy_id), None)
+
+            if self.total_size > self.max_bytes:
+                self._evict()
+            self.conn.commit()
+
+    def mark_revalidated(self, vacancy_id):
+        """Ответ 304: запись снова свежая"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("UPDATE vacancy_responses SET fetched_at = ?, accessed_at = ? WHERE vacancy_id = ?",
+                              (now, now, str(vacancy_id)))
+            self.touched.pop(str(vacancy_id), None)
+            self.conn.commit()
+
+    def _evict(self):
+        """Удаление давно не использованных записей до 90% лимита"""
+        flush_touches(self.conn, 'vacancy_responses', 'vacancy_id', self.touched)
+        target = self.max_bytes * 0.9
+        rows = self.conn.execute(
+            "SELECT vacancy_id, size FROM vacancy_responses ORDER BY accessed_at").fetchall()
+
+        evicted = []
+        for vacancy_id, size in rows:
+            if self.total_size <= target:
+                break
+            evicted.append((vacancy_id,))
+            self.total_size -= size
+
+        self.conn.executemany("DELETE FROM vacancy_responses WHERE vacancy_id = ?", evicted)
+
+    def flush(self):
+        """Запись отложенных отметок обращений (в конце запуска)"""
+        with self.lock:
+            flush_touches(self.conn, 'vacancy_responses', 'vacancy_id', self.touched)
+            self.conn.commit()
+
+    def close(self):
+        self.flush()
+        with self.lock:
+            self.conn.close()
+
+
+class EmployerCache:
+    """Кэш сведений о работодателях (/employers/{id}) в SQLite: срок жизни и вытеснение по числу записей"""
+
+    def __init__(self, path='cache/hh_employer_cache.sqlite', max_entries=100_000, max_age=7 * 86400):
+        self.path = path
+        self.max_entries = max_entries
+        # Размер компании и отрасли меняются редко - запись живёт неделю
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        # Прочитанные записи, время обращения к которым ещё не записано: ключ -> время
+        self.touched = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS employers (
+                employer_id TEXT PRIMARY KEY,
+                details TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_employers_accessed ON employers(accessed_at)")
+        self.conn.commit()
+
+        self.entry_count = self.conn.execute("SELECT COUNT(*) FROM employers").fetchone()[0]
+
+    def get(self, employer_id):
+        """Сведения о работодателе или None, если записи нет или она устарела"""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT details, fetched_at FROM employers WHERE employer_id = ?",
+                                    (str(employer_id),)).fetchone()
+            if not row or now - row[1] >= self.max_age:
+                return None
+
+            self.touched[str(employer_id)] = now
+            if len(self.touched) >= TOUCH_BATCH_SIZE:
+                flush_touches(self.conn, 'employers', 'employer_id', self.touched)
+                self.conn.commit()
+
+        return json.loads(row[0])
+
+    def store(self, employer_id, details):
+        now = time.time()
+        with self.lock:
+            exists = self.conn.execute("SELECT 1 FROM employers WHERE employer_id = ?",
+                                       (str(employer_id),)).fetchone()
+            self.conn.execute("""
+                INSERT OR REPLACE INTO employers (employer_id, details, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?)
+            """, (str(employer_id), json.dumps(details, ensure_ascii=False), now, now))
+            if not exists:
+                self.entry_count += 1
+            self.touched.pop(str(employer_id), None)
+
+            if self.entry_count > self.max_entries:
+                self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """Удаление давно не использованных записей до 90% лимита"""
+        flush_touches(self.conn, 'employers', 'employer_id', self.touched)
+        excess = self.entry_count - int(self.max_entries * 0.9)
+        self.conn.execute("""
+            DELETE FROM employers WHERE employer_id IN (
+                SELECT employer_id FROM employers ORDER BY accessed_at LIMIT ?
+            )
+        """, (excess,))
+        self.entry_count -= excess
+
+    def flush(self):
+        """Запись отложенных отметок обращений (в конце запуска)"""
+        with self.lock:
+            flush_touches(self.conn, 'employers', 'employer_id', self.touched)
+            self.conn.commit()
+
+    def close(self):
+        self.flush()
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,248 @@
+import csv
+import os
+
+from analytics import ANALYTICS_COLUMNS, TechAnalyticsAggregator
+
+VACANCY_COLUMNS = ['vacancy_id', 'title', 'company', 'company_size', 'hiring_volume', 'employer_type',
+                   'employer_industries', 'area', 'published_date',
+                   'experience_raw', 'experience_level', 'role', 'domain',
+                   'salary_from', 'salary_to', 'avg_salary', 'tech_count', 'skills_count',
+                   'fgos_competencies_count', 'prof_competencies_count', 'text_source']
+
+TECHNOLOGY_COLUMNS = ['vacancy_id', 'technology', 'frequency', 'category', 'level', 'domain',
+                      'fgos_competencies', 'prof_standards']
+
+# Словарь ключевых навыков и факт вакансия <-> навык
+SKILL_COLUMNS = ['skill_id', 'skill']
+VACANCY_SKILL_COLUMNS = ['vacancy_id', 'skill_id']
+
+
+def skill_key(skill):
+    """Ключ навыка в словаре: без лишних пробелов и регистра ("Git " и "git" - один навык)"""
+    return ' '.join(str(skill).split()).casefold()
+
+
+def vacancy_row(vacancy):
+    """Строка файла вакансий"""
+    return {
+        'vacancy_id': vacancy['vacancy_id'],
+        'title': vacancy['title'],
+        'company': vacancy['company'],
+        'company_size': vacancy.get('company_size'),
+        'hiring_volume': vacancy.get('hiring_volume'),
+        'employer_type': vacancy.get('employer_type'),
+        'employer_industries': vacancy.get('employer_industries'),
+        'area': vacancy['area'],
+        'published_date': vacancy['published_date'],
+        'experience_raw': vacancy['experience_raw'],
+        'experience_level': vacancy['experience_level'],
+        'role': vacancy['role'],
+        'domain': vacancy['domain'],
+        'salary_from': vacancy.get('salary_from'),
+        'salary_to': vacancy.get('salary_to'),
+        'avg_salary': vacancy.get('avg_salary'),
+        'tech_count': vacancy['tech_count'],
+        'skills_count': vacancy['skills_count'],
+        'fgos_competencies_count': len(vacancy['fgos_competencies']),
+        'prof_competencies_count': len(vacancy['prof_standard_competencies']),
+        'text_source': vacancy.get('text_source')
+    }
+
+
+def technology_rows(vacancy):
+    """Строки детального файла технологий"""
+    return [{
+        'vacancy_id': vacancy['vacancy_id'],
+        'technology': tech,
+        'frequency': info['frequency'],
+        'category': info['category'],
+        'level': info['level'],
+        'domain': info['domain'],
+        'fgos_competencies': ','.join(info['fgos_competencies']),
+        'prof_standards': ','.join(info['prof_standards'])
+    } for tech, info in vacancy['technologies'].items()]
+
+
+class SnapshotWriter:
+    """Потоковая запись снимка HH: вакансии и технологии пишутся по мере обработки.
+
+    Файлы сбрасываются на диск (fsync) каждые flush_every вакансий, так что сбой
+    посреди парсинга теряет не больше одной порции. Аналитика считается потоково
+    и пишется при закрытии. on_flush получает размеры файлов после каждого fsync;
+    resume_sizes - размеры из прошлого запуска, до которых файлы обрезаются перед дозаписью.
+    Ключевые навыки пишутся словарём (номер навыка при первой встрече) и таблицей фактов.
+    """
+
+    def __init__(self, timestamp, output_dir='csv_files', flush_every=100,
+                 resume_sizes=None, on_flush=None):
+        self.output_dir = output_dir
+        self.flush_every = flush_every
+        self.resume_sizes = resume_sizes
+        self.on_flush = on_flush
+        self.vacancies_file = os.path.join(output_dir, f'hh_vacancies_enhanced_{timestamp}.csv')
+        self.tech_file = os.path.join(output_dir, f'hh_technologies_detailed_{timestamp}.csv')
+        self.analytics_file = os.path.join(output_dir, f'hh_analytics_{timestamp}.csv')
+        self.skills_file = os.path.join(output_dir, f'hh_skills_{timestamp}.csv')
+        self.vacancy_skills_file = os.path.join(output_dir, f'hh_vacancy_skills_{timestamp}.csv')
+
+        self.aggregator = TechAnalyticsAggregator()
+        self.vacancy_count = 0
+        self.skill_ids = {}
+        self.handles = None
+        self.writers = None
+
+        # Продолжение: файлы прошлого запуска открываются сразу, чтобы дописать аналитику
+        if resume_sizes is not None:
+            self._open()
+
+    def _streams(self):
+        """Потоковые файлы снимка: ключ размера в контрольной точке, путь, столбцы"""
+        return [('vacancies', self.vacancies_file, VACANCY_COLUMNS),
+                ('technologies', self.tech_file, TECHNOLOGY_COLUMNS),
+                ('skills', self.skills_file, SKILL_COLUMNS),
+                ('vacancy_skills', self.vacancy_skills_file, VACANCY_SKILL_COLUMNS)]
+
+    def snapshot_files(self):
+        """Все файлы снимка (для преобразования в Parquet)"""
+        return [self.vacancies_file, self.tech_file, self.analytics_file,
+                self.skills_file, self.vacancy_skills_file]
+
+    def _open(self):
+        """Файлы создаются при первой вакансии (пустой запуск не оставляет файлов)"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        resuming = (self.resume_sizes is not None
+                    and os.path.exists(self.vacancies_file) and os.path.exists(self.tech_file))
+
+        self.handles, self.writers = {}, {}
+        for key, path, columns in self._streams():
+            # Всё, что записано после последней контрольной точки, будет обработано заново
+            size = self.resume_sizes.get(key) if resuming else None
+            append = size is not None and os.path.exists(path)
+            if append:
+                os.truncate(path, size)
+
+            handle = open(path, 'a' if append else 'w', newline='', encoding='utf-8')
+            self.handles[key] = handle
+            self.writers[key] = csv.DictWriter(handle, fieldnames=columns)
+            if not append:
+                self.writers[key].writeheader()
+
+        if resuming:
+            self.restore_aggregates()
+            self.restore_skills()
+
+    def restore_aggregates(self):
+        """Восстановление аналитики по уже записанным строкам (при продолжении)"""
+        vacancies = {}
+        with open(self.vacancies_file, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                self.vacancy_count += 1
+                vacancies[row['vacancy_id']] = (
+                    float(row['avg_salary']) if row['avg_salary'] else None,
+                    row['role'], row['experience_level'], row['domain'])
+
+        def flush_group(vacancy_id, technologies):
+            if vacancy_id not in vacancies:
+                return
+            avg_salary, role, experience_level, domain = vacancies[vacancy_id]
+            self.aggregator.add({
+                'technologies': technologies,
+                'avg_salary': avg_salary,
+                'role': role,
+                'experience_level': experience_level,
+                'domain': domain
+            })
+
+        # Строки технологий одной вакансии идут подряд; повтор технологии - следующая вакансия
+        current_id, technologies = None, {}
+        with open(self.tech_file, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if row['vacancy_id'] != current_id or row['technology'] in technologies:
+                    flush_group(current_id, technologies)
+                    current_id, technologies = row['vacancy_id'], {}
+                technologies[row['technology']] = {'frequency': int(row['frequency'])}
+        flush_group(current_id, technologies)
+
+    def restore_skills(self):
+        """Словарь навыков из уже записанной части снимка (при продолжении)"""
+        with open(self.skills_file, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                self.skill_ids[skill_key(row['skill'])] = int(row['skill_id'])
+
+    def skill_id(self, skill):
+        """Номер навыка в словаре; новый навык сразу дописывается в словарь"""
+        key = skill_key(skill)
+        if not key:
+            return None
+
+        skill_id = self.skill_ids.get(key)
+        if skill_id is None:
+            skill_id = self.skill_ids[key] = len(self.skill_ids) + 1
+            self.writers['skills'].writerow({'skill_id': skill_id, 'skill': ' '.join(str(skill).split())})
+        return skill_id
+
+    def write(self, vacancy):
+        """Запись одной обработанной вакансии"""
+        if self.handles is None:
+            self._open()
+
+        # Сброс перед записью, а не после: к этому моменту вызывающий код уже
+        # отметил предыдущие вакансии в журнале, и контрольная точка их учтёт
+        if self.vacancy_count and self.vacancy_count % self.flush_every == 0:
+            self.flush()
+
+        self.writers['vacancies'].writerow(vacancy_row(vacancy))
+        self.writers['technologies'].writerows(technology_rows(vacancy))
+
+        skill_ids = []
+        for skill in vacancy.get('key_skills') or ():
+            skill_id = self.skill_id(skill)
+            if skill_id is not None and skill_id not in skill_ids:
+                skill_ids.append(skill_id)
+        self.writers['vacancy_skills'].writerows(
+            {'vacancy_id': vacancy['vacancy_id'], 'skill_id': skill_id} for skill_id in skill_ids)
+
+        self.aggregator.add(vacancy)
+        self.vacancy_count += 1
+
+    def flush(self):
+        """Сброс буферов на диск"""
+        if self.handles is None:
+            return
+
+        for handle in self.handles.values():
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        if self.on_flush:
+            self.on_flush({key: os.fstat(handle.fileno()).st_size for key, handle in self.handles.items()})
+
+    def close(self):
+        """Закрытие файлов и запись аналитики; False - если не было вакансий"""
+        if self.handles is None:
+            return False
+
+        self.flush()
+        for handle in self.handles.values():
+            handle.close()
+
+        write_csv_atomic(self.analytics_file, ANALYTICS_COLUMNS, self.aggregator.rows())
+
+        print(f"✅ Сохранены файлы:")
+        print(f"  📄 Вакансии: {self.vacancies_file}")
+        print(f"  🔧 Технологии: {self.tech_file}")
+        print(f"  📊 Аналитика: {self.analytics_file}")
+        print(f"  🧩 Навыки: {self.skills_file} ({len(self.skill_ids)} в словаре), {self.vacancy_skills_file}")
+        return True
+
+
+def write_csv_atomic(filename, columns, rows):
+    """Запись CSV через временный файл"""
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_filename, filename)
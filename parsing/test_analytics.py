@@ -0,0 +1,95 @@
+import copy
+import random
+
+import pytest
+
+from analytics import TechAnalyticsAggregator
+from mock_hh_server import synthetic_vacancies
+from new_parser import HHEnhancedParser
+
+# Агрегаты частей выборки (шардов, процессов), объединённые merge по порядку
+# частей, совпадают с одним проходом по всем вакансиям
+
+
+def edge_vacancies():
+    """Вакансии без зарплаты, с нулевой зарплатой и с равными частотами ролей"""
+    def vacancy(techs, salary, role, experience='junior', domain='general'):
+        return {'technologies': {tech: {'frequency': frequency} for tech, frequency in techs.items()},
+                'avg_salary': salary, 'role': role, 'experience_level': experience, 'domain': domain}
+
+    return [
+        vacancy({'Rust': 1}, None, 'backend'),
+        vacancy({'Rust': 2, 'Go': 1}, 0, 'devops', 'senior'),
+        vacancy({'Go': 3}, 150000.5, 'backend', domain='fintech'),
+        vacancy({'Rust': 1}, None, 'devops'),
+        vacancy({'Go': 1, 'Rust': 4}, 90000, 'devops', 'middle', 'fintech'),
+        vacancy({'Go': 1}, 400000, 'backend', 'senior')
+    ]
+
+
+@pytest.fixture(scope='module')
+def vacancies():
+    parser = HHEnhancedParser(max_workers=1, cache_path=None)
+    records = [parser.process_vacancy_data(vacancy) for vacancy in synthetic_vacancies(600, seed=3)]
+    return records + edge_vacancies()
+
+
+def aggregate(vacancies):
+    aggregator = TechAnalyticsAggregator()
+    for vacancy in vacancies:
+        aggregator.add(vacancy)
+    return aggregator
+
+
+def split(vacancies, rng, parts):
+    """Последовательные части выборки случайного размера (бывают и пустые)"""
+    bounds = sorted(rng.randint(0, len(vacancies)) for _ in range(parts - 1))
+    bounds = [0] + bounds + [len(vacancies)]
+    return [vacancies[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def assert_rows_equal(actual, expected):
+    assert [row['technology'] for row in actual] == [row['technology'] for row in expected]
+    for got, want in zip(actual, expected):
+        # Сумма зарплат складывается в другом порядке - среднее сравнивается приближённо
+        assert got.pop('avg_salary') == pytest.approx(want.pop('avg_salary'))
+        assert got == want
+
+
+@pytest.mark.parametrize('parts', [1, 2, 5, 17])
+def test_merged_shards_match_single_pass(vacancies, parts):
+    expected = aggregate(vacancies).rows()
+    rng = random.Random(parts)
+    for _ in range(5):
+        merged = TechAnalyticsAggregator()
+        for shard in split(vacancies, rng, parts):
+            merged.merge(aggregate(shard))
+        assert_rows_equal(merged.rows(), copy.deepcopy(expected))
+
+
+def test_merge_edge_values():
+    """Минимум и максимум без зарплат в части, мода при равенстве - первое значение"""
+    records = edge_vacancies()
+    merged = aggregate(records[:3]).merge(aggregate(records[3:]))
+    rows = {row['technology']: row for row in merged.rows()}
+
+    assert rows['Rust']['vacancy_count'] == 4
+    assert rows['Rust']['total_mentions'] == 8
+    assert rows['Rust']['min_salary'] == 90000
+    assert rows['Rust']['max_salary'] == 90000
+    assert rows['Rust']['top_role'] == 'devops'
+    assert rows['Go']['min_salary'] == 90000
+    assert rows['Go']['max_salary'] == 400000
+    # Роли и домены Go встречаются поровну: выигрывает встреченное первым
+    assert rows['Go']['top_role'] == 'devops'
+    assert rows['Go']['top_experience'] == 'senior'
+    assert rows['Go']['top_domain'] == 'general'
+    assert_rows_equal(merged.rows(), aggregate(records).rows())
+
+
+def test_merge_does_not_change_other():
+    records = edge_vacancies()
+    other = aggregate(records[3:])
+    before = copy.deepcopy(other.tech_stats)
+    aggregate(records[:3]).merge(other)
+    assert other.tech_stats == before
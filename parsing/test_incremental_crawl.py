@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from mock_hh_server import DATE_FORMAT, MockHHServer, synthetic_vacancies
+from new_parser import HHEnhancedParser
+
+# Инкрементальный парсинг против локальной заглушки API HH: два запуска подряд
+# не должны терять вакансии из-за сдвига водяного знака
+
+QUERY = 'python'
+
+
+def moscow_vacancies(count, start=0, seed=42, published_after=None):
+    """Синтетические вакансии по Москве, которые находит запрос QUERY"""
+    vacancies = synthetic_vacancies(count, seed)
+    for index, vacancy in enumerate(vacancies):
+        vacancy['id'] = str(20_000_000 + start + index)
+        vacancy['name'] = 'Python разработчик'
+        vacancy['area'] = {'id': '1', 'name': 'Москва'}
+        if published_after is not None:
+            published = published_after + timedelta(seconds=index + 1)
+            vacancy['published_at'] = published.strftime(DATE_FORMAT)
+    return vacancies
+
+
+@pytest.fixture
+def mock_server():
+    servers = []
+
+    def start(vacancies):
+        server = MockHHServer(vacancies)
+        server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def crawl(server, state_path, fail_ids=()):
+    """Один инкрементальный запуск: id собранных вакансий и состояние после него"""
+    parser = HHEnhancedParser(max_workers=8, requests_per_second=10_000, max_retries=0,
+                              cache_path=None, incremental=True, state_path=str(state_path),
+                              base_url=server.url)
+    if fail_ids:
+        load_vacancy_json = parser.load_vacancy_json
+
+        def failing_load(vacancy_id):
+            if str(vacancy_id) in fail_ids:
+                raise ConnectionError(f"сбой загрузки {vacancy_id}")
+            return load_vacancy_json(vacancy_id)
+
+        parser.load_vacancy_json = failing_load
+
+    # max_pages - как в run_enhanced_parsing
+    vacancies = parser.search_vacancies_enhanced([QUERY], max_pages=2)
+    parser.crawl_state.advance_watermarks()
+    parser.crawl_state.save()
+    return {str(vacancy['vacancy_id']) for vacancy in vacancies}, parser.crawl_state
+
+
+def newest(vacancies, count=None):
+    ordered = sorted(vacancies, key=lambda v: v['published_at'], reverse=True)
+    return ordered[:count]
+
+
+def test_second_run_collects_only_new_vacancies(mock_server, tmp_path):
+    """Первый запуск читает max_pages свежих страниц, второй - только новые вакансии"""
+    old = moscow_vacancies(1500)
+    collected, state = crawl(mock_server(old), tmp_path / 'state.json')
+    assert collected == {v['id'] for v in newest(old, 200)}
+    assert state.date_from(QUERY) == newest(old)[0]['published_at']
+
+    new = moscow_vacancies(30, start=len(old), seed=7, published_after=datetime.now().astimezone())
+    collected, _ = crawl(mock_server(old + new), tmp_path / 'state.json')
+    assert collected == {v['id'] for v in new}
+
+
+def test_delta_deeper_than_max_pages_is_read_in_full(mock_server, tmp_path):
+    """Дельта больше max_pages страниц: новые вакансии не теряются"""
+    old = moscow_vacancies(50)
+    crawl(mock_server(old), tmp_path / 'state.json')
+
+    new = moscow_vacancies(450, start=len(old), seed=7, published_after=datetime.now().astimezone())
+    collected, state = crawl(mock_server(old + new), tmp_path / 'state.json')
+    assert collected == {v['id'] for v in new}
+    assert state.date_from(QUERY) == newest(new)[0]['published_at']
+
+
+def test_failed_vacancies_are_collected_next_run(mock_server, tmp_path):
+    """Вакансии с ошибкой загрузки не оказываются ниже водяного знака"""
+    vacancies = moscow_vacancies(200)
+    newest_first = sorted(vacancies, key=lambda v: v['published_at'], reverse=True)
+    failed = {v['id'] for v in newest_first[10:15]}
+    server = mock_server(vacancies)
+
+    collected, state = crawl(server, tmp_path / 'state.json', fail_ids=failed)
+    assert collected == {v['id'] for v in vacancies} - failed
+    assert state.date_from(QUERY) == min(v['published_at'] for v in newest_first[10:15])
+
+    collected, state = crawl(server, tmp_path / 'state.json')
+    assert collected == failed
+    assert state.date_from(QUERY) == newest_first[0]['published_at']
+
+
+def test_truncated_delta_advances_over_read_window(mock_server, tmp_path):
+    """Дельта глубже лимита поиска HH: знак сдвигается по прочитанным свежим вакансиям"""
+    old = moscow_vacancies(50)
+    crawl(mock_server(old), tmp_path / 'state.json')
+
+    new = moscow_vacancies(2100, start=len(old), seed=7, published_after=datetime.now().astimezone())
+    server = mock_server(old + new)
+    collected, state = crawl(server, tmp_path / 'state.json')
+    assert collected == {v['id'] for v in newest(new, 2000)}
+    assert state.date_from(QUERY) == newest(new)[0]['published_at']
+
+    # Следующий запуск читает только дельту, а не всю выдачу заново
+    collected, _ = crawl(server, tmp_path / 'state.json')
+    assert collected == set()
@@ -0,0 +1,85 @@
+import copy
+
+import pytest
+
+from mock_hh_server import MockHHServer, synthetic_vacancies
+from new_parser import HHEnhancedParser
+from raw_archive import RawArchive, iter_archive
+
+# Облегчённый режим (--lite) против локальной заглушки API HH: детали не
+# запрашиваются только по вакансиям, которые уже есть в кэше
+
+QUERY = 'python'
+
+
+def python_vacancies(count):
+    vacancies = synthetic_vacancies(count, seed=11)
+    for index, vacancy in enumerate(vacancies):
+        vacancy['id'] = str(30_000_000 + index)
+        vacancy['name'] = 'Python backend разработчик'
+        vacancy['area'] = {'id': '1', 'name': 'Москва'}
+        vacancy['description'] = f"<p>Python, Django, PostgreSQL, Docker.</p>{vacancy['description']}"
+    return vacancies
+
+
+def crawl(vacancies, tmp_path, run):
+    """Один облегчённый запуск: записи, статистика, id загруженных деталей и архива"""
+    server = MockHHServer(vacancies)
+    server.start()
+    parser = HHEnhancedParser(max_workers=4, requests_per_second=10_000, max_retries=0,
+                              cache_path=str(tmp_path / 'cache.sqlite'), base_url=server.url, lite=True)
+    parser.archive = RawArchive(run, str(tmp_path / 'raw'))
+    loaded = []
+    load_vacancy_json = parser.load_vacancy_json
+
+    def counting_load(vacancy_id):
+        loaded.append(str(vacancy_id))
+        return load_vacancy_json(vacancy_id)
+
+    parser.load_vacancy_json = counting_load
+    try:
+        records = parser.search_vacancies_enhanced([QUERY], max_pages=1)
+    finally:
+        parser.archive.close()
+        parser.flush_caches()
+        server.stop()
+    archived = {str(vacancy['id']) for vacancy in iter_archive([parser.archive.path])}
+    return {record['vacancy_id']: record for record in records}, parser.lite_stats, set(loaded), archived
+
+
+@pytest.fixture
+def vacancies():
+    return python_vacancies(40)
+
+
+def test_new_vacancies_are_loaded_in_full(vacancies, tmp_path):
+    records, stats, loaded, archived = crawl(vacancies, tmp_path, 'first')
+    assert loaded == archived == set(records) == {v['id'] for v in vacancies}
+    assert stats == {'detail': len(vacancies)}
+    for vacancy in vacancies:
+        record = records[vacancy['id']]
+        assert record['text_source'] == 'details'
+        assert record['skills_count'] == len(vacancy['key_skills'])
+
+
+def test_cached_vacancies_use_snippet_only_when_listing_changed(vacancies, tmp_path):
+    crawl(vacancies, tmp_path, 'first')
+    changed = copy.deepcopy(vacancies)
+    for vacancy in changed[:5]:
+        vacancy['salary'] = {'from': 777000, 'to': None, 'currency': 'RUR', 'gross': False}
+    changed_ids = {v['id'] for v in changed[:5]}
+
+    records, stats, loaded, archived = crawl(changed, tmp_path, 'second')
+    assert stats == {'cached': len(vacancies) - 5, 'snippet': 5}
+    assert loaded == set()
+    # Записи из сниппета не попадают в архив: --reprocess получил бы урезанный текст
+    assert archived == set(records) - changed_ids
+    for vacancy in changed:
+        record = records[vacancy['id']]
+        snippet = vacancy['id'] in changed_ids
+        assert record['text_source'] == ('snippet' if snippet else 'details')
+        # Навыки берутся из кэша деталей
+        assert record['skills_count'] == len(vacancy['key_skills'])
+        if snippet:
+            assert record['salary_from'] == 777000
+            assert 'Python' in record['technologies']
@@ -0,0 +1,44 @@
+import gzip
+
+from raw_archive import RawArchive, iter_archive, iter_latest
+
+# Архивы нескольких запусков для --reprocess: вакансия учитывается один раз,
+# по самой свежей записи
+
+
+def write_archive(directory, snapshot_timestamp, vacancies):
+    archive = RawArchive(snapshot_timestamp, str(directory))
+    for vacancy in vacancies:
+        archive.append(vacancy)
+    archive.close()
+    return archive.path
+
+
+def vacancy(vacancy_id, salary):
+    return {'id': vacancy_id, 'name': 'Python разработчик', 'salary': {'from': salary}}
+
+
+def test_latest_record_wins_across_runs(tmp_path):
+    first = write_archive(tmp_path, '20250701_100000', [vacancy('1', 100), vacancy('2', 200)])
+    second = write_archive(tmp_path, '20250702_100000', [vacancy('2', 250), vacancy('3', 300)])
+    third = write_archive(tmp_path, '20250703_100000', [vacancy('1', 150)])
+
+    # Порядок аргументов не важен: архивы сортируются по меткам времени в имени
+    records = list(iter_latest([third, first, second]))
+    assert [(v['id'], v['salary']['from']) for v in records] == [('2', 250), ('3', 300), ('1', 150)]
+    assert len(list(iter_archive([first, second, third]))) == 5
+
+
+def test_duplicates_within_one_archive(tmp_path):
+    path = write_archive(tmp_path, '20250701_100000', [vacancy('1', 100), vacancy('1', 120)])
+    assert [v['salary']['from'] for v in iter_latest([path])] == [120]
+
+
+def test_truncated_archive(tmp_path):
+    path = write_archive(tmp_path, '20250701_100000', [vacancy(str(i), i) for i in range(50)])
+    with gzip.open(path, 'rb') as f:
+        data = f.read()
+    # Оборванная последняя строка - как после сбоя посреди записи
+    with gzip.open(path, 'wb') as f:
+        f.write(data[:-10])
+    assert [v['id'] for v in iter_latest([path])] == [str(i) for i in range(49)]
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import sys
+
+# Каталоги технологий по ключу содержимого: записи ссылаются на каталог, а при
+# передаче между процессами каталог восстанавливается по ключу, а не копируется
+_CATALOGS = {}
+
+
+def _intern(value):
+    """Повторяющиеся строки (регион, опыт, роль...) хранятся в одном экземпляре"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _lookup_catalog(key):
+    return _CATALOGS[key]
+
+
+class TechCatalog:
+    """Метаинформация технологий по номеру: категория, уровень, компетенции"""
+
+    def __init__(self, tech_competency_mapping):
+        self.names = []
+        self.ids = {}
+        self.infos = []
+        for tech, info in tech_competency_mapping.items():
+            self.ids[tech] = len(self.names)
+            self.names.append(_intern(tech))
+            self.infos.append({
+                'category': _intern(info['category']),
+                'level': _intern(info['level']),
+                'domain': _intern(info['domain']),
+                'fgos_competencies': [_intern(code) for code in info['fgos_competencies']],
+                'prof_standards': [_intern(code) for code in info['prof_standards']]
+            })
+
+        content = json.dumps([self.names, self.infos], ensure_ascii=False, sort_keys=True)
+        self.key = hashlib.sha1(content.encode('utf-8')).hexdigest()
+        _CATALOGS.setdefault(self.key, self)
+
+    def __reduce__(self):
+        return _lookup_catalog, (self.key,)
+
+    def describe(self, tech_id, frequency):
+        """Описание технологии в формате прежнего словаря technologies"""
+        return dict(self.infos[tech_id], frequency=frequency)
+
+
+class TechnologiesView:
+    """Только для чтения: technologies записи как словарь технология -> описание"""
+
+    __slots__ = ('record',)
+
+    def __init__(self, record):
+        self.record = record
+
+    def __len__(self):
+        return len(self.record.tech_ids)
+
+    def __iter__(self):
+        names = self.record.catalog.names
+        return (names[tech_id] for tech_id in self.record.tech_ids)
+
+    def __contains__(self, tech):
+        tech_id = self.record.catalog.ids.get(tech)
+        return tech_id is not None and tech_id in self.record.tech_ids
+
+    def __getitem__(self, tech):
+        record = self.record
+        tech_id = record.catalog.ids[tech]
+        try:
+            position = record.tech_ids.index(tech_id)
+        except ValueError:
+            raise KeyError(tech) from None
+        return record.catalog.describe(tech_id, record.tech_frequencies[position])
+
+    def get(self, tech, default=None):
+        try:
+            return self[tech]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        record = self.record
+        catalog = record.catalog
+        for tech_id, frequency in zip(record.tech_ids, record.tech_frequencies):
+            yield catalog.names[tech_id], catalog.describe(tech_id, frequency)
+
+
+class VacancyRecord:
+    """Компактная обработанная вакансия.
+
+    Вместо словаря - атрибуты в __slots__, повторяющиеся строки интернированы,
+    а технологии хранятся номерами в каталоге с частотами. Доступ по ключу
+    (record['role'], record.get('avg_salary')) совпадает с прежним словарём.
+    """
+
+    __slots__ = ('vacancy_id', 'title', 'company', 'company_size', 'hiring_volume', 'employer_type',
+                 'employer_industries', 'area', 'published_date',
+                 'experience_raw', 'experience_level', 'schedule', 'employment',
+                 'salary_from', 'salary_to', 'salary_currency', 'salary_gross', 'avg_salary',
+                 'role', 'domain', 'text_source', 'key_skills', 'tech_ids', 'tech_frequencies', 'catalog')
+
+    # Строки с небольшим числом различных значений
+    INTERNED = ('company', 'company_size', 'hiring_volume', 'employer_type', 'employer_industries',
+                'area', 'experience_raw', 'experience_level',
+                'schedule', 'employment', 'salary_currency', 'role', 'domain', 'text_source')
+
+    # Поля, вычисляемые из технологий и навыков
+    DERIVED = ('technologies', 'tech_count', 'skills_count',
+               'fgos_competencies', 'prof_standard_competencies')
+
+    def __init__(self, catalog, tech_counts, key_skills=(), **fields):
+        for name in self.__slots__[:-4]:
+            value = fields.get(name)
+            setattr(self, name, _intern(value) if name in self.INTERNED else value)
+        # Навыков на HH - несколько тысяч на миллионы вакансий
+        self.key_skills = tuple(_intern(skill) for skill in key_skills)
+        self.catalog = catalog
+        self.tech_ids = tuple(catalog.ids[tech] for tech in tech_counts)
+        self.tech_frequencies = tuple(tech_counts.values())
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, _intern(value) if name in self.INTERNED else value)
+        self.key_skills = tuple(_intern(skill) for skill in self.key_skills)
+
+    @property
+    def technologies(self):
+        return TechnologiesView(self)
+
+    @property
+    def tech_count(self):
+        return len(self.tech_ids)
+
+    @property
+    def skills_count(self):
+        return len(self.key_skills)
+
+    @property
+    def fgos_competencies(self):
+        return self._competencies('fgos_competencies')
+
+    @property
+    def prof_standard_competencies(self):
+        return self._competencies('prof_standards')
+
+    def _competencies(self, field):
+        codes = set()
+        for tech_id in self.tech_ids:
+            codes.update(self.catalog.infos[tech_id][field])
+        return sorted(codes)
+
+    def __getitem__(self, key):
+        if key in self.__slots__[:-3] or key in self.DERIVED:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.__slots__[:-3] or key in self.DERIVED
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self.__slots__[:-3]) + list(self.DERIVED)
+
+    def to_dict(self):
+        """Прежнее представление вакансии словарём (технологии с копией метаданных)"""
+        data = {key: self[key] for key in self.keys()}
+        data['technologies'] = dict(self.technologies.items())
+        data['key_skills'] = list(self.key_skills)
+        return data
+
+    def __repr__(self):
+        return f"VacancyRecord(vacancy_id={self.vacancy_id!r}, title={self.title!r})"